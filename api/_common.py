@@ -1,6 +1,11 @@
 import json
+import sys
+from pathlib import Path
 
-import requests
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.profiling import finish_profiling
+from src.timing import finish_timing
 
 
 DEFAULT_HEADERS = {
@@ -17,12 +22,47 @@ def set_cors_headers(handler):
     handler.send_header("Access-Control-Allow-Headers", "Content-Type")
 
 
+def finish_request_context(handler, send_timing: bool = True):
+    # 响应发出即结束本次请求的计时与采样（Vercel 实例复用线程，不能把计时器留给下一个请求）
+    finish_profiling()
+    timer = finish_timing()
+    if timer is not None and send_timing:
+        handler.send_header("Server-Timing", timer.server_timing())
+
+
 def send_json(handler, status_code, payload):
+    body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
     handler.send_response(status_code)
     set_cors_headers(handler)
+    finish_request_context(handler)
     handler.send_header("Content-Type", "application/json; charset=utf-8")
+    handler.send_header("Content-Length", str(len(body)))
+    handler.end_headers()
+    handler.wfile.write(body)
+
+
+def send_chunked_headers(handler, status_code, content_type, headers: dict | None = None):
+    # 分块传输需要 HTTP/1.1，调用方的 handler 需设置 protocol_version = "HTTP/1.1"
+    handler.send_response(status_code)
+    set_cors_headers(handler)
+    # 流式响应的处理在响应头发出之后才进行，此时的 Server-Timing 只有接近 0 的 total，不如不发
+    finish_request_context(handler, send_timing=False)
+    handler.send_header("Content-Type", content_type)
+    handler.send_header("Transfer-Encoding", "chunked")
+    for key, value in (headers or {}).items():
+        handler.send_header(key, value)
     handler.end_headers()
-    handler.wfile.write(json.dumps(payload, ensure_ascii=False).encode("utf-8"))
+
+
+def write_chunk(handler, data: bytes):
+    if data:
+        handler.wfile.write(f"{len(data):X}\r\n".encode("ascii") + data + b"\r\n")
+        handler.wfile.flush()
+
+
+def end_chunks(handler):
+    handler.wfile.write(b"0\r\n\r\n")
+    handler.wfile.flush()
 
 
 def read_json_body(handler):
@@ -35,9 +75,32 @@ def read_json_body(handler):
     return json.loads(body)
 
 
-def safe_requests_get(url: str, timeout: int = 25, headers: dict | None = None, **kwargs):
+def _is_cacheable_page(response) -> bool:
+    from src.scraper import AlibabaVideoScraper
+
+    return not AlibabaVideoScraper.detect_anti_bot_page(response.text)
+
+
+def safe_requests_get(url: str, timeout: int = 25, headers: dict | None = None, cache: bool = False, **kwargs):
+    """cache=True 时经由页面缓存获取（仅用于页面 HTML，勿用于 stream 下载）。"""
+    # requests 与连接池在首次请求上游时才导入，/api/health 等不出站的函数冷启动时不加载
+    from src.http_session import pooled_get
+    from src.page_cache import PAGE_CACHE
+
+    if cache:
+        return PAGE_CACHE.fetch(
+            url,
+            safe_requests_get,
+            store_if=_is_cacheable_page,
+            timeout=timeout,
+            headers=headers,
+            **kwargs,
+        )
     merged_headers = {**DEFAULT_HEADERS, **(headers or {})}
-    try:
-        return requests.get(url, timeout=timeout, headers=merged_headers, **kwargs)
-    except requests.exceptions.SSLError:
-        return requests.get(url, timeout=timeout, headers=merged_headers, verify=False, **kwargs)
+    return pooled_get(url, timeout=timeout, headers=merged_headers, **kwargs)
+
+
+def cache_debug(response) -> dict:
+    from src.page_cache import PAGE_CACHE
+
+    return PAGE_CACHE.describe(getattr(response, "cache_status", "bypass"))
@@ -1,10 +1,14 @@
 import json
-import re
+import sys
 from http.server import BaseHTTPRequestHandler
+from pathlib import Path
 
-import requests
+from api._common import cache_debug, read_json_body, safe_requests_get, send_json, set_cors_headers
 
-from api._common import read_json_body, safe_requests_get, send_json, set_cors_headers
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.timing import stage, start_timing, timing_debug
+from src.video_matcher import count_video_candidates
 
 
 class handler(BaseHTTPRequestHandler):
@@ -19,6 +23,7 @@ class handler(BaseHTTPRequestHandler):
         except (ValueError, TypeError, UnicodeDecodeError, json.JSONDecodeError):
             send_json(self, 400, {"status": "error", "error": "请求体不是有效 JSON"})
             return
+        start_timing(payload.get("timing"))
 
         target = str(payload.get("url", "")).strip()
         if not target:
@@ -27,14 +32,20 @@ class handler(BaseHTTPRequestHandler):
         if not target.startswith(("http://", "https://")):
             target = "https://" + target
 
+        import requests
+
+        from src.http_session import pool_stats
+
         try:
-            response = safe_requests_get(target, timeout=20, allow_redirects=True)
-            html = response.text or ""
+            use_cache = payload.get("cache", True) is not False
+            with stage("fetch"):
+                response = safe_requests_get(target, timeout=20, allow_redirects=True, cache=use_cache)
+                html = response.text or ""
+            with stage("regex"):
+                candidate_counts = count_video_candidates(html)
             video_tokens = {
-                "videoUrl": len(re.findall(r'"videoUrl"\s*:\s*"([^"]+)"', html)),
-                "escapedVideoUrl": len(re.findall(r'\\"videoUrl\\"\s*:\s*\\"([^\\"]+)\\"', html)),
-                "directMp4": len(re.findall(r'https?://[^\s"\'<>]+\.(?:mp4|webm|ogg|mov)', html)),
-                "escapedMp4": len(re.findall(r'https?:\\/\\/[^\s"\'<>]+\.(?:mp4|webm|ogg|mov)', html)),
+                key: candidate_counts[key]
+                for key in ("videoUrl", "escapedVideoUrl", "directMp4", "escapedMp4")
             }
             send_json(
                 self,
@@ -51,6 +62,9 @@ class handler(BaseHTTPRequestHandler):
                     "environment": "vercel-serverless",
                     "html_length": len(html),
                     "video_tokens": video_tokens,
+                    "cache": cache_debug(response),
+                    "pool": pool_stats(),
+                    **timing_debug(),
                 },
             )
         except (requests.RequestException, ValueError, TypeError, OSError) as error:
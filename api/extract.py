@@ -3,13 +3,12 @@ import sys
 from http.server import BaseHTTPRequestHandler
 from pathlib import Path
 
-import requests
-
-from api._common import read_json_body, safe_requests_get, send_json, set_cors_headers
+from api._common import cache_debug, read_json_body, safe_requests_get, send_json, set_cors_headers
 
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from src.resource_extractor import extract_resources_from_html
+from src.profiling import profiling_debug, start_profiling
+from src.timing import stage, start_timing, timing_debug
 
 
 def normalize_input_url(url: str) -> str:
@@ -33,18 +32,32 @@ class handler(BaseHTTPRequestHandler):
         except (ValueError, TypeError, UnicodeDecodeError, json.JSONDecodeError):
             send_json(self, 400, {"status": "error", "error": "请求体不是有效 JSON"})
             return
+        start_timing(payload.get("timing"))
+        start_profiling(payload.get("profile"))
 
         page_url = normalize_input_url(payload.get("url", ""))
         if not page_url:
             send_json(self, 400, {"status": "error", "error": "URL 不能为空"})
             return
 
+        # requests / bs4 只在真正提取时导入，预检与参数错误的请求不加载
+        import requests
+
+        from src.extraction_cache import EXTRACTION_CACHE
+        from src.resource_extractor import extract_resources_from_html
+
         try:
-            response = safe_requests_get(page_url, timeout=25)
-            response.raise_for_status()
-            html = response.text
+            use_cache = payload.get("cache", True) is not False
+            with stage("fetch"):
+                response = safe_requests_get(page_url, timeout=25, cache=use_cache)
+                response.raise_for_status()
+                html = response.text
             final_url = response.url or page_url
-            resources = extract_resources_from_html(html, final_url)
+            resources = extract_resources_from_html(
+                html,
+                final_url,
+                cache=EXTRACTION_CACHE if use_cache else None,
+            )
             counts = {key: len(value) for key, value in resources.items()}
             send_json(
                 self,
@@ -56,7 +69,13 @@ class handler(BaseHTTPRequestHandler):
                     "resources": resources,
                     "counts": counts,
                     "total": sum(counts.values()),
-                    "debug": {"environment": "vercel-serverless"},
+                    "debug": {
+                        "environment": "vercel-serverless",
+                        "cache": cache_debug(response),
+                        "extraction_cache": EXTRACTION_CACHE.stats(),
+                        **timing_debug(),
+                        **profiling_debug(),
+                    },
                 },
             )
         except requests.RequestException as error:
@@ -1,6 +1,7 @@
 from http.server import BaseHTTPRequestHandler
 
 from api._common import send_json, set_cors_headers
+from src.timing import start_timing
 
 
 class handler(BaseHTTPRequestHandler):
@@ -10,6 +11,7 @@ class handler(BaseHTTPRequestHandler):
         self.end_headers()
 
     def do_GET(self):
+        start_timing()
         send_json(
             self,
             200,
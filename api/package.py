@@ -1,25 +1,32 @@
 import base64
-import io
 import json
-import re
-import zipfile
+import sys
 from http.server import BaseHTTPRequestHandler
+from pathlib import Path
 
-import requests
+from api._common import (
+    end_chunks,
+    read_json_body,
+    safe_requests_get,
+    send_chunked_headers,
+    send_json,
+    set_cors_headers,
+    write_chunk,
+)
 
-from api._common import read_json_body, safe_requests_get, send_json, set_cors_headers
+sys.path.insert(0, str(Path(__file__).parent.parent))
 
+from src.profiling import profiling_debug, start_profiling
+from src.timing import start_timing
 
-def filename_from_url(video_url: str, index: int) -> str:
-    match = re.search(r"([^/?#]+)(?:\?.*)?$", video_url)
-    filename = match.group(1) if match else f"video_{index}.mp4"
-    if "." not in filename:
-        filename = f"{filename}.mp4"
-    filename = re.sub(r"[^a-zA-Z0-9._-]", "_", filename)
-    return f"{index:02d}_{filename}"
+
+def fetch_video(video_url: str):
+    return safe_requests_get(video_url, timeout=30, stream=True)
 
 
 class handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
     def do_OPTIONS(self):
         self.send_response(204)
         set_cors_headers(self)
@@ -31,6 +38,8 @@ class handler(BaseHTTPRequestHandler):
         except (ValueError, TypeError, UnicodeDecodeError, json.JSONDecodeError):
             send_json(self, 400, {"status": "error", "error": "请求体不是有效 JSON"})
             return
+        start_timing(payload.get("timing"))
+        start_profiling(payload.get("profile"))
 
         videos = payload.get("videos", [])
         if not isinstance(videos, list) or len(videos) == 0:
@@ -48,39 +57,63 @@ class handler(BaseHTTPRequestHandler):
             send_json(self, 400, {"status": "error", "error": "没有有效视频链接可打包"})
             return
 
+        # requests 与打包模块只在真正打包时导入
+        import requests
+
+        from src.packager import PACKAGE_FILENAME, PackageReport, build_zip_bytes, resolve_package_workers
+
+        workers = resolve_package_workers(payload.get("concurrency"))
         try:
-            zip_buffer = io.BytesIO()
-            success_count = 0
-
-            with zipfile.ZipFile(zip_buffer, "w", zipfile.ZIP_DEFLATED) as zip_file:
-                for index, video_url in enumerate(normalized_videos, start=1):
-                    if not isinstance(video_url, str) or not video_url.startswith(("http://", "https://")):
-                        continue
-                    try:
-                        response = safe_requests_get(video_url, timeout=30)
-                        response.raise_for_status()
-                        zip_file.writestr(filename_from_url(video_url, index), response.content)
-                        success_count += 1
-                    except requests.RequestException:
-                        continue
-
-            if success_count == 0:
+            if payload.get("stream"):
+                self._send_zip_stream(normalized_videos, workers)
+                return
+
+            report = PackageReport(len(normalized_videos))
+            zip_bytes = build_zip_bytes(normalized_videos, fetch_video, report, workers)
+            if report.success_count == 0:
                 send_json(self, 500, {"status": "error", "error": "所有视频下载失败，无法打包"})
                 return
 
-            zip_buffer.seek(0)
-            zip_base64 = base64.b64encode(zip_buffer.getvalue()).decode("utf-8")
-            send_json(
-                self,
-                200,
-                {
-                    "status": "success",
-                    "message": f"打包完成，成功 {success_count}/{len(normalized_videos)}",
-                    "zip_data": zip_base64,
-                    "filename": "alibaba_videos.zip",
-                    "success_count": success_count,
-                    "total_count": len(normalized_videos),
-                },
-            )
+            zip_base64 = base64.b64encode(zip_bytes).decode("utf-8")
+            body = {
+                "status": "success",
+                "message": f"打包完成，成功 {report.success_count}/{report.total_count}",
+                "zip_data": zip_base64,
+                "filename": PACKAGE_FILENAME,
+                "success_count": report.success_count,
+                "total_count": report.total_count,
+                "failed": report.failed,
+                "concurrency": workers,
+            }
+            debug = profiling_debug()
+            if debug:
+                body["debug"] = debug
+            send_json(self, 200, body)
         except (requests.RequestException, ValueError, TypeError, RuntimeError, OSError) as error:
             send_json(self, 500, {"status": "error", "error": f"打包失败: {str(error)}"})
+
+    def _send_zip_stream(self, video_urls: list, workers: int):
+        from src.packager import PACKAGE_FILENAME, iter_zip_stream
+
+        stream = iter_zip_stream(video_urls, fetch_video, include_report=True, workers=workers)
+        first_chunk = next(stream, None)
+        if first_chunk is None:
+            send_json(self, 500, {"status": "error", "error": "所有视频下载失败，无法打包"})
+            return
+
+        send_chunked_headers(
+            self,
+            200,
+            "application/zip",
+            {"Content-Disposition": f'attachment; filename="{PACKAGE_FILENAME}"'},
+        )
+        try:
+            write_chunk(self, first_chunk)
+            for chunk in stream:
+                write_chunk(self, chunk)
+            end_chunks(self)
+        except OSError:
+            # 响应头已发出，客户端中途断开时只能停止写出
+            self.close_connection = True
+        finally:
+            stream.close()
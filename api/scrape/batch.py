@@ -0,0 +1,75 @@
+import json
+import sys
+from http.server import BaseHTTPRequestHandler
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from api._common import (
+    end_chunks,
+    read_json_body,
+    safe_requests_get,
+    send_chunked_headers,
+    send_json,
+    set_cors_headers,
+    write_chunk,
+)
+from src.config import SCRAPE_BATCH_MAX_URLS
+from src.timing import start_timing
+
+
+def normalize_input_url(url: str) -> str:
+    value = (url or "").strip() if isinstance(url, str) else ""
+    if not value:
+        return ""
+    if not value.startswith(("http://", "https://")):
+        value = "https://" + value
+    return value
+
+
+class handler(BaseHTTPRequestHandler):
+    # 分块传输需要 HTTP/1.1
+    protocol_version = "HTTP/1.1"
+
+    def do_OPTIONS(self):
+        self.send_response(204)
+        set_cors_headers(self)
+        self.end_headers()
+
+    def do_POST(self):
+        try:
+            payload = read_json_body(self)
+        except (ValueError, TypeError, UnicodeDecodeError, json.JSONDecodeError):
+            send_json(self, 400, {"status": "error", "error": "请求体不是有效 JSON"})
+            return
+        start_timing(payload.get("timing"))
+
+        urls = payload.get("urls", [])
+        if not isinstance(urls, list) or len(urls) == 0:
+            send_json(self, 400, {"status": "error", "error": "urls 不能为空"})
+            return
+        if len(urls) > SCRAPE_BATCH_MAX_URLS:
+            send_json(self, 400, {"status": "error", "error": f"单次最多 {SCRAPE_BATCH_MAX_URLS} 个链接"})
+            return
+
+        from src.scrape_service import iter_scrape_batch, resolve_batch_workers
+
+        results = iter_scrape_batch(
+            [normalize_input_url(url) for url in urls],
+            "vercel-serverless",
+            refetch=safe_requests_get,
+            use_cache=payload.get("cache", True) is not False,
+            workers=resolve_batch_workers(payload.get("concurrency")),
+        )
+        send_chunked_headers(self, 200, "application/x-ndjson; charset=utf-8")
+        try:
+            # 每个页面完成即写出一行，客户端无需等待最慢的页面
+            for result in results:
+                write_chunk(self, (json.dumps(result, ensure_ascii=False) + "\n").encode("utf-8"))
+            end_chunks(self)
+        except OSError:
+            # 客户端已断开
+            self.close_connection = True
+        finally:
+            # 关闭生成器即取消尚未开始的页面
+            results.close()
@@ -1,8 +1,91 @@
+import argparse
+import asyncio
+import json
+import sys
+import time
+
+from src.async_scraper import AsyncAlibabaVideoScraper
+from src.config import (
+    ASYNC_PAGE_CONCURRENCY,
+    DOWNLOAD_PER_HOST_LIMIT,
+    DOWNLOAD_SEGMENTS,
+    DOWNLOAD_WORKERS,
+    STREAM_EARLY_EXIT_VIDEOS,
+)
 from src.scraper import AlibabaVideoScraper
+from src.session_store import SESSION_STORE
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="阿里巴巴商品视频爬虫")
+    parser.add_argument("--workers", type=int, default=DOWNLOAD_WORKERS, help="并发下载线程数")
+    parser.add_argument("--per-host", type=int, default=DOWNLOAD_PER_HOST_LIMIT, help="同一域名同时下载数上限")
+    parser.add_argument("--segments", type=int, default=DOWNLOAD_SEGMENTS, help="单个大文件的分段连接数（需服务器支持 Range）")
+    parser.add_argument("--stream", action="store_true", help="边下载页面边提取视频，超大页面更快出结果、更省内存")
+    parser.add_argument("--stop-after", type=int, default=STREAM_EARLY_EXIT_VIDEOS,
+                        help="配合 --stream：找到该数量的视频后停止读取页面，0 表示读完整页")
+    parser.add_argument("--input", help="批量模式：URL 列表文件（每行一个，# 开头为注释），传 - 从标准输入读取")
+    parser.add_argument("--output", default="-", help="批量模式：JSONL 结果文件，默认写到标准输出")
+    parser.add_argument("--concurrency", type=int, default=ASYNC_PAGE_CONCURRENCY, help="批量模式：同时抓取的页面数")
+    parser.add_argument("--extract-only", action="store_true", help="批量模式：只提取视频链接，不下载")
+    return parser.parse_args()
+
+
+def iter_input_urls(source):
+    for line in source:
+        url = line.strip()
+        if not url or url.startswith("#"):
+            continue
+        if not url.startswith(("http://", "https://")):
+            url = "https://" + url
+        yield url
+
+
+async def run_batch(args) -> dict:
+    """逐行读取 URL 并发抓取，每完成一个页面写出一条 JSONL 记录；进度与汇总输出到 stderr。"""
+    source = sys.stdin if args.input == "-" else open(args.input, encoding="utf-8")
+    output = sys.stdout if args.output == "-" else open(args.output, "w", encoding="utf-8")
+    summary = {"pages": 0, "success": 0, "failed": 0, "videos": 0, "downloaded": 0}
+    started = time.perf_counter()
+    try:
+        async with AsyncAlibabaVideoScraper(
+            concurrency=args.concurrency,
+            download_workers=args.workers,
+            per_host_limit=args.per_host,
+            segments=args.segments,
+            progress_stream=sys.stderr,
+            session_store=SESSION_STORE,
+        ) as scraper:
+            async for result in scraper.scrape_many(iter_input_urls(source), download=not args.extract_only):
+                output.write(json.dumps(result, ensure_ascii=False) + "\n")
+                output.flush()
+                summary["pages"] += 1
+                summary["success" if result["status"] == "success" else "failed"] += 1
+                summary["videos"] += result.get("count", 0)
+                summary["downloaded"] += result.get("downloads", {}).get("success", 0)
+    finally:
+        if source is not sys.stdin:
+            source.close()
+        if output is not sys.stdout:
+            output.close()
+    summary["seconds"] = round(time.perf_counter() - started, 1)
+    return summary
 
 
 def main():
     """主函数"""
+    args = parse_args()
+    if args.input:
+        summary = asyncio.run(run_batch(args))
+        print(
+            f"\n批量完成: {summary['pages']} 个页面，成功 {summary['success']}，失败 {summary['failed']}，"
+            f"视频 {summary['videos']} 个，已下载 {summary['downloaded']} 个，耗时 {summary['seconds']}s",
+            file=sys.stderr,
+        )
+        if summary["pages"] and not summary["success"]:
+            sys.exit(1)
+        return
+
     print("=" * 60)
     print("阿里巴巴商品视频爬虫")
     print("=" * 60)
@@ -18,11 +101,16 @@ def main():
         url = "https://" + url
     
     # 创建爬虫实例
-    scraper = AlibabaVideoScraper()
+    scraper = AlibabaVideoScraper(
+        download_workers=args.workers,
+        per_host_limit=args.per_host,
+        segments=args.segments,
+        session_store=SESSION_STORE,
+    )
     
     # 开始爬取
     print("\n开始爬取...\n")
-    success = scraper.scrape(url)
+    success = scraper.scrape(url, stream=args.stream, max_videos=args.stop_after)
     
     if success:
         print("\n✓ 爬取成功！视频已保存到 downloads 目录")
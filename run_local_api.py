@@ -1,35 +1,79 @@
 import base64
-import io
-import re
-import zipfile
-from urllib.parse import urljoin
+import json
+import time
 
 import requests
-from bs4 import BeautifulSoup
-from flask import Flask, jsonify, request
+from flask import Flask, Response, g, jsonify, request
 from flask_cors import CORS
 
+from src.config import SCRAPE_BATCH_MAX_URLS
+from src.extraction_cache import EXTRACTION_CACHE
+from src.http_session import pool_stats, pooled_get
+from src.metrics import API_REQUEST_SECONDS, API_REQUESTS, CONTENT_TYPE, render_metrics
+from src.packager import (
+    PACKAGE_FILENAME,
+    PackageReport,
+    build_zip_bytes,
+    iter_zip_stream,
+    resolve_package_workers,
+)
+from src.page_cache import PAGE_CACHE
+from src.profiling import finish_profiling, profiling_debug, start_profiling
 from src.resource_extractor import extract_resources_from_html
+from src.scrape_service import iter_scrape_batch, resolve_batch_workers, scrape_page
 from src.scraper import AlibabaVideoScraper
+from src.timing import finish_timing, stage, start_timing, timing_debug
 
 app = Flask(__name__)
 CORS(app, resources={r"/api/*": {"origins": "*"}})
 
 
+def request_flag(payload, name: str):
+    flag = payload.get(name) if isinstance(payload, dict) else None
+    if request.args.get(name):
+        flag = request.args.get(name) not in ("0", "false")
+    return flag
+
+
+@app.before_request
+def begin_request_context():
+    g.request_started = time.perf_counter()
+    payload = request.get_json(silent=True) if request.is_json else None
+    start_timing(request_flag(payload, "timing"))
+    start_profiling(request_flag(payload, "profile"))
+
+
 @app.after_request
 def add_common_headers(response):
+    endpoint = request.url_rule.rule if request.url_rule else "unmatched"
+    API_REQUESTS.inc(endpoint=endpoint, method=request.method, status=response.status_code)
+    if "request_started" in g:
+        API_REQUEST_SECONDS.observe(time.perf_counter() - g.request_started, endpoint=endpoint)
+    finish_profiling()
+    timer = finish_timing()
+    # 流式响应的生成器在此之后才执行，Server-Timing 只会有接近 0 的 total，不发
+    if timer is not None and not response.is_streamed:
+        response.headers["Server-Timing"] = timer.server_timing()
     response.headers["Access-Control-Allow-Origin"] = "*"
     response.headers["Access-Control-Allow-Methods"] = "GET,POST,OPTIONS"
     response.headers["Access-Control-Allow-Headers"] = "Content-Type,Authorization"
     return response
 
 
-def safe_requests_get(url: str, **kwargs):
+def safe_requests_get(url: str, cache: bool = False, **kwargs):
+    if cache:
+        return PAGE_CACHE.fetch(
+            url,
+            safe_requests_get,
+            store_if=lambda response: not AlibabaVideoScraper.detect_anti_bot_page(response.text),
+            **kwargs,
+        )
     timeout = kwargs.pop("timeout", 30)
-    try:
-        return requests.get(url, timeout=timeout, **kwargs)
-    except requests.exceptions.SSLError:
-        return requests.get(url, timeout=timeout, verify=False, **kwargs)
+    return pooled_get(url, timeout=timeout, **kwargs)
+
+
+def fetch_video(video_url: str):
+    return safe_requests_get(video_url, timeout=30, stream=True)
 
 
 def normalize_input_url(url: str) -> str:
@@ -41,31 +85,16 @@ def normalize_input_url(url: str) -> str:
     return value
 
 
-def normalize_video_url(video_url: str, page_url: str) -> str:
-    value = (video_url or "").strip()
-    if not value:
-        return ""
-    if value.startswith("//"):
-        return "https:" + value
-    if value.startswith("/"):
-        return urljoin(page_url, value)
-    return value
-
-
-def filename_from_url(video_url: str, index: int) -> str:
-    match = re.search(r"([^/?#]+)(?:\?.*)?$", video_url)
-    filename = match.group(1) if match else f"video_{index}.mp4"
-    if "." not in filename:
-        filename = f"{filename}.mp4"
-    filename = re.sub(r"[^a-zA-Z0-9._-]", "_", filename)
-    return f"{index:02d}_{filename}"
-
-
 @app.get("/api/health")
 def health():
     return jsonify({"status": "ok", "message": "Alibaba Video Scraper API is running"})
 
 
+@app.get("/api/metrics")
+def metrics():
+    return Response(render_metrics(), mimetype=None, content_type=CONTENT_TYPE)
+
+
 @app.post("/api/scrape")
 def scrape():
     payload = request.get_json(silent=True) or {}
@@ -73,69 +102,38 @@ def scrape():
     if not page_url:
         return jsonify({"status": "error", "error": "URL 不能为空"}), 400
 
-    scraper = AlibabaVideoScraper()
-    html = scraper.fetch_page(page_url)
-    if not html:
-        return jsonify({"status": "error", "error": "页面获取失败，请检查链接是否可访问"}), 400
-
-    page_title = ""
-    try:
-        title_node = BeautifulSoup(html, "html.parser").title
-        page_title = title_node.get_text(strip=True) if title_node else ""
-    except (TypeError, ValueError, AttributeError):
-        page_title = ""
-
-    scraper.extract_videos_from_html(html)
-    videos = []
-    for item in scraper.video_urls:
-        normalized = normalize_video_url(item, page_url)
-        if normalized.startswith("http") and normalized not in videos:
-            videos.append(normalized)
-
-    if not videos:
-        resources = extract_resources_from_html(html, page_url)
-        videos = [item.get("url") for item in resources.get("videos", []) if isinstance(item, dict)]
-
-    if not videos and scraper.detect_anti_bot_page(html):
-        return jsonify(
-            {
-                "status": "error",
-                "error": "目标站触发反爬校验页（Captcha/Punish），当前请求环境无法直接提取视频。",
-                "code": "ANTI_BOT_BLOCKED",
-                "tips": [
-                    "请稍后重试，或更换网络出口",
-                    "可先用全资源模式确认页面是否仅返回校验内容",
-                    "若 Vercel 失败但浏览器可看视频，通常是机房 IP 被风控",
-                ],
-            }
-        ), 423
+    status_code, body = scrape_page(
+        page_url,
+        "local-flask",
+        refetch=safe_requests_get,
+        use_cache=payload.get("cache", True) is not False,
+    )
+    return jsonify(body), status_code
 
-    if not videos:
-        return jsonify(
-            {
-                "status": "success",
-                "message": "页面已解析，但未找到可下载视频",
-                "videos": [],
-                "count": 0,
-                "page_title": page_title,
-                "tips": [
-                    "请确认链接是商品详情页，而不是搜索页或店铺首页",
-                    "请尝试更换其他商品链接",
-                    "部分商品视频可能由前端动态加密加载",
-                ],
-            }
-        )
 
-    return jsonify(
-        {
-            "status": "success",
-            "message": f"找到 {len(videos)} 个视频",
-            "videos": videos,
-            "count": len(videos),
-            "page_title": page_title,
-        }
+@app.post("/api/scrape/batch")
+def scrape_batch():
+    payload = request.get_json(silent=True) or {}
+    urls = payload.get("urls", [])
+    if not isinstance(urls, list) or len(urls) == 0:
+        return jsonify({"status": "error", "error": "urls 不能为空"}), 400
+    if len(urls) > SCRAPE_BATCH_MAX_URLS:
+        return jsonify({"status": "error", "error": f"单次最多 {SCRAPE_BATCH_MAX_URLS} 个链接"}), 400
+
+    results = iter_scrape_batch(
+        [normalize_input_url(url) if isinstance(url, str) else "" for url in urls],
+        "local-flask",
+        refetch=safe_requests_get,
+        use_cache=payload.get("cache", True) is not False,
+        workers=resolve_batch_workers(payload.get("concurrency")),
     )
 
+    def generate():
+        for result in results:
+            yield json.dumps(result, ensure_ascii=False) + "\n"
+
+    return Response(generate(), mimetype="application/x-ndjson")
+
 
 @app.post("/api/package")
 def package():
@@ -144,36 +142,43 @@ def package():
     if not isinstance(videos, list) or len(videos) == 0:
         return jsonify({"status": "error", "error": "没有视频可打包"}), 400
 
-    zip_buffer = io.BytesIO()
-    success_count = 0
-
-    with zipfile.ZipFile(zip_buffer, "w", zipfile.ZIP_DEFLATED) as zip_file:
-        for index, video_url in enumerate(videos, start=1):
-            if not isinstance(video_url, str) or not video_url.startswith(("http://", "https://")):
-                continue
-            try:
-                response = safe_requests_get(video_url, timeout=30)
-                response.raise_for_status()
-                zip_file.writestr(filename_from_url(video_url, index), response.content)
-                success_count += 1
-            except requests.RequestException:
-                continue
-
-    if success_count == 0:
+    workers = resolve_package_workers(payload.get("concurrency"))
+    if payload.get("stream"):
+        stream = iter_zip_stream(videos, fetch_video, include_report=True, workers=workers)
+        first_chunk = next(stream, None)
+        if first_chunk is None:
+            return jsonify({"status": "error", "error": "所有视频下载失败，无法打包"}), 500
+
+        def generate():
+            yield first_chunk
+            yield from stream
+
+        return Response(
+            generate(),
+            mimetype="application/zip",
+            headers={"Content-Disposition": f'attachment; filename="{PACKAGE_FILENAME}"'},
+        )
+
+    report = PackageReport(len(videos))
+    zip_bytes = build_zip_bytes(videos, fetch_video, report, workers)
+    if report.success_count == 0:
         return jsonify({"status": "error", "error": "所有视频下载失败，无法打包"}), 500
 
-    zip_buffer.seek(0)
-    zip_base64 = base64.b64encode(zip_buffer.getvalue()).decode("utf-8")
-    return jsonify(
-        {
-            "status": "success",
-            "message": f"打包完成，成功 {success_count}/{len(videos)}",
-            "zip_data": zip_base64,
-            "filename": "alibaba_videos.zip",
-            "success_count": success_count,
-            "total_count": len(videos),
-        }
-    )
+    zip_base64 = base64.b64encode(zip_bytes).decode("utf-8")
+    body = {
+        "status": "success",
+        "message": f"打包完成，成功 {report.success_count}/{report.total_count}",
+        "zip_data": zip_base64,
+        "filename": PACKAGE_FILENAME,
+        "success_count": report.success_count,
+        "total_count": report.total_count,
+        "failed": report.failed,
+        "concurrency": workers,
+    }
+    debug = profiling_debug()
+    if debug:
+        body["debug"] = debug
+    return jsonify(body)
 
 
 @app.post("/api/extract")
@@ -184,9 +189,15 @@ def extract_resources():
         return jsonify({"status": "error", "error": "URL 不能为空"}), 400
 
     try:
-        response = safe_requests_get(page_url, timeout=30)
-        response.raise_for_status()
-        resources = extract_resources_from_html(response.text, response.url or page_url)
+        use_cache = payload.get("cache", True) is not False
+        with stage("fetch"):
+            response = safe_requests_get(page_url, timeout=30, cache=use_cache)
+            response.raise_for_status()
+        resources = extract_resources_from_html(
+            response.text,
+            response.url or page_url,
+            cache=EXTRACTION_CACHE if use_cache else None,
+        )
         counts = {key: len(value) for key, value in resources.items()}
         return jsonify(
             {
@@ -195,6 +206,13 @@ def extract_resources():
                 "resources": resources,
                 "counts": counts,
                 "total": sum(counts.values()),
+                "debug": {
+                    "environment": "local-flask",
+                    "cache": PAGE_CACHE.describe(getattr(response, "cache_status", "bypass")),
+                    "extraction_cache": EXTRACTION_CACHE.stats(),
+                    **timing_debug(),
+                    **profiling_debug(),
+                },
             }
         )
     except requests.RequestException as error:
@@ -209,7 +227,9 @@ def diag_target():
         return jsonify({"status": "error", "error": "url 不能为空"}), 400
 
     try:
-        response = safe_requests_get(target, timeout=20)
+        use_cache = payload.get("cache", True) is not False
+        with stage("fetch"):
+            response = safe_requests_get(target, timeout=20, cache=use_cache)
         return jsonify(
             {
                 "status": "success",
@@ -221,6 +241,9 @@ def diag_target():
                 "server": response.headers.get("Server", ""),
                 "content_length": response.headers.get("Content-Length", ""),
                 "environment": "local-flask",
+                "cache": PAGE_CACHE.describe(getattr(response, "cache_status", "bypass")),
+                "pool": pool_stats(),
+                **timing_debug(),
             }
         )
     except requests.RequestException as error:
@@ -0,0 +1,129 @@
+import argparse
+import asyncio
+import re
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.async_scraper import AsyncAlibabaVideoScraper
+from src.scraper import AlibabaVideoScraper
+
+
+PUNISH_PAGE = "<html><body class='punish-component'><script src='awsc.js'></script>captcha sufei-punish</body></html>"
+
+
+class FakeAlibabaHandler(BaseHTTPRequestHandler):
+    """模拟商品页：固定延迟返回；item_*0 在没有预热 Cookie 时返回校验页。"""
+
+    protocol_version = "HTTP/1.1"
+    delay = 0.2
+
+    def _send(self, status: int, body: bytes, content_type: str, headers: dict | None = None):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        if self.path == "/":
+            self._send(200, b"<html>home</html>", "text/html", {"Set-Cookie": "x5sec=ok; Path=/"})
+            return
+
+        video = re.match(r"/video/(\d+)\.mp4$", self.path)
+        if video:
+            self._send(200, video.group(1).encode("ascii") * 4096, "video/mp4")
+            return
+
+        item = re.match(r"/product-detail/item_(\d+)\.html$", self.path)
+        if not item:
+            self._send(404, b"not found", "text/plain")
+            return
+
+        time.sleep(self.delay)
+        number = int(item.group(1))
+        if number % 10 == 0 and "x5sec=ok" not in (self.headers.get("Cookie") or ""):
+            self._send(200, PUNISH_PAGE.encode("utf-8"), "text/html")
+            return
+        host = self.headers.get("Host")
+        html = (
+            f"<html><head><title>Item {number}</title></head><body>"
+            f'<script>window.detailData = {{"videoUrl":"http://{host}/video/{number}.mp4"}};</script>'
+            "</body></html>"
+        )
+        self._send(200, html.encode("utf-8"), "text/html")
+
+    def log_message(self, *args):
+        pass
+
+
+def run_sync(urls: list, base_url: str) -> tuple[float, int]:
+    scraper = AlibabaVideoScraper(warmup_urls=[f"{base_url}/"], verbose=False)
+    started = time.perf_counter()
+    found = 0
+    for url in urls:
+        html = scraper.fetch_page(url)
+        if html and scraper.extract_videos_from_html(html):
+            found += 1
+    return time.perf_counter() - started, found
+
+
+async def run_async(urls: list, base_url: str, concurrency: int, download_dir: Path, download: bool):
+    async with AsyncAlibabaVideoScraper(
+        concurrency=concurrency,
+        download_dir=download_dir,
+        warmup_urls=[f"{base_url}/"],
+    ) as scraper:
+        started = time.perf_counter()
+        results = [result async for result in scraper.scrape_many(urls, download=download)]
+        if download:
+            # 结束下载进度行
+            print()
+        return time.perf_counter() - started, results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="异步抓取引擎本地校验（内置模拟商品页服务）")
+    parser.add_argument("--pages", type=int, default=40)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--delay", type=float, default=0.2, help="模拟商品页响应延迟（秒）")
+    args = parser.parse_args()
+
+    FakeAlibabaHandler.delay = args.delay
+    server = ThreadingHTTPServer(("127.0.0.1", 0), FakeAlibabaHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base_url = f"http://127.0.0.1:{server.server_port}"
+    urls = [f"{base_url}/product-detail/item_{number}.html" for number in range(1, args.pages + 1)]
+
+    sync_seconds, sync_found = run_sync(urls, base_url)
+    print(f"同步逐页: {sync_seconds:.2f}s | 找到视频的页面 {sync_found}/{len(urls)}")
+
+    ok = sync_found == len(urls)
+    with tempfile.TemporaryDirectory() as temp_dir:
+        for download in (False, True):
+            seconds, results = asyncio.run(run_async(urls, base_url, args.concurrency, Path(temp_dir), download))
+            succeeded = [result for result in results if result["status"] == "success" and result["count"] == 1]
+            downloaded = sum(result.get("downloads", {}).get("success", 0) for result in results)
+            mode = "提取+下载" if download else "仅提取"
+            print(
+                f"异步 {mode} (并发 {args.concurrency}): {seconds:.2f}s | 成功 {len(succeeded)}/{len(urls)}"
+                + (f" | 下载 {downloaded} 个文件" if download else "")
+            )
+            ok = ok and len(succeeded) == len(urls)
+            if download:
+                ok = ok and downloaded == len(urls) and len(list(Path(temp_dir).glob("*.mp4"))) == len(urls)
+
+    server.shutdown()
+    print("\n检查完成。" if ok else "\n校验失败！")
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,175 @@
+import argparse
+import gzip
+import hashlib
+import json
+import random
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.scraper import AlibabaVideoScraper
+
+DEFAULT_CORPUS_DIR = Path(__file__).parent / "bench_corpus"
+CATEGORIES = ("product", "search", "anti-bot")
+# 合成语料随仓库提交，规模保持在几百 KB 以内
+SIZES = {"s": 60, "m": 600, "l": 2000}
+
+
+def _card(rng: random.Random, index: int) -> str:
+    return (
+        f'<div class="card" data-id="{index}"><a href="/product-detail/item_{index}.html">'
+        f'<img src="https://s.alicdn.com/@sc04/kf/H{rng.getrandbits(64):x}.jpg" '
+        f'data-src="//s.alicdn.com/@sc04/kf/L{rng.getrandbits(48):x}.png"></a>'
+        f'<span class="price">US$ {rng.randint(1, 90)}.{rng.randint(0, 99):02d}</span>'
+        f'<span class="moq">{rng.randint(1, 500)} pieces</span></div>'
+    )
+
+
+def build_product_page(items: int, seed: int) -> str:
+    """商品详情页：<video> 标签、application/json 与 window 内联状态、转义 JSON 中的视频都混在大量 SKU 节点里。"""
+    rng = random.Random(seed)
+    state = {
+        "product": {"subject": f"Demo Product {seed}", "mediaItems": []},
+        "skus": [{"id": index, "price": rng.randint(1, 99), "img": f"https://s.alicdn.com/sku/{index}.jpg"}
+                 for index in range(items)],
+    }
+    parts = [f"<html><head><title>Demo Product {seed} - Alibaba.com</title></head><body>"]
+    for index in range(items):
+        parts.append(_card(rng, index))
+        if index % 300 == 0:
+            video_id = rng.getrandbits(40)
+            parts.append(f'<video poster="https://s.alicdn.com/p/{video_id}.jpg"><source src="//cloud.video.taobao.com/play/u/{video_id}.mp4"></video>')
+            state["product"]["mediaItems"].append({"type": "video", "videoUrl": f"https://cloud.video.alibaba.com/{video_id}.mp4"})
+        if index % 500 == 0:
+            parts.append(
+                '<script>window.__DETAIL__="{\\"playUrl\\":\\"https:\\/\\/cloud.video.taobao.com\\/'
+                f'{rng.getrandbits(40)}.mp4\\"}}";</script>'
+            )
+    parts.append(f'<script type="application/json" id="page-data">{json.dumps(state)}</script>')
+    parts.append(f"<script>window.__INIT_DATA__ = {json.dumps({'gallery': [{'src': f'//cloud.video.alibaba.com/g/{seed}.webm'}]})};</script>")
+    parts.append("</body></html>")
+    return "".join(parts)
+
+
+def build_search_page(items: int, seed: int) -> str:
+    """搜索结果页：大量商品卡片与翻页链接，偶尔带预览视频。"""
+    rng = random.Random(seed)
+    parts = [f"<html><head><title>sunglasses - Alibaba.com search {seed}</title></head><body><ul>"]
+    for index in range(items):
+        parts.append(f"<li>{_card(rng, index)}</li>")
+        if index % 1000 == 999:
+            parts.append(f'<a href="https://www.alibaba.com/catalog/page-{index // 1000}/">next</a>')
+        if index % 2000 == 0:
+            parts.append(f'<script>{{"previewVideoUrl":"https://cloud.video.alibaba.com/preview/{rng.getrandbits(32)}.mp4"}}</script>')
+    parts.append('<a href="https://www.alibaba.com/files/catalog.pdf">catalog</a></ul></body></html>')
+    return "".join(parts)
+
+
+def build_anti_bot_page(items: int, seed: int) -> str:
+    """反爬校验页：punish 组件、awsc.js、captcha，体积随内联脚本增大。"""
+    rng = random.Random(seed)
+    filler = "".join(f"var _{index}='{rng.getrandbits(64):x}';" for index in range(items))
+    return (
+        "<html><head><title>Captcha Interception</title></head><body class='punish-component'>"
+        "<div id='sufei-punish'>Sorry, we have detected unusual traffic from your network.</div>"
+        f"<script src='https://g.alicdn.com/AWSC/AWSC/awsc.js'></script><script>{filler}</script>"
+        "<div class='captcha-box'>x5sec deny</div></body></html>"
+    )
+
+
+BUILDERS = {"product": build_product_page, "search": build_search_page, "anti-bot": build_anti_bot_page}
+
+
+def _write_entry(corpus_dir: Path, name: str, category: str, url: str, html: str) -> dict:
+    data = html.encode("utf-8")
+    filename = f"{name}.html.gz"
+    # mtime=0 保证同一页面生成的文件字节一致
+    (corpus_dir / filename).write_bytes(gzip.compress(data, mtime=0))
+    return {
+        "name": name,
+        "category": category,
+        "url": url,
+        "file": filename,
+        "bytes": len(data),
+        "sha256": hashlib.sha256(data).hexdigest(),
+    }
+
+
+def _load_manifest(corpus_dir: Path) -> list:
+    path = corpus_dir / "manifest.json"
+    return json.loads(path.read_text(encoding="utf-8")) if path.exists() else []
+
+
+def _save_manifest(corpus_dir: Path, entries: list):
+    entries = sorted(entries, key=lambda entry: (CATEGORIES.index(entry["category"]), entry["bytes"], entry["name"]))
+    (corpus_dir / "manifest.json").write_text(json.dumps(entries, ensure_ascii=False, indent=2), encoding="utf-8")
+
+
+def generate_corpus(corpus_dir: Path = DEFAULT_CORPUS_DIR) -> list:
+    """按固定种子生成三类页面、三种规模的合成语料；已录制的真实页面会保留。"""
+    corpus_dir.mkdir(parents=True, exist_ok=True)
+    entries = [entry for entry in _load_manifest(corpus_dir) if not entry["name"].startswith("synthetic-")]
+    for category, builder in BUILDERS.items():
+        for size, items in SIZES.items():
+            for seed in (1, 2):
+                name = f"synthetic-{category}-{size}{seed}"
+                url = f"https://www.alibaba.com/product-detail/{name}.html"
+                entries.append(_write_entry(corpus_dir, name, category, url, builder(items, seed)))
+    _save_manifest(corpus_dir, entries)
+    return entries
+
+
+def record_page(url: str, category: str, corpus_dir: Path = DEFAULT_CORPUS_DIR) -> dict:
+    """抓取一个真实页面存入语料库（之后的基准测试完全离线）。"""
+    scraper = AlibabaVideoScraper()
+    html = scraper.fetch_page(url)
+    if not html:
+        raise RuntimeError(f"页面获取失败: {url}")
+    corpus_dir.mkdir(parents=True, exist_ok=True)
+    digest = hashlib.blake2b(url.encode("utf-8"), digest_size=4).hexdigest()
+    entry = _write_entry(corpus_dir, f"recorded-{category}-{digest}", category, scraper.last_final_url or url, html)
+    entries = [item for item in _load_manifest(corpus_dir) if item["name"] != entry["name"]]
+    _save_manifest(corpus_dir, entries + [entry])
+    return entry
+
+
+def load_corpus(corpus_dir: Path = DEFAULT_CORPUS_DIR) -> list:
+    """返回 [(manifest 条目, html)]；语料目录不存在时先生成合成语料。"""
+    entries = _load_manifest(corpus_dir) or generate_corpus(corpus_dir)
+    pages = []
+    for entry in entries:
+        html = gzip.decompress((corpus_dir / entry["file"]).read_bytes()).decode("utf-8")
+        pages.append((entry, html))
+    return pages
+
+
+def corpus_fingerprint(entries) -> str:
+    digest = hashlib.blake2b(digest_size=8)
+    for entry in entries:
+        digest.update(entry["sha256"].encode("ascii"))
+    return digest.hexdigest()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="基准测试语料库：生成合成页面或录制真实页面")
+    parser.add_argument("--dir", type=Path, default=DEFAULT_CORPUS_DIR, help="语料目录")
+    parser.add_argument("--generate", action="store_true", help="（重新）生成合成语料")
+    parser.add_argument("--record", metavar="URL", nargs="*", default=[], help="录制真实页面")
+    parser.add_argument("--category", choices=CATEGORIES, default="product", help="录制页面的类别")
+    args = parser.parse_args()
+
+    if args.generate or not (args.dir / "manifest.json").exists():
+        generate_corpus(args.dir)
+    for url in args.record:
+        entry = record_page(url, args.category, args.dir)
+        print(f"已录制 {entry['name']} ({entry['bytes'] / 1024:.0f} KB)")
+
+    entries = _load_manifest(args.dir)
+    for entry in entries:
+        print(f"{entry['category']:<9} {entry['name']:<32} {entry['bytes'] / 1024:9.1f} KB")
+    print(f"\n共 {len(entries)} 个页面，指纹 {corpus_fingerprint(entries)}")
+
+
+if __name__ == "__main__":
+    main()
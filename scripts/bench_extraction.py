@@ -0,0 +1,214 @@
+import argparse
+import json
+import platform
+import sys
+import threading
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from bench_corpus import DEFAULT_CORPUS_DIR, corpus_fingerprint, load_corpus
+
+from src.page_document import PageDocument, resolve_parser_backend
+from src.resource_extractor import extract_resources_from_html
+from src.scrape_service import scrape_page
+from src.scraper import AlibabaVideoScraper
+
+ROOT = Path(__file__).parent.parent
+DEFAULT_BASELINE = Path(__file__).parent / "bench_baseline.json"
+# 对比基线时这些指标越大越好，其余（延迟、内存）越小越好
+HIGHER_IS_BETTER = ("pages_per_s", "mb_per_s")
+COMPARED_METRICS = ("pages_per_s", "mb_per_s", "p50_ms", "p99_ms", "peak_mb")
+# 延迟差异低于该值（毫秒）时视为测量噪声
+MIN_DELTA_MS = 1.0
+
+
+class CorpusHandler(BaseHTTPRequestHandler):
+    """按 /<页面名> 返回语料中的页面，完整 handler 路径的基准走真实的 HTTP 请求但不出本机。"""
+
+    protocol_version = "HTTP/1.1"
+    pages = {}
+
+    def do_GET(self):
+        body = self.pages.get(self.path.lstrip("/"))
+        status = 200 if body is not None else 404
+        body = body if body is not None else b"not found"
+        self.send_response(status)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def run_extract_videos(entry, html, base_url):
+    AlibabaVideoScraper(verbose=False).extract_videos_from_html(PageDocument(html, entry["url"]))
+
+
+def run_extract_resources(entry, html, base_url):
+    extract_resources_from_html(PageDocument(html, entry["url"]), entry["url"])
+
+
+def run_detect_anti_bot(entry, html, base_url):
+    AlibabaVideoScraper.detect_anti_bot_page(html)
+
+
+def run_handler(entry, html, base_url):
+    status_code, _ = scrape_page(f"{base_url}/{entry['name']}", "benchmark", use_cache=False, verbose=False)
+    if status_code >= 500:
+        raise RuntimeError(f"{entry['name']}: handler 返回 {status_code}")
+
+
+TARGETS = {
+    "extract_videos_from_html": run_extract_videos,
+    "extract_resources_from_html": run_extract_resources,
+    "detect_anti_bot_page": run_detect_anti_bot,
+    # 反爬页会触发会话预热去请求真实站点，完整 handler 路径只跑可离线完成的页面
+    "scrape_handler": run_handler,
+}
+OFFLINE_SKIP = {"scrape_handler": {"anti-bot"}}
+
+
+def percentile(samples: list, fraction: float) -> float:
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, max(0, round(fraction * len(ordered) + 0.5) - 1))
+    return ordered[index]
+
+
+def summarize(samples: list, total_bytes: int, seconds: float, peak: int) -> dict:
+    return {
+        "pages": len(samples),
+        "pages_per_s": round(len(samples) / seconds, 2),
+        "mb_per_s": round(total_bytes / seconds / 1024 / 1024, 2),
+        "p50_ms": round(percentile(samples, 0.50), 3),
+        "p99_ms": round(percentile(samples, 0.99), 3),
+        "peak_mb": round(peak / 1024 / 1024, 2),
+    }
+
+
+def bench_target(name: str, func, pages: list, repeat: int, base_url: str) -> dict:
+    pages = [(entry, html) for entry, html in pages if entry["category"] not in OFFLINE_SKIP.get(name, ())]
+    by_category = {}
+    samples, total_bytes, busy = [], 0, 0.0
+
+    for entry, html in pages:
+        func(entry, html, base_url)  # 预热：首次调用的 import / 正则编译不计入
+        for _ in range(repeat):
+            started = time.perf_counter()
+            func(entry, html, base_url)
+            elapsed = time.perf_counter() - started
+            busy += elapsed
+            samples.append(elapsed * 1000)
+            total_bytes += entry["bytes"]
+            bucket = by_category.setdefault(entry["category"], {"samples": [], "bytes": 0, "seconds": 0.0, "peak": 0})
+            bucket["samples"].append(elapsed * 1000)
+            bucket["bytes"] += entry["bytes"]
+            bucket["seconds"] += elapsed
+
+    # 峰值内存单独测一遍，避免 tracemalloc 的开销混入耗时
+    peak = 0
+    for entry, html in pages:
+        tracemalloc.start()
+        func(entry, html, base_url)
+        page_peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        peak = max(peak, page_peak)
+        bucket = by_category[entry["category"]]
+        bucket["peak"] = max(bucket["peak"], page_peak)
+
+    result = summarize(samples, total_bytes, busy, peak)
+    result["by_category"] = {
+        category: summarize(bucket["samples"], bucket["bytes"], bucket["seconds"], bucket["peak"])
+        for category, bucket in by_category.items()
+    }
+    return result
+
+
+def compare(current: dict, baseline: dict, tolerance: float) -> list:
+    """打印与基线的对比，返回超出容差的退化项。"""
+    regressions = []
+    if baseline.get("meta", {}).get("corpus") != current["meta"]["corpus"]:
+        print("! 基线使用的语料与本次不同，对比结果仅供参考")
+    print(f"\n与基线对比（{baseline.get('meta', {}).get('created', '?')}）:")
+    for name, result in current["targets"].items():
+        before = baseline.get("targets", {}).get(name)
+        if not before:
+            print(f"  {name}: 基线中没有该项")
+            continue
+        changes = []
+        for metric in COMPARED_METRICS:
+            old, new = before.get(metric), result[metric]
+            if not old:
+                continue
+            change = (new - old) / old * 100
+            worse = -change if metric in HIGHER_IS_BETTER else change
+            noise = metric.endswith("_ms") and abs(new - old) < MIN_DELTA_MS
+            flag = " ✗" if worse > tolerance and not noise else ""
+            if flag:
+                regressions.append(f"{name}.{metric} {old} → {new}")
+            changes.append(f"{metric} {change:+.1f}%{flag}")
+        print(f"  {name:<28} " + " | ".join(changes))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="离线提取基准：吞吐、p50/p99 延迟与峰值内存，结果可保存为 JSON 并与基线对比")
+    parser.add_argument("--corpus", type=Path, default=DEFAULT_CORPUS_DIR, help="语料目录（不存在时自动生成合成语料）")
+    parser.add_argument("--repeat", type=int, default=3, help="每个页面的计时次数")
+    parser.add_argument("--targets", nargs="*", choices=list(TARGETS), default=list(TARGETS))
+    parser.add_argument("--output", type=Path, help="把结果写入 JSON 文件")
+    parser.add_argument("--baseline", type=Path, help=f"与之前保存的结果 JSON 对比，仓库内的基线为 {DEFAULT_BASELINE.relative_to(ROOT)}")
+    parser.add_argument("--tolerance", type=float, default=10.0, help="对比时允许的退化百分比，超出则退出码为 1")
+    args = parser.parse_args()
+
+    pages = load_corpus(args.corpus)
+    CorpusHandler.pages = {entry["name"]: html.encode("utf-8") for entry, html in pages}
+    server = ThreadingHTTPServer(("127.0.0.1", 0), CorpusHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base_url = f"http://127.0.0.1:{server.server_port}"
+
+    entries = [entry for entry, _ in pages]
+    total_mb = sum(entry["bytes"] for entry in entries) / 1024 / 1024
+    print(f"语料: {len(entries)} 个页面，{total_mb:.1f}MB，解析后端 {resolve_parser_backend()}\n")
+
+    report = {
+        "meta": {
+            "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "parser": resolve_parser_backend(),
+            "corpus": corpus_fingerprint(entries),
+            "repeat": args.repeat,
+        },
+        "targets": {},
+    }
+    try:
+        for name in args.targets:
+            result = bench_target(name, TARGETS[name], pages, args.repeat, base_url)
+            report["targets"][name] = result
+            print(
+                f"{name:<28} {result['pages_per_s']:9.1f} pages/s {result['mb_per_s']:8.2f} MB/s "
+                f"p50={result['p50_ms']:9.3f}ms p99={result['p99_ms']:9.3f}ms peak={result['peak_mb']:7.2f}MB"
+            )
+    finally:
+        server.shutdown()
+
+    if args.output:
+        args.output.write_text(json.dumps(report, ensure_ascii=False, indent=2) + "\n", encoding="utf-8")
+        print(f"\n结果已保存到 {args.output}")
+
+    if args.baseline:
+        regressions = compare(report, json.loads(args.baseline.read_text(encoding="utf-8")), args.tolerance)
+        if regressions:
+            print(f"\n超出 {args.tolerance:.0f}% 容差的退化:\n  " + "\n  ".join(regressions))
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+import argparse
+import sys
+import timeit
+import tracemalloc
+from pathlib import Path
+
+ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(ROOT))
+
+from bench_video_matcher import build_detail_page, build_state_page
+
+from src.page_document import PageDocument, available_parser_backends
+from src.resource_extractor import extract_resources_from_html
+from src.scraper import AlibabaVideoScraper
+
+# 容易让不同解析器产生分歧的写法：大写标签、未闭合标签、嵌套 source、实体、body 中的 title 等
+EDGE_CASES = {
+    "nested-source": (
+        '<html><head><title>Nested &amp; Sources</title></head><body><VIDEO poster="p.jpg">'
+        '<source src="//cloud.video.taobao.com/a.mp4"><source src="/b.webm"></VIDEO>'
+        '<audio><source src="/c.mp3"></audio></body></html>'
+    ),
+    "unclosed-tags": (
+        '<title>Unclosed</title><div><p>text<img src="/x.jpg"><a href="/docs/spec.pdf">spec'
+        '<video src="https://cloud.video.alibaba.com/u.mp4"><p>after'
+    ),
+    "unclosed-title": (
+        '<html><head><title>Unclosed &amp; title\n<meta charset="utf-8"></head><body><p>text</p></body></html>'
+    ),
+    "title-in-script": (
+        '<html><head><script>var s = "<title>fake</title>";</script><!-- <title>old</title> -->'
+        '<title>Real</title></head><body></body></html>'
+    ),
+    "title-with-lt": "<html><head><title>a < b</title></head><body></body></html>",
+    "unclosed-video": '<div><video src=x></div><audio><source src=y.mp3></audio>',
+    "json-scripts": (
+        '<html><body><script type="application/json">{"video":{"videoUrl":"https://v.alicdn.com/j.mp4"}}</script>'
+        '<script type="APPLICATION/JSON">{"playUrl":"//v.alicdn.com/k.mov"}</script>'
+        '<script>var s = "<video src=\\"https://v.alicdn.com/in-script.mp4\\">";</script></body></html>'
+    ),
+    "entities": (
+        '<html><head><title> A &lt;B&gt; &#x4E2D;文 </title></head><body>'
+        '<img data-src="https://s.alicdn.com/i.jpg?a=1&amp;b=2"><a href="https://cdn.example.com/folder/">dir</a>'
+        '<a href="https://cdn.example.com/f.zip?x=1&amp;y=2">zip</a></body></html>'
+    ),
+}
+
+
+def build_corpus(items: int) -> dict:
+    corpus = {
+        "detail": build_detail_page(items // 3),
+        "state-json": build_state_page(items),
+        **EDGE_CASES,
+    }
+    for path in sorted(ROOT.glob("*.html")):
+        corpus[path.name] = path.read_text(encoding="utf-8")
+    return corpus
+
+
+def extract_all(html: str, parser: str, targeted: bool = True) -> dict:
+    page_url = "https://www.alibaba.com/product-detail/demo.html"
+    document = PageDocument(html, page_url, parser=parser, targeted=targeted)
+    scraper = AlibabaVideoScraper(verbose=False)
+    scraper.extract_videos_from_html(document)
+    return {
+        "videos": scraper.video_urls.to_list(),
+        "resources": extract_resources_from_html(document, page_url),
+        "title": document.title,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="HTML 解析后端与按需建树对照：提取结果一致性 + 解析/提取耗时与峰值内存")
+    parser.add_argument("--items", type=int, default=20000, help="生成页面的商品条目数")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    installed = available_parser_backends()
+    print(f"已安装的解析后端: {', '.join(installed)}（第一个为 auto 时的默认选择）")
+    # html.parser 完整建树（改动前的行为）作为对照基线放在第一行
+    backends = sorted(installed, key=lambda backend: backend != "html.parser")
+    if len(installed) < 2:
+        print("提示: pip install lxml 后可对比 C 实现的后端")
+
+    corpus = build_corpus(args.items)
+    variants = [(backend, targeted) for backend in backends for targeted in (False, True)]
+    ok = True
+    for name, html in corpus.items():
+        expected = extract_all(html, "html.parser", targeted=False)
+        for backend, targeted in variants:
+            if extract_all(html, backend, targeted) != expected:
+                mode = "按需建树" if targeted else "完整建树"
+                print(f"✗ {name}: {backend}（{mode}）的提取结果与 html.parser 完整建树不一致")
+                ok = False
+
+    print()
+    for name in ("detail", "state-json"):
+        html = corpus[name]
+        size_mb = len(html.encode("utf-8")) / 1024 / 1024
+        print(f"{name} size={size_mb:.2f}MB")
+        baseline = None
+        for backend, targeted in variants:
+            seconds = min(timeit.repeat(lambda: extract_all(html, backend, targeted), number=1, repeat=args.repeat))
+            tracemalloc.start()
+            extract_all(html, backend, targeted)
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+            baseline = baseline or seconds
+            mode = "targeted" if targeted else "full"
+            print(
+                f"  {backend:<11} {mode:<8} {seconds * 1000:8.1f}ms ({baseline / seconds:5.2f}x) "
+                f"peak={peak / 1024 / 1024:6.1f}MB"
+            )
+
+    print("\n检查完成，所有后端提取结果一致。" if ok else "\n校验失败！")
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
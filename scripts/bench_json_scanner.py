@@ -0,0 +1,115 @@
+import argparse
+import json
+import random
+import sys
+import timeit
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.json_scanner import VIDEO_EXTENSIONS, iter_key_strings, may_contain_video
+from src.scraper import AlibabaVideoScraper
+
+
+# 旧实现：整段 json.loads 后逐层遍历并对每个键做 lower()，仅用于对照结果与耗时
+def legacy_extract(text: str) -> list[str]:
+    found = []
+
+    def walk(obj, depth=0):
+        if depth > 10:
+            return
+        if isinstance(obj, dict):
+            for key, value in obj.items():
+                if key.lower() in ["video", "videourl", "url", "src", "source", "playurl"]:
+                    if isinstance(value, str) and value.strip().replace("\\/", "/").endswith(VIDEO_EXTENSIONS):
+                        found.append(value)
+                walk(value, depth + 1)
+        elif isinstance(obj, list):
+            for item in obj:
+                walk(item, depth + 1)
+
+    walk(json.loads(text))
+    return found
+
+
+def scanner_extract(text: str) -> list[str]:
+    if not may_contain_video(text):
+        return []
+    return [value for value in iter_key_strings(text) if value.strip().replace("\\/", "/").endswith(VIDEO_EXTENSIONS)]
+
+
+def build_state(items: int, seed: int = 5) -> str:
+    rng = random.Random(seed)
+    products = []
+    for index in range(items):
+        product = {
+            "id": index,
+            "subject": f"item {index} \"quoted\" {{brace}}",
+            "imageUrl": f"https://s.alicdn.com/@sc04/kf/H{rng.getrandbits(64):x}.jpg",
+            "price": {"min": 1.2, "max": 3.4, "tiers": [[1, 2.0], [100, 1.5]]},
+            "tags": ["oem", "odm"],
+        }
+        if index % 200 == 0:
+            product["media"] = {"Video": {"VideoUrl": f"https:\\/\\/cloud.video.taobao.com/{index}.mp4"}}
+        if index % 350 == 0:
+            product["gallery"] = [{"type": "video", "src": f"//cloud.video.alibaba.com/g/{index}.webm"}]
+        products.append(product)
+    deep = {"url": "https://cloud.video.alibaba.com/too-deep.mp4"}
+    for _ in range(12):
+        deep = {"level": deep}
+    return json.dumps({"data": {"products": products, "deep": deep}}, ensure_ascii=False)
+
+
+def measure(func, text: str, repeat: int) -> tuple[float, float]:
+    seconds = min(timeit.repeat(lambda: func(text), number=1, repeat=repeat))
+    tracemalloc.start()
+    func(text)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return seconds, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description="JSON 键路径扫描器与整段 json.loads 遍历的对照基准")
+    parser.add_argument("--items", type=int, default=30000, help="状态数据中的商品条目数")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    text = build_state(args.items)
+    legacy = legacy_extract(text)
+    current = scanner_extract(text)
+    # 扫描器不递归，也就不再需要旧实现的 10 层深度保护；比旧实现多出的只能是超过 10 层的那一条
+    ok = [url for url in current if "too-deep" not in url] == legacy and len(current) == len(legacy) + 1
+    if not ok:
+        print(f"✗ 结果不一致 legacy={len(legacy)} scanner={len(current)}")
+
+    size_mb = len(text.encode("utf-8")) / 1024 / 1024
+    legacy_seconds, legacy_peak = measure(legacy_extract, text, args.repeat)
+    scan_seconds, scan_peak = measure(scanner_extract, text, args.repeat)
+    print(
+        f"state size={size_mb:.2f}MB videos={len(current)}\n"
+        f"  json.loads+遍历 {legacy_seconds * 1000:7.1f}ms peak={legacy_peak / 1024 / 1024:6.1f}MB\n"
+        f"  键路径扫描      {scan_seconds * 1000:7.1f}ms peak={scan_peak / 1024 / 1024:6.1f}MB "
+        f"({legacy_seconds / scan_seconds:.1f}x)"
+    )
+
+    no_video = text.replace(".mp4", ".jpg").replace(".webm", ".png")
+    precheck_seconds = min(timeit.repeat(lambda: scanner_extract(no_video), number=1, repeat=args.repeat))
+    print(f"  无视频脚本预检  {precheck_seconds * 1000:7.1f}ms（直接跳过）")
+
+    # 未标注 type 的 window.xxx = {...} 内联状态，正则候选规则不覆盖 "src" 键
+    inline = f"<html><body><script>window.__INIT_DATA__ = {text};</script></body></html>"
+    scraper = AlibabaVideoScraper(verbose=False)
+    scraper.extract_videos_from_html(inline)
+    inline_found = {url for url in scraper.video_urls if "/g/" in url}
+    expected_inline = {f"https://cloud.video.alibaba.com/g/{index}.webm" for index in range(0, args.items, 350)}
+    print(f"  内联状态脚本    提取到 gallery 视频 {len(inline_found)}/{len(expected_inline)}")
+    ok = ok and inline_found == expected_inline
+
+    print("\n检查完成。" if ok else "\n校验失败！")
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
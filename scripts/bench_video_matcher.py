@@ -0,0 +1,107 @@
+import argparse
+import random
+import re
+import sys
+import timeit
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.video_matcher import find_video_candidates
+
+
+# 旧实现：逐条 re.findall + html.replace 副本，仅用于对照结果与耗时
+LEGACY_PATTERNS = [
+    r'https?://[^\s"\'<>]+\.(?:mp4|webm|ogg|mov)',
+    r'"videoUrl"\s*:\s*"([^"]+)"',
+    r'"video"\s*:\s*"([^"]+)"',
+    r'"playUrl"\s*:\s*"([^"]+)"',
+    r'"previewVideoUrl"\s*:\s*"([^"]+)"',
+    r'"mediaUrl"\s*:\s*"([^"]+)"',
+    r'src=[\'\"](https?://[^\'\"]+\.(?:mp4|webm|ogg|mov))[\'\"]',
+    r'https?:\\/\\/[^\s"\'<>]+\.(?:mp4|webm|ogg|mov)',
+    r'\\"videoUrl\\"\s*:\s*\\"([^\\"]+)\\"',
+    r'\\"playUrl\\"\s*:\s*\\"([^\\"]+)\\"',
+    r'\\"previewVideoUrl\\"\s*:\s*\\"([^\\"]+)\\"',
+    r'\\"mediaUrl\\"\s*:\s*\\"([^\\"]+)\\"',
+]
+
+
+def legacy_find_video_candidates(html: str) -> list[str]:
+    candidates = []
+    for pattern in LEGACY_PATTERNS:
+        for match in re.findall(pattern, html):
+            candidates.append(match if isinstance(match, str) else match[0])
+    compact = html.replace("\\n", " ")
+    for key in ["videoUrl", "playUrl", "previewVideoUrl", "mediaUrl"]:
+        quoted_pattern = rf"{key}\\u0022:\\u0022([^\\u0022]+(?:\\.mp4|\\.webm|\\.ogg|\\.mov)[^\\u0022]*)"
+        candidates.extend(re.findall(quoted_pattern, compact))
+    return candidates
+
+
+def build_detail_page(items: int, seed: int = 7) -> str:
+    rng = random.Random(seed)
+    parts = ["<html><head><title>Demo Product</title></head><body>"]
+    for index in range(items):
+        parts.append(
+            f'<div class="sku-{index}"><img src="https://s.alicdn.com/@sc04/kf/H{rng.getrandbits(64):x}.jpg">'
+            f'<a href="/product/{index}.html">item {index}</a></div>'
+        )
+        if index % 50 == 0:
+            parts.append(f'<video src="https://cloud.video.alibaba.com/play/{index}.mp4"></video>')
+        if index % 80 == 0:
+            parts.append(
+                '<script>window.__DETAIL__="{\\"videoUrl\\":\\"https:\\/\\/cloud.video.taobao.com\\/'
+                f'{index}.mp4\\",\\"mediaUrl\\":\\"//cloud.video.taobao.com/m{index}.mp4\\"}}";</script>'
+            )
+    parts.append("</body></html>")
+    return "".join(parts)
+
+
+def build_state_page(items: int, seed: int = 11) -> str:
+    rng = random.Random(seed)
+    parts = []
+    for index in range(items):
+        parts.append(
+            f'{{"id":{index},"subject":"item {index}","imageUrl":"https://s.alicdn.com/@sc04/kf/H{rng.getrandbits(64):x}.jpg",'
+            f'"price":{{"min":1.2,"max":3.4}},"tags":["oem","odm"]}},'
+        )
+        if index % 500 == 0:
+            parts.append(f'{{"videoUrl":"https://cloud.video.taobao.com/play/u/{index}/e/6/t/1/{index}.mp4"}},')
+    return "<script>window.__INIT_DATA__=[" + "".join(parts) + "]</script>"
+
+
+def best_of(func, html: str, repeat: int) -> float:
+    return min(timeit.repeat(lambda: func(html), number=1, repeat=repeat))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="单次扫描视频匹配器与旧正则级联的对照基准")
+    parser.add_argument("--items", type=int, default=20000, help="每个页面的商品条目数")
+    parser.add_argument("--repeat", type=int, default=7)
+    args = parser.parse_args()
+
+    pages = {
+        "detail": build_detail_page(args.items // 3),
+        "state-json": build_state_page(args.items),
+    }
+
+    for name, html in pages.items():
+        legacy = legacy_find_video_candidates(html)
+        current = find_video_candidates(html)
+        if set(legacy) != set(current):
+            print(f"✗ {name}: 结果不一致 legacy={len(legacy)} current={len(current)}")
+            sys.exit(1)
+
+        legacy_seconds = best_of(legacy_find_video_candidates, html, args.repeat)
+        current_seconds = best_of(find_video_candidates, html, args.repeat)
+        size_mb = len(html.encode("utf-8")) / 1024 / 1024
+        print(
+            f"{name:<11} size={size_mb:.2f}MB candidates={len(current)} "
+            f"legacy={legacy_seconds * 1000:.1f}ms single-scan={current_seconds * 1000:.1f}ms "
+            f"speedup={legacy_seconds / current_seconds:.2f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,145 @@
+import argparse
+import json
+import platform
+import statistics
+import subprocess
+import sys
+from datetime import datetime, timezone
+from pathlib import Path
+
+ROOT = Path(__file__).parent.parent
+DEFAULT_BASELINE = Path(__file__).parent / "import_time_baseline.json"
+# 冷启动时不应被只做参数校验或不出站的函数加载的重量级模块
+HEAVY_MODULES = ("requests", "urllib3", "bs4", "lxml", "soupsieve", "src.scraper", "src.page_document")
+# 耗时差异低于该值（毫秒）时视为测量噪声
+MIN_DELTA_MS = 3.0
+
+_PROBE = """
+import importlib.util, json, sys, time
+import http.server  # Vercel 运行时在加载函数文件之前已导入，不计入函数自身
+sys.path.insert(0, {root!r})
+before = set(sys.modules)
+sys.stderr.write("--probe--\\n")
+spec = importlib.util.spec_from_file_location("vercel_function", {path!r})
+module = importlib.util.module_from_spec(spec)
+started = time.perf_counter()
+spec.loader.exec_module(module)
+elapsed = time.perf_counter() - started
+print(json.dumps({{"ms": elapsed * 1000, "modules": sorted(set(sys.modules) - before)}}))
+"""
+
+
+def discover_functions() -> dict:
+    """api/ 下每个非下划线开头的文件对应一个 Vercel 函数，返回 {端点: 文件路径}。"""
+    functions = {}
+    for path in sorted((ROOT / "api").rglob("*.py")):
+        if path.name.startswith("_"):
+            continue
+        functions["/" + path.relative_to(ROOT).with_suffix("").as_posix()] = path
+    return functions
+
+
+def parse_importtime(stderr: str) -> list:
+    """解析 -X importtime 输出中探针标记之后的行，返回 [(模块, 自身微秒, 累计微秒)]。"""
+    rows = []
+    _, _, tail = stderr.partition("--probe--\n")
+    for line in tail.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|", 2)
+        rows.append((name.strip(), int(self_us), int(cumulative_us)))
+    return rows
+
+
+def probe(path: Path) -> dict:
+    """在全新的解释器中加载一个函数文件，模拟一次冷启动。"""
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", _PROBE.format(root=str(ROOT), path=str(path))],
+        capture_output=True,
+        text=True,
+        check=False,
+    )
+    if completed.returncode != 0:
+        raise RuntimeError(f"{path} 加载失败:\n{completed.stderr[-2000:]}")
+    result = json.loads(completed.stdout.strip().splitlines()[-1])
+    result["rows"] = parse_importtime(completed.stderr)
+    return result
+
+
+def measure(path: Path, repeat: int, top: int) -> dict:
+    runs = [probe(path) for _ in range(repeat)]
+    last = runs[-1]
+    heaviest = sorted(last["rows"], key=lambda row: row[1], reverse=True)[:top]
+    return {
+        "total_ms": round(statistics.median(run["ms"] for run in runs), 2),
+        "modules": len(last["modules"]),
+        "heavy": [name for name in HEAVY_MODULES if name in last["modules"]],
+        "top": [
+            {"module": name, "self_ms": round(self_us / 1000, 2), "cumulative_ms": round(cumulative_us / 1000, 2)}
+            for name, self_us, cumulative_us in heaviest
+        ],
+    }
+
+
+def compare(current: dict, baseline: dict, tolerance: float) -> list:
+    """打印与基线的对比，返回退化项：耗时超出容差，或新加载了重量级模块。"""
+    regressions = []
+    print(f"\n与基线对比（{baseline.get('meta', {}).get('created', '?')}）:")
+    for endpoint, result in current["functions"].items():
+        before = baseline.get("functions", {}).get(endpoint)
+        if not before:
+            print(f"  {endpoint}: 基线中没有该函数")
+            continue
+        old, new = before["total_ms"], result["total_ms"]
+        change = (new - old) / old * 100 if old else 0.0
+        flag = ""
+        if change > tolerance and new - old > MIN_DELTA_MS:
+            flag = " ✗"
+            regressions.append(f"{endpoint} 导入耗时 {old}ms → {new}ms")
+        added = sorted(set(result["heavy"]) - set(before.get("heavy", [])))
+        if added:
+            flag = " ✗"
+            regressions.append(f"{endpoint} 冷启动新加载了 {', '.join(added)}")
+        print(f"  {endpoint:<22} {old:8.2f}ms → {new:8.2f}ms ({change:+.1f}%){flag}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Vercel 函数冷启动导入耗时报告：逐个函数在全新解释器中加载，列出耗时最多的模块")
+    parser.add_argument("--repeat", type=int, default=5, help="每个函数的加载次数，取中位数")
+    parser.add_argument("--top", type=int, default=8, help="每个函数列出的耗时最多的模块数")
+    parser.add_argument("--output", type=Path, help="把结果写入 JSON 文件（更新基线时写到 --baseline 的路径）")
+    parser.add_argument("--baseline", type=Path, help=f"与之前保存的结果对比，仓库内的基线为 {DEFAULT_BASELINE.relative_to(ROOT)}")
+    parser.add_argument("--tolerance", type=float, default=25.0, help="对比时允许的耗时退化百分比，超出则退出码为 1")
+    args = parser.parse_args()
+
+    report = {
+        "meta": {
+            "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "repeat": args.repeat,
+        },
+        "functions": {},
+    }
+    for endpoint, path in discover_functions().items():
+        result = measure(path, args.repeat, args.top)
+        report["functions"][endpoint] = result
+        heavy = ", ".join(result["heavy"]) or "无"
+        print(f"{endpoint:<22} {result['total_ms']:8.2f}ms  {result['modules']:4d} 个模块  重量级模块: {heavy}")
+        for row in result["top"]:
+            print(f"    {row['module']:<36} 自身 {row['self_ms']:7.2f}ms  累计 {row['cumulative_ms']:7.2f}ms")
+
+    if args.output:
+        args.output.write_text(json.dumps(report, ensure_ascii=False, indent=2) + "\n", encoding="utf-8")
+        print(f"\n结果已保存到 {args.output}")
+
+    if args.baseline:
+        regressions = compare(report, json.loads(args.baseline.read_text(encoding="utf-8")), args.tolerance)
+        if regressions:
+            print("\n退化:\n  " + "\n  ".join(regressions))
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
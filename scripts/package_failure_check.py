@@ -0,0 +1,109 @@
+import argparse
+import io
+import json
+import sys
+import threading
+import zipfile
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import requests
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.packager import PACKAGE_REPORT_NAME, PackageReport, build_zip_bytes, iter_zip_stream
+
+
+class VideoHandler(BaseHTTPRequestHandler):
+    """本地测试服务：/bad 开头的路径声明完整长度，只写出一部分就断开连接，模拟下载中途失败。"""
+
+    protocol_version = "HTTP/1.1"
+    body = b""
+    sent_before_drop = 0
+
+    def do_GET(self):
+        self.send_response(200)
+        self.send_header("Content-Type", "video/mp4")
+        self.send_header("Content-Length", str(len(self.body)))
+        self.end_headers()
+        try:
+            if self.path.startswith("/bad"):
+                self.wfile.write(self.body[: self.sent_before_drop])
+                self.wfile.flush()
+                self.close_connection = True
+                return
+            self.wfile.write(self.body)
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+
+    def log_message(self, *args):
+        pass
+
+
+def fetch(video_url: str):
+    return requests.get(video_url, timeout=10, stream=True)
+
+
+def read_zip(data: bytes) -> dict:
+    with zipfile.ZipFile(io.BytesIO(data)) as zip_file:
+        return {name: zip_file.read(name) for name in zip_file.namelist()}
+
+
+def check(name: str, passed: bool, detail: str) -> bool:
+    print(f"{'✓' if passed else '✗'} {name}: {detail}")
+    return passed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="打包时视频下载中途失败的本地校验（缓冲模式不留残缺条目，流式模式在报告中注明截断）")
+    parser.add_argument("--size-kb", type=int, default=256)
+    parser.add_argument("--drop-after-kb", type=int, default=48, help="失败的视频写出多少 KB 后断开连接")
+    parser.add_argument("--workers", type=int, default=2)
+    args = parser.parse_args()
+
+    VideoHandler.body = bytes(range(256)) * (args.size_kb * 4)
+    VideoHandler.sent_before_drop = args.drop_after_kb * 1024
+    server = ThreadingHTTPServer(("127.0.0.1", 0), VideoHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base_url = f"http://127.0.0.1:{server.server_port}"
+    video_urls = [f"{base_url}/good.mp4", f"{base_url}/bad.mp4", f"{base_url}/good2.mp4"]
+    expected_names = ["01_good.mp4", "03_good2.mp4"]
+
+    ok = True
+    # 缓冲模式（/api/package 默认的 base64 返回）：失败的视频不进入压缩包
+    report = PackageReport(len(video_urls))
+    entries = read_zip(build_zip_bytes(video_urls, fetch, report, args.workers))
+    ok &= check("缓冲模式条目", sorted(entries) == expected_names, ", ".join(sorted(entries)))
+    ok &= check("缓冲模式内容", all(entries[name] == VideoHandler.body for name in expected_names if name in entries), "完整")
+    failed = report.failed
+    ok &= check(
+        "缓冲模式报告",
+        report.success_count == 2 and [item["index"] for item in failed] == [2] and "truncated_entry" not in failed[0],
+        json.dumps(failed, ensure_ascii=False),
+    )
+
+    # 流式模式：条目已写出无法撤回，截断的条目须在报告中注明
+    stream_report = PackageReport(len(video_urls))
+    data = b"".join(iter_zip_stream(video_urls, fetch, include_report=True, report=stream_report, workers=args.workers))
+    entries = read_zip(data)
+    truncated = entries.get("02_bad.mp4", b"")
+    ok &= check(
+        "流式模式截断条目",
+        0 < len(truncated) < len(VideoHandler.body),
+        f"02_bad.mp4 {len(truncated)} 字节（完整为 {len(VideoHandler.body)} 字节）",
+    )
+    packaged_report = json.loads(entries.get(PACKAGE_REPORT_NAME, b"{}"))
+    ok &= check(
+        "流式模式报告",
+        [item.get("truncated_entry") for item in packaged_report.get("failed", [])] == ["02_bad.mp4"],
+        json.dumps(packaged_report.get("failed"), ensure_ascii=False),
+    )
+    ok &= check("流式模式完整条目", all(entries.get(name) == VideoHandler.body for name in expected_names), "完整")
+
+    server.shutdown()
+    print("\n检查完成。" if ok else "\n校验失败！")
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
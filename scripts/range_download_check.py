@@ -0,0 +1,108 @@
+import argparse
+import hashlib
+import re
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.resumable_download import PartialDownload
+from src.scraper import AlibabaVideoScraper
+
+
+class RangeHandler(BaseHTTPRequestHandler):
+    """本地测试服务：/ranged 支持 Range，/plain 忽略 Range 总是返回 200 全量内容。"""
+
+    protocol_version = "HTTP/1.1"
+    body = b""
+    delay = 0.0
+    requests_seen = []
+
+    def do_GET(self):
+        range_header = self.headers.get("Range")
+        RangeHandler.requests_seen.append((self.path, range_header))
+        start, end = 0, len(self.body) - 1
+        match = re.match(r"bytes=(\d+)-(\d*)", range_header or "")
+        if self.path == "/ranged" and match:
+            start = int(match.group(1))
+            end = min(int(match.group(2) or end), end)
+            self.send_response(206)
+            self.send_header("Content-Range", f"bytes {start}-{end}/{len(self.body)}")
+        else:
+            self.send_response(200)
+        if self.path == "/ranged":
+            self.send_header("Accept-Ranges", "bytes")
+        self.send_header("ETag", '"check-v1"')
+        self.send_header("Content-Length", str(end - start + 1))
+        self.end_headers()
+
+        data = self.body[start:end + 1]
+        # 模拟单连接限速：每个连接按固定节奏写出，分段并行才能体现收益
+        try:
+            for offset in range(0, len(data), 256 * 1024):
+                self.wfile.write(data[offset:offset + 256 * 1024])
+                if self.delay:
+                    time.sleep(self.delay)
+        except (BrokenPipeError, ConnectionResetError):
+            # 探测请求只读响应头便关闭连接，属于正常情况
+            pass
+
+    def log_message(self, *args):
+        pass
+
+
+class QuietProgress:
+    def add_bytes(self, size: int):
+        pass
+
+
+def run_download(base_url: str, path: str, segments: int, target_dir: Path) -> tuple[float, str]:
+    scraper = AlibabaVideoScraper(segments=segments)
+    partial = PartialDownload(target_dir / f"{path.strip('/')}_{segments}.mp4", f"{base_url}{path}")
+    started = time.perf_counter()
+    scraper._download_to_part(partial, QuietProgress())
+    partial.finalize()
+    elapsed = time.perf_counter() - started
+    return elapsed, hashlib.sha256(partial.filepath.read_bytes()).hexdigest()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="分段多连接下载本地校验")
+    parser.add_argument("--size-mb", type=int, default=16)
+    parser.add_argument("--segments", type=int, default=4)
+    parser.add_argument("--delay", type=float, default=0.01, help="每 256KB 的写出间隔（秒）")
+    args = parser.parse_args()
+
+    RangeHandler.body = bytes(range(256)) * (args.size_mb * 4096)
+    RangeHandler.delay = args.delay
+    expected = hashlib.sha256(RangeHandler.body).hexdigest()
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), RangeHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base_url = f"http://127.0.0.1:{server.server_port}"
+
+    ok = True
+    with tempfile.TemporaryDirectory() as temp_dir:
+        target_dir = Path(temp_dir)
+        for path, segments in (("/ranged", 1), ("/ranged", args.segments), ("/plain", args.segments)):
+            RangeHandler.requests_seen = []
+            elapsed, digest = run_download(base_url, path, segments, target_dir)
+            ranged_requests = sum(1 for _, value in RangeHandler.requests_seen if value and value != "bytes=0-0")
+            matched = digest == expected
+            ok = ok and matched
+            print(
+                f"{path:<8} segments={segments} 耗时 {elapsed:.2f}s | "
+                f"{args.size_mb / elapsed:.1f} MB/s | 分段请求 {ranged_requests} | 校验 {'通过' if matched else '失败'}"
+            )
+
+    server.shutdown()
+    print("\n检查完成。" if ok else "\n校验失败！")
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,139 @@
+import argparse
+import random
+import sys
+import threading
+import time
+import tracemalloc
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from bench_video_matcher import build_detail_page, build_state_page
+
+from src.scraper import AlibabaVideoScraper
+from src.stream_scanner import StreamingVideoScanner
+from src.video_matcher import find_video_candidates
+
+
+class ThrottledPageHandler(BaseHTTPRequestHandler):
+    """按固定速率分块返回同一个大页面，模拟慢速链路上的超大商品详情页。"""
+
+    protocol_version = "HTTP/1.1"
+    page = b""
+    chunk_size = 64 * 1024
+    chunk_delay = 0.02
+
+    def handle(self):
+        # 提前结束的客户端会直接断开 keep-alive 连接
+        try:
+            super().handle()
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+
+    def do_GET(self):
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(self.page)))
+        self.end_headers()
+        for start in range(0, len(self.page), self.chunk_size):
+            self.wfile.write(self.page[start:start + self.chunk_size])
+            time.sleep(self.chunk_delay)
+
+    def log_message(self, *args):
+        pass
+
+
+def scan_in_chunks(html: str, rng: random.Random) -> list:
+    candidates = []
+    scanner = StreamingVideoScanner(lambda src: None, lambda data: None, candidates.append, overlap=512)
+    position = 0
+    while position < len(html):
+        size = rng.choice((1, 7, 64, 500, 4096, 65536))
+        scanner.feed(html[position:position + size])
+        position += size
+    scanner.close()
+    return candidates
+
+
+def check_chunk_boundaries(pages: dict) -> bool:
+    ok = True
+    rng = random.Random(3)
+    for name, html in pages.items():
+        expected = sorted(find_video_candidates(html))
+        for _ in range(3):
+            actual = sorted(scan_in_chunks(html, rng))
+            if actual != expected:
+                print(f"✗ {name}: 分块扫描结果与整页不一致 stream={len(actual)} full={len(expected)}")
+                ok = False
+                break
+        else:
+            print(f"✓ {name}: 随机分块扫描与整页结果一致（{len(expected)} 个候选）")
+    return ok
+
+
+def measure(label: str, func):
+    tracemalloc.start()
+    started = time.perf_counter()
+    result = func(started)
+    seconds = time.perf_counter() - started
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{label:<16} 总耗时 {seconds * 1000:7.1f}ms | 峰值内存 {peak / 1024 / 1024:6.2f}MB | {result}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="流式增量提取本地校验（分块一致性 + 首个结果耗时/提前结束）")
+    parser.add_argument("--items", type=int, default=20000, help="模拟页面的商品条目数")
+    parser.add_argument("--chunk-delay", type=float, default=0.02, help="服务端每 64KB 的发送间隔（秒）")
+    args = parser.parse_args()
+
+    detail = build_detail_page(args.items // 3)
+    pages = {"detail": detail, "state-json": build_state_page(args.items)}
+    ok = check_chunk_boundaries(pages)
+
+    ThrottledPageHandler.page = detail.encode("utf-8")
+    ThrottledPageHandler.chunk_delay = args.chunk_delay
+    server = ThreadingHTTPServer(("127.0.0.1", 0), ThrottledPageHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_port}/product-detail/big.html"
+    print(f"\n页面大小 {len(ThrottledPageHandler.page) / 1024 / 1024:.2f}MB\n")
+
+    full = []
+
+    def buffered(started):
+        scraper = AlibabaVideoScraper(verbose=False)
+        scraper.extract_videos_from_html(scraper.fetch_page(url))
+        full.extend(scraper.video_urls)
+        return f"首个结果 {(time.perf_counter() - started) * 1000:.1f}ms | 视频 {len(full)}"
+
+    streamed = []
+
+    def streaming(started, max_videos=0):
+        scraper = AlibabaVideoScraper(verbose=False)
+        videos = list(scraper.stream_videos(url, max_videos))
+        streamed.append(videos)
+        stats = scraper.last_stream_stats
+        return (
+            f"首个结果 {stats['first_video_ms']}ms | 视频 {len(videos)} | "
+            f"读取 {stats['chars'] / 1024 / 1024:.2f}M 字符" + (" | 提前结束" if stats["early_exit"] else "")
+        )
+
+    measure("整页读取后提取", buffered)
+    measure("流式提取", streaming)
+    measure("流式 + 提前结束", lambda started: streaming(started, max_videos=1))
+    server.shutdown()
+
+    if set(streamed[0]) != set(full):
+        print("✗ 流式提取结果与整页提取不一致")
+        ok = False
+    if len(streamed[1]) < 1 or streamed[1][0] != streamed[0][0]:
+        print("✗ 提前结束时未得到首个视频")
+        ok = False
+
+    print("\n检查完成。" if ok else "\n校验失败！")
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,250 @@
+import asyncio
+import functools
+import hashlib
+import os
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from src.config import (
+    ASYNC_PAGE_CONCURRENCY,
+    DOWNLOAD_DIR,
+    DOWNLOAD_PER_HOST_LIMIT,
+    DOWNLOAD_SEGMENTS,
+    DOWNLOAD_WORKERS,
+    REQUEST_TIMEOUT,
+)
+from src.download_manager import DownloadProgress
+from src.page_document import PageDocument
+from src.resource_extractor import extract_resources_from_html
+from src.scraper import WARMUP_URLS, AlibabaVideoScraper, VideoUrlCollector
+from src.session_store import SessionStore
+
+
+def page_filename_prefix(page_url: str) -> str:
+    """同一批次里多个商品页的视频文件名前缀，避免 video_1.mp4 互相覆盖。"""
+    stem = urlparse(page_url).path.rstrip("/").rsplit("/", 1)[-1].rsplit(".", 1)[0]
+    stem = re.sub(r"[^A-Za-z0-9]+", "-", stem).strip("-")[-40:] or "page"
+    digest = hashlib.blake2b(page_url.encode("utf-8"), digest_size=3).hexdigest()
+    return f"{stem}_{digest}_"
+
+
+def extract_page(html: str, page_url: str) -> dict:
+    """解析与正则匹配是 CPU 密集部分；纯函数，可交给线程池或进程池执行。"""
+    document = PageDocument(html, page_url)
+    # 只做提取，不为每个页面创建会话
+    videos = VideoUrlCollector().collect(document)
+    if not videos:
+        resources = extract_resources_from_html(document, page_url)
+        videos = [item["url"] for item in resources.get("videos", []) if isinstance(item, dict)]
+
+    try:
+        page_title = document.title
+    except (TypeError, ValueError, AttributeError):
+        page_title = ""
+    return {
+        "videos": videos,
+        "page_title": page_title,
+        "anti_bot": not videos and AlibabaVideoScraper.detect_anti_bot_page(html),
+    }
+
+
+def _elapsed_ms(started: float) -> float:
+    return round((time.perf_counter() - started) * 1000, 1)
+
+
+class AsyncAlibabaVideoScraper:
+    """AlibabaVideoScraper 的 asyncio 版本，流程同样是 fetch_page → 提取 → 下载。
+
+    请求仍由 requests 在线程池中执行，所有页面共用一个 Session（连接池与 Cookie）；
+    信号量限制同时在途的页面数，解析放在单独的执行器里，不阻塞事件循环。
+    """
+
+    def __init__(self, concurrency: int = ASYNC_PAGE_CONCURRENCY, download_workers: int = DOWNLOAD_WORKERS,
+                 download_dir=DOWNLOAD_DIR, session=None, page_cache=None, extract_executor=None,
+                 warmup_urls=WARMUP_URLS, progress_stream=None, segments=DOWNLOAD_SEGMENTS, session_store=None,
+                 per_host_limit=DOWNLOAD_PER_HOST_LIMIT):
+        self.concurrency = max(1, concurrency)
+        self.download_workers = max(1, download_workers)
+        self.per_host_limit = max(1, per_host_limit)
+        if session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_maxsize=self.concurrency + self.download_workers)
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+        self.session = session
+        self.page_cache = page_cache
+        if session_store is None:
+            # 未共享会话存储时使用实例内的存储，预热结果同样按有效期过期并重新预热
+            session_store = SessionStore(disk_dir=None)
+        # 复用同步实现的请求头、SSL 兜底、会话预热与断点续传下载
+        self._sync = AlibabaVideoScraper(
+            download_workers=self.download_workers,
+            segments=segments,
+            session=session,
+            download_dir=download_dir,
+            warmup_urls=warmup_urls,
+            session_store=session_store,
+            verbose=False,
+        )
+        self._io_executor = ThreadPoolExecutor(
+            max_workers=self.concurrency + self.download_workers,
+            thread_name_prefix="async-io",
+        )
+        # 可传入 ProcessPoolExecutor 让解析绕开 GIL；默认使用线程池
+        self._owns_extract_executor = extract_executor is None
+        self._extract_executor = extract_executor or ThreadPoolExecutor(
+            max_workers=os.cpu_count() or 4,
+            thread_name_prefix="async-extract",
+        )
+        self.progress = DownloadProgress(0, stream=progress_stream)
+        self._page_slots = None
+        self._download_slots = None
+        self._host_slots = {}
+
+    def _ensure_loop_state(self):
+        # 信号量在事件循环内创建
+        if self._page_slots is None:
+            self._page_slots = asyncio.Semaphore(self.concurrency)
+            self._download_slots = asyncio.Semaphore(self.download_workers)
+
+    def _host_slot(self, video_url: str) -> asyncio.Semaphore:
+        # 与 DownloadManager 一致：同一域名同时下载数不超过 per_host_limit，跨所有页面共享
+        host = urlparse(video_url).netloc.lower()
+        if host not in self._host_slots:
+            self._host_slots[host] = asyncio.Semaphore(self.per_host_limit)
+        return self._host_slots[host]
+
+    async def _run_io(self, func, *args):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._io_executor, functools.partial(func, *args))
+
+    def _fetch_blocking(self, url: str):
+        # 会话状态与校验页判断随结果返回，不写到共用的同步实例上（多个 I/O 线程同时执行）
+        session_state = self._sync._attach_session_state()
+        if self.page_cache is None:
+            response = self._sync._safe_get(url, timeout=REQUEST_TIMEOUT)
+        else:
+            response = self.page_cache.fetch(
+                url,
+                self._sync._safe_get,
+                store_if=lambda page: not AlibabaVideoScraper.detect_anti_bot_page(page.text),
+                timeout=REQUEST_TIMEOUT,
+            )
+        response.raise_for_status()
+        response.encoding = "utf-8"
+        html = response.text
+        return html, response.url or url, session_state, AlibabaVideoScraper.check_fetched_response(response, html)
+
+    async def _warm_up(self, session_state) -> bool:
+        # 所有页面共用会话；会话存储负责单飞预热与有效期判断
+        return await self._run_io(self._sync._warm_up_for_retry, session_state)
+
+    async def fetch_page(self, url: str) -> PageDocument | None:
+        self._ensure_loop_state()
+        try:
+            html, final_url, session_state, blocked = await self._run_io(self._fetch_blocking, url)
+            if blocked and await self._warm_up(session_state):
+                html, final_url, _, _ = await self._run_io(self._fetch_blocking, url)
+        except requests.RequestException:
+            return None
+        return PageDocument(html, final_url)
+
+    async def extract(self, document: PageDocument) -> dict:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._extract_executor, extract_page, document.html, document.page_url)
+
+    async def download_video(self, video_url: str, filename: str) -> bool:
+        self._ensure_loop_state()
+        # 先占域名名额再占全局名额，等待某个域名时不占用其他域名可用的下载线程
+        async with self._host_slot(video_url), self._download_slots:
+            success = await self._run_io(self._sync.download_video, video_url, filename, self.progress)
+        self.progress.file_finished(success)
+        return success
+
+    async def scrape(self, url: str, download: bool = True, filename_prefix: str | None = None) -> dict:
+        """抓取单个商品页，返回与 /api/scrape 字段一致的结果，另附各阶段耗时与下载结果。"""
+        self._ensure_loop_state()
+        result = {"url": url, "final_url": "", "status": "success", "videos": [], "count": 0, "page_title": ""}
+        timings = {}
+        result["timings"] = timings
+
+        async with self._page_slots:
+            started = time.perf_counter()
+            document = await self.fetch_page(url)
+            timings["fetch_ms"] = _elapsed_ms(started)
+            if document is None:
+                result.update(status="error", code="FETCH_FAILED", error="页面获取失败，请检查链接是否可访问")
+                return result
+
+            started = time.perf_counter()
+            extracted = await self.extract(document)
+            timings["extract_ms"] = _elapsed_ms(started)
+
+        videos = extracted["videos"]
+        result.update(final_url=document.page_url, videos=videos, count=len(videos), page_title=extracted["page_title"])
+        if extracted["anti_bot"]:
+            result.update(
+                status="error",
+                code="ANTI_BOT_BLOCKED",
+                error="目标站触发反爬校验页（Captcha/Punish），当前请求环境无法直接提取视频。",
+            )
+            return result
+
+        if download and videos:
+            prefix = page_filename_prefix(document.page_url) if filename_prefix is None else filename_prefix
+            self.progress.add_files(len(videos))
+            started = time.perf_counter()
+            outcomes = await asyncio.gather(
+                *(self.download_video(video_url, f"{prefix}video_{index}.mp4") for index, video_url in enumerate(videos, 1))
+            )
+            timings["download_ms"] = _elapsed_ms(started)
+            result["downloads"] = {"success": sum(outcomes), "failed": len(outcomes) - sum(outcomes)}
+        return result
+
+    async def scrape_many(self, urls, download: bool = True):
+        """按完成顺序逐个产出结果；urls 可以是惰性可迭代对象（如逐行读取的文件）。"""
+        self._ensure_loop_state()
+        results = asyncio.Queue()
+        pending_urls = iter(urls)
+
+        async def worker():
+            try:
+                for url in pending_urls:
+                    try:
+                        result = await self.scrape(url, download)
+                    except Exception as error:
+                        # 任何异常都只记在该链接上，保证每个输入链接恰好对应一条结果
+                        result = {"url": url, "status": "error", "code": "SCRAPE_FAILED", "error": str(error)}
+                    await results.put(result)
+            finally:
+                await results.put(None)
+
+        workers = [asyncio.create_task(worker()) for _ in range(self.concurrency)]
+        try:
+            remaining = len(workers)
+            while remaining:
+                result = await results.get()
+                if result is None:
+                    remaining -= 1
+                    continue
+                yield result
+        finally:
+            for task in workers:
+                task.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
+
+    def close(self):
+        self._io_executor.shutdown(wait=False, cancel_futures=True)
+        if self._owns_extract_executor:
+            self._extract_executor.shutdown(wait=False, cancel_futures=True)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        self.close()
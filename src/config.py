@@ -1,3 +1,4 @@
+import os
 from pathlib import Path
 
 # 项目根目录
@@ -28,5 +29,63 @@ WAIT_TIME = 5  # 等待视频加载的时间（秒）
 REQUEST_TIMEOUT = 30  # 下载超时时间（秒）
 CHUNK_SIZE = 8192  # 下载块大小（字节）
 
+# 共享连接池（API 端跨请求复用 keep-alive 连接）
+HTTP_POOL_CONNECTIONS = 8  # 缓存的主机连接池数量
+HTTP_POOL_MAXSIZE = 16  # 每个主机保留的连接数，需不小于打包并发上限
+
+# 命令行下载配置
+DOWNLOAD_WORKERS = 4  # 并发下载线程数
+DOWNLOAD_PER_HOST_LIMIT = 2  # 同一域名同时下载数上限
+DOWNLOAD_RETRIES = 3  # 下载中断后的续传尝试次数（.part 分片跨运行保留）
+DOWNLOAD_SEGMENTS = 1  # 单个视频的分段连接数，大于 1 时对支持 Range 的大文件启用多连接分段下载
+SEGMENT_MIN_SIZE = 8 * 1024 * 1024  # 小于该大小的文件仍使用单连接（字节）
+
+# 流式提取配置（边下载页面边扫描视频）
+STREAM_CHUNK_SIZE = 64 * 1024  # 每次读取的页面块大小（字节）
+STREAM_SCAN_OVERLAP = 4096  # 块尾保留待下一块确认的字符数，需大于单个视频链接的长度
+STREAM_HEAD_CHARS = 64 * 1024  # 保留页面开头用于反爬校验页判断的字符数
+STREAM_EARLY_EXIT_VIDEOS = 0  # 找到该数量的视频后即断开连接，0 表示读完整页
+
+# 异步抓取配置
+ASYNC_PAGE_CONCURRENCY = 32  # 同时在途的商品页数量
+
+# 批量抓取接口（/api/scrape/batch）
+SCRAPE_BATCH_WORKERS = 4  # 默认并发抓取页面数
+SCRAPE_BATCH_MAX_WORKERS = 8  # 请求可指定的并发上限
+SCRAPE_BATCH_MAX_URLS = 200  # 单次请求最多处理的链接数
+
+# 打包配置
+PACKAGE_WORKERS = 4  # 打包时默认并发下载数
+PACKAGE_MAX_WORKERS = 8  # 请求可指定的并发上限
+PACKAGE_PREFETCH_CHUNKS = 64  # 每个下载最多预取的块数（限制内存占用）
+PACKAGE_SPOOL_MEMORY = 32 * 1024 * 1024  # 非流式打包时单个视频先完整下载，超过该大小（字节）后转存临时文件
+
+# 页面缓存配置（/api/scrape、/api/extract、/api/diag 共用）
+PAGE_CACHE_TTL = 300  # 缓存新鲜期（秒），过期后用 ETag / Last-Modified 条件请求重新验证
+PAGE_CACHE_MAX_ENTRIES = 64  # 内存与磁盘各自保留的最多条目数
+PAGE_CACHE_DIR = SERVERLESS_TMP_DIR.parent / "alibaba_page_cache"  # 设为 None 则仅使用内存
+
+# 反爬会话存储：预热得到的 Cookie 在请求与实例间共享，有效期内不再重复预热
+SESSION_STATE_TTL = 1800  # 会话有效期（秒），过期后不再使用其 Cookie
+SESSION_STATE_REFRESH_AFTER = 1200  # 会话存在超过该时长（秒）后，在后台重新预热
+SESSION_REWARM_INTERVAL = 60  # 刚预热过仍遇到校验页时，该时长（秒）内不再重复预热
+SESSION_STATE_DIR = SERVERLESS_TMP_DIR.parent / "alibaba_session"  # 设为 None 则仅保存在进程内
+
+# 分阶段耗时：开启后 API 响应附带 Server-Timing 头与 debug.timing；请求体传 "timing": true 可单次开启
+TIMING_ENABLED = False
+
+# 按需性能采样：对视频/资源提取与打包循环做 cProfile + tracemalloc 采样，文件写入 PROFILE_DIR，debug.profile 附带热点摘要
+# 设置环境变量 ALIBABA_SCRAPER_PROFILE=1 对所有请求开启；请求体传 "profile": true 可单次开启
+PROFILE_ENABLED = os.environ.get("ALIBABA_SCRAPER_PROFILE", "").lower() in ("1", "true", "yes")
+PROFILE_DIR = SERVERLESS_TMP_DIR.parent / "alibaba_profiles"
+PROFILE_TOP_N = 10  # debug 中列出的耗时热点与内存分配位置数量
+
+# HTML 解析后端："auto" 时按 lxml → html.parser 的顺序选用已安装的最快后端，也可指定具体名称
+HTML_PARSER = "auto"
+HTML_TARGETED_PARSE = True  # 只为提取用到的标签建树（video/source/audio/img/a 与内联脚本），其余标签与文本直接跳过；仅对 lxml 后端生效
+
+# 提取结果缓存：按 HTML 内容摘要 + 页面 URL 复用视频/资源提取结果
+EXTRACTION_CACHE_MAX_ENTRIES = 128
+
 # User-Agent（模拟真实浏览器）
 USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
@@ -0,0 +1,109 @@
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlparse
+
+from src.config import DOWNLOAD_PER_HOST_LIMIT, DOWNLOAD_WORKERS
+
+
+def _format_bytes(size: float) -> str:
+    for unit in ("B", "KB", "MB", "GB"):
+        if size < 1024 or unit == "GB":
+            return f"{size:.1f} {unit}"
+        size /= 1024
+    return f"{size:.1f} GB"
+
+
+class DownloadProgress:
+    """所有工作线程共用的一条汇总进度显示。"""
+
+    def __init__(self, total_files: int, refresh_interval: float = 0.2, stream=None):
+        self.total_files = total_files
+        # 标准输出被 JSONL 结果占用时可改写到 stderr
+        self.stream = stream
+        self.refresh_interval = refresh_interval
+        self.files_done = 0
+        self.files_failed = 0
+        self.bytes_done = 0
+        self.started_at = time.monotonic()
+        self._last_render = 0.0
+        self._lock = threading.Lock()
+
+    def add_files(self, count: int):
+        # 总数事先未知时（如异步批量抓取）随任务加入逐步累加
+        with self._lock:
+            self.total_files += count
+
+    def add_bytes(self, size: int):
+        with self._lock:
+            self.bytes_done += size
+            now = time.monotonic()
+            if now - self._last_render >= self.refresh_interval:
+                self._last_render = now
+                self._render()
+
+    def file_finished(self, success: bool):
+        with self._lock:
+            self.files_done += 1
+            if not success:
+                self.files_failed += 1
+            self._render()
+
+    def log(self, message: str):
+        with self._lock:
+            print(f"\r\033[K{message}", file=self.stream or sys.stdout)
+            self._render()
+
+    def _render(self):
+        elapsed = max(time.monotonic() - self.started_at, 1e-6)
+        print(
+            f"\r\033[K  进度: {self.files_done}/{self.total_files} 个文件 | "
+            f"{_format_bytes(self.bytes_done)} | {_format_bytes(self.bytes_done / elapsed)}/s",
+            end="",
+            flush=True,
+            file=self.stream or sys.stdout,
+        )
+
+    def summary(self) -> dict:
+        elapsed = max(time.monotonic() - self.started_at, 1e-6)
+        return {
+            "files": self.files_done,
+            "failed": self.files_failed,
+            "bytes": self.bytes_done,
+            "seconds": round(elapsed, 3),
+            "bytes_per_second": round(self.bytes_done / elapsed, 1),
+            "files_per_second": round((self.files_done - self.files_failed) / elapsed, 3),
+        }
+
+
+class DownloadManager:
+    """线程池并发下载，并按域名限制同时连接数（取代固定的 sleep 间隔）。"""
+
+    def __init__(self, download_func, workers: int = DOWNLOAD_WORKERS, per_host_limit: int = DOWNLOAD_PER_HOST_LIMIT):
+        self.download_func = download_func
+        self.workers = max(1, workers)
+        self.per_host_limit = max(1, per_host_limit)
+        self._host_slots = {}
+        self._host_lock = threading.Lock()
+
+    def _slot_for(self, url: str) -> threading.BoundedSemaphore:
+        host = urlparse(url).netloc.lower()
+        with self._host_lock:
+            if host not in self._host_slots:
+                self._host_slots[host] = threading.BoundedSemaphore(self.per_host_limit)
+            return self._host_slots[host]
+
+    def _run_one(self, video_url: str, filename: str, progress: DownloadProgress) -> bool:
+        with self._slot_for(video_url):
+            success = self.download_func(video_url, filename, progress)
+        progress.file_finished(success)
+        return success
+
+    def run(self, jobs: list[tuple[str, str]]) -> tuple[list[bool], dict]:
+        progress = DownloadProgress(len(jobs))
+        with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="video-download") as executor:
+            futures = [executor.submit(self._run_one, url, filename, progress) for url, filename in jobs]
+            results = [future.result() for future in futures]
+        print()
+        return results, progress.summary()
@@ -0,0 +1,51 @@
+import copy
+import threading
+from collections import OrderedDict
+
+from src.config import EXTRACTION_CACHE_MAX_ENTRIES
+
+
+def _copy(value):
+    # 资源结果含嵌套的 dict 列表，需深拷贝，调用方修改任意层级都不会污染缓存
+    return copy.deepcopy(value)
+
+
+class ExtractionCache:
+    """提取结果的有界 LRU 缓存，键为 (提取类型, HTML 内容摘要, 页面 URL)。
+
+    内容相同的页面（缓存命中、条件请求验证通过或重复提交）无需再次解析 DOM。
+    """
+
+    def __init__(self, max_entries: int = EXTRACTION_CACHE_MAX_ENTRIES):
+        self.max_entries = max(1, max_entries)
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get_or_compute(self, kind: str, document, page_url: str, compute):
+        key = (kind, document.content_hash, page_url or "")
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return _copy(self._entries[key])
+            self.misses += 1
+
+        value = compute()
+        with self._lock:
+            self._entries[key] = _copy(value)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return value
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "entries": len(self._entries)}
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+EXTRACTION_CACHE = ExtractionCache()
@@ -0,0 +1,76 @@
+import threading
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from src.config import HTTP_POOL_CONNECTIONS, HTTP_POOL_MAXSIZE
+from src.metrics import UPSTREAM_BYTES, UPSTREAM_FETCH_SECONDS
+
+
+_session = None
+_session_lock = threading.Lock()
+
+
+def _record_upstream(response, *args, **kwargs):
+    # requests 在读取正文之前调用响应钩子；非 stream 请求在这里提前读出正文以便计入耗时与字节数
+    if kwargs.get("stream"):
+        UPSTREAM_FETCH_SECONDS.observe(response.elapsed.total_seconds(), kind="stream")
+        return response
+    started = time.perf_counter()
+    size = len(response.content)
+    UPSTREAM_FETCH_SECONDS.observe(response.elapsed.total_seconds() + time.perf_counter() - started, kind="page")
+    UPSTREAM_BYTES.inc(size, kind="page")
+    return response
+
+
+def get_shared_session() -> requests.Session:
+    """进程级共享会话：连接池与 keep-alive 在 serverless 热启动的多次调用间复用。"""
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                session = requests.Session()
+                adapter = HTTPAdapter(pool_connections=HTTP_POOL_CONNECTIONS, pool_maxsize=HTTP_POOL_MAXSIZE)
+                session.mount("https://", adapter)
+                session.mount("http://", adapter)
+                session.hooks["response"].append(_record_upstream)
+                _session = session
+    return _session
+
+
+def pooled_get(url: str, **kwargs):
+    session = get_shared_session()
+    try:
+        return session.get(url, **kwargs)
+    except requests.exceptions.SSLError:
+        return session.get(url, verify=False, **kwargs)
+
+
+def pool_stats() -> dict:
+    """各主机连接池的复用情况，供 /api/diag 排查 keep-alive 是否生效。"""
+    if _session is None:
+        return {"initialized": False, "pool_maxsize": HTTP_POOL_MAXSIZE, "hosts": []}
+
+    hosts = []
+    seen = set()
+    for adapter in _session.adapters.values():
+        if id(adapter) in seen:
+            continue
+        seen.add(id(adapter))
+        pools = adapter.poolmanager.pools
+        for key in list(pools.keys()):
+            pool = pools.get(key)
+            if pool is None:
+                continue
+            idle = sum(1 for conn in list(pool.pool.queue) if conn is not None) if pool.pool else 0
+            hosts.append(
+                {
+                    "host": f"{pool.scheme}://{pool.host}:{pool.port}",
+                    "connections": pool.num_connections,
+                    "requests": pool.num_requests,
+                    "reused": max(0, pool.num_requests - pool.num_connections),
+                    "idle": idle,
+                }
+            )
+    return {"initialized": True, "pool_maxsize": HTTP_POOL_MAXSIZE, "hosts": hosts}
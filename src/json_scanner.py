@@ -0,0 +1,46 @@
+import json
+import re
+
+
+# 与原先逐层遍历 JSON 对象时检查的键一致（不区分大小写）
+VIDEO_JSON_KEYS = ("video", "videoUrl", "url", "src", "source", "playUrl")
+VIDEO_EXTENSIONS = (".mp4", ".webm", ".ogg", ".mov")
+
+_INLINE_STATE_RE = re.compile(r"window\.[\w$.]+\s*=")
+
+
+def _key_value_regex(keys) -> re.Pattern:
+    # 先用首字母前瞻过滤，绝大多数引号位置无需进入不区分大小写的分支
+    initials = "".join(sorted({char for key in keys for char in (key[0].lower(), key[0].upper())}))
+    names = "|".join(re.escape(key) for key in keys)
+    return re.compile(rf'"(?=[{initials}])(?i:{names})"\s*:\s*"([^"\\]*(?:\\.[^"\\]*)*)"', re.DOTALL)
+
+
+_VIDEO_KEY_VALUE_RE = _key_value_regex(VIDEO_JSON_KEYS)
+
+
+def may_contain_video(text: str) -> bool:
+    """廉价预检：不含任何视频扩展名的脚本直接跳过，不做后续扫描。"""
+    return any(extension in text for extension in VIDEO_EXTENSIONS)
+
+
+def is_inline_state(text: str) -> bool:
+    return _INLINE_STATE_RE.search(text) is not None
+
+
+def iter_key_strings(text: str, pattern: re.Pattern = _VIDEO_KEY_VALUE_RE):
+    """在 JSON 文本或 window.xxx = {...} 内联状态中，按出现顺序产出目标键下的字符串值。
+
+    只用正则定位 "键": "字符串" 对并按需解码该字符串，不构建完整的 Python 对象树。
+    JSON 字符串内部的引号必然转义，因此命中的 "键": 一定位于字符串之外；
+    文本不必是完整合法的 JSON，截断或夹杂 JS 代码的内联状态同样可以扫描。
+    """
+    for match in pattern.finditer(text):
+        raw = match.group(1)
+        if "\\" not in raw:
+            yield raw
+            continue
+        try:
+            yield json.loads(f'"{raw}"')
+        except ValueError:
+            continue
@@ -0,0 +1,152 @@
+import threading
+from abc import ABC, abstractmethod
+
+# 延迟类直方图的默认桶（秒）
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(pairs) -> str:
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in pairs) + "}"
+
+
+def _format_number(value) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class _Metric(ABC):
+    kind = ""
+
+    def __init__(self, name: str, documentation: str, labels=()):
+        self.name = name
+        self.documentation = documentation
+        self.label_names = tuple(labels)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def _key(self, labels: dict) -> tuple:
+        return tuple(str(labels.get(name, "")) for name in self.label_names)
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+        with self._lock:
+            items = sorted(self._values.items())
+            lines.extend(self._render_samples(items))
+        return lines
+
+    @abstractmethod
+    def _render_samples(self, items) -> list[str]:
+        ...
+
+
+class Counter(_Metric):
+    """单调递增计数器；inc 只在锁内做一次字典更新。"""
+
+    kind = "counter"
+
+    def inc(self, amount: float = 1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels) -> float:
+        with self._lock:
+            return self._values.get(self._key(labels), 0)
+
+    def _render_samples(self, items) -> list[str]:
+        return [
+            f"{self.name}{_format_labels(zip(self.label_names, key))} {_format_number(value)}"
+            for key, value in items
+        ]
+
+
+class Histogram(_Metric):
+    """累积直方图，输出 _bucket / _sum / _count，可直接用 histogram_quantile 计算分位数。"""
+
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, labels=(), buckets=DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labels)
+        self.buckets = tuple(sorted(buckets)) + (float("inf"),)
+
+    def observe(self, value: float, **labels):
+        key = self._key(labels)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                state = self._values[key] = [[0] * len(self.buckets), 0.0, 0]
+            for index, bound in enumerate(self.buckets):
+                if value <= bound:
+                    state[0][index] += 1
+                    break
+            state[1] += value
+            state[2] += 1
+
+    def _render_samples(self, items) -> list[str]:
+        lines = []
+        for key, (counts, total, count) in items:
+            pairs = list(zip(self.label_names, key))
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets, counts):
+                cumulative += bucket_count
+                labels = _format_labels(pairs + [("le", _format_number(bound))])
+                lines.append(f"{self.name}_bucket{labels} {cumulative}")
+            lines.append(f"{self.name}_sum{_format_labels(pairs)} {_format_number(total)}")
+            lines.append(f"{self.name}_count{_format_labels(pairs)} {count}")
+        return lines
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self._metrics = []
+
+    def register(self, metric):
+        self._metrics.append(metric)
+        return metric
+
+    def render(self) -> str:
+        """Prometheus 文本格式（text/plain; version=0.0.4）。"""
+        lines = []
+        for metric in self._metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = MetricsRegistry()
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+API_REQUESTS = REGISTRY.register(
+    Counter("alibaba_api_requests_total", "API 请求数（按端点、方法、状态码）", ("endpoint", "method", "status"))
+)
+API_REQUEST_SECONDS = REGISTRY.register(
+    Histogram("alibaba_api_request_duration_seconds", "API 处理耗时（流式响应只计到开始返回）", ("endpoint",))
+)
+UPSTREAM_FETCH_SECONDS = REGISTRY.register(
+    Histogram("alibaba_upstream_fetch_duration_seconds", "上游请求耗时（stream 响应只计到收到响应头）", ("kind",))
+)
+UPSTREAM_BYTES = REGISTRY.register(
+    Counter("alibaba_upstream_bytes_total", "从上游接收的字节数（页面正文与打包时下载的视频流）", ("kind",))
+)
+VIDEOS_PER_PAGE = REGISTRY.register(
+    Histogram("alibaba_videos_found_per_page", "每个页面找到的视频数", (), buckets=(0, 1, 2, 3, 5, 10, 20, 50))
+)
+ANTI_BOT_CHECKS = REGISTRY.register(
+    Counter("alibaba_anti_bot_checks_total", "上游页面的反爬校验页检测结果（blocked / clear），每次取回只计一次", ("result",))
+)
+PACKAGE_FILES = REGISTRY.register(
+    Counter("alibaba_package_files_total", "打包的视频文件数（success / failed）", ("result",))
+)
+PACKAGES = REGISTRY.register(
+    Counter("alibaba_packages_total", "打包请求数（至少打包成功一个视频即为 success）", ("result",))
+)
+
+
+def render_metrics() -> str:
+    return REGISTRY.render()
@@ -0,0 +1,270 @@
+import hashlib
+import json
+import queue
+import re
+import shutil
+import tempfile
+import threading
+import time
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+from src.config import CHUNK_SIZE, PACKAGE_MAX_WORKERS, PACKAGE_PREFETCH_CHUNKS, PACKAGE_SPOOL_MEMORY, PACKAGE_WORKERS
+from src.metrics import PACKAGE_FILES, PACKAGES, UPSTREAM_BYTES
+from src.profiling import profile_section
+
+
+PACKAGE_FILENAME = "alibaba_videos.zip"
+PACKAGE_REPORT_NAME = "package_report.json"
+
+
+def filename_from_url(video_url: str, index: int) -> str:
+    match = re.search(r"([^/?#]+)(?:\?.*)?$", video_url)
+    filename = match.group(1) if match else f"video_{index}.mp4"
+    if "." not in filename:
+        filename = f"{filename}.mp4"
+    filename = re.sub(r"[^a-zA-Z0-9._-]", "_", filename)
+    return f"{index:02d}_{filename}"
+
+
+class PackageReport:
+    def __init__(self, total_count: int):
+        self.total_count = total_count
+        self.success_count = 0
+        self.failed = []
+
+    def record_success(self):
+        self.success_count += 1
+        PACKAGE_FILES.inc(result="success")
+
+    def record_failure(self, index: int, video_url: str, error: str, truncated_entry: str | None = None):
+        """truncated_entry 为流式打包时已写入压缩包、但内容不完整的条目名。"""
+        failure = {"index": index, "url": video_url, "error": error}
+        if truncated_entry:
+            failure["truncated_entry"] = truncated_entry
+        self.failed.append(failure)
+        PACKAGE_FILES.inc(result="failed")
+
+    def to_dict(self) -> dict:
+        return {
+            "success_count": self.success_count,
+            "total_count": self.total_count,
+            "failed": self.failed,
+        }
+
+
+def resolve_package_workers(value=None) -> int:
+    try:
+        workers = int(value) if value is not None else PACKAGE_WORKERS
+    except (TypeError, ValueError):
+        workers = PACKAGE_WORKERS
+    return max(1, min(workers, PACKAGE_MAX_WORKERS))
+
+
+class _Download:
+    """单个视频的后台下载：工作线程把响应块放进有界队列，打包端按顺序取用。"""
+
+    def __init__(self, index: int, video_url: str, cancelled: threading.Event):
+        self.index = index
+        self.video_url = video_url
+        self._cancelled = cancelled
+        self._queue = queue.Queue(maxsize=PACKAGE_PREFETCH_CHUNKS)
+
+    def _put(self, kind: str, value=None) -> bool:
+        while not self._cancelled.is_set():
+            try:
+                self._queue.put((kind, value), timeout=0.5)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def run(self, fetch, chunk_size: int):
+        finished = False
+        response = None
+        try:
+            response = fetch(self.video_url)
+            response.raise_for_status()
+            if self._put("headers", response.headers):
+                for chunk in response.iter_content(chunk_size=chunk_size):
+                    if not chunk:
+                        continue
+                    UPSTREAM_BYTES.inc(len(chunk), kind="video")
+                    if not self._put("chunk", chunk):
+                        break
+                else:
+                    finished = self._put("done")
+        except requests.RequestException as error:
+            finished = self._put("error", error)
+        finally:
+            if response is not None:
+                response.close()
+            if not finished:
+                # 保证打包端总能拿到结束信号，不会永久阻塞
+                self._put("error", RuntimeError("下载中断"))
+
+    def _get(self):
+        kind, value = self._queue.get()
+        if kind == "error":
+            raise value
+        return kind, value
+
+    def headers(self):
+        _, value = self._get()
+        return value
+
+    def chunks(self):
+        while True:
+            kind, value = self._get()
+            if kind == "done":
+                return
+            yield value
+
+
+class _ConcurrentFetcher:
+    """以有界并发预取视频，但始终按原顺序交付，保证条目顺序与 NN_ 文件名确定。"""
+
+    def __init__(self, video_urls: list, fetch, workers: int, chunk_size: int):
+        self._cancelled = threading.Event()
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="package-fetch")
+        self.downloads = []
+        for index, video_url in enumerate(video_urls, start=1):
+            if not isinstance(video_url, str) or not video_url.startswith(("http://", "https://")):
+                self.downloads.append((index, video_url, None))
+                continue
+            download = _Download(index, video_url, self._cancelled)
+            # 线程池按提交顺序执行，排在前面的下载总会先占到工作线程，不会出现互相等待
+            self._executor.submit(download.run, fetch, chunk_size)
+            self.downloads.append((index, video_url, download))
+
+    def close(self):
+        self._cancelled.set()
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+class _StreamSink:
+    """ZipFile 的只写输出端：不可 seek，ZipFile 会自动改用数据描述符写法。"""
+
+    def __init__(self):
+        self._chunks = []
+
+    def write(self, data) -> int:
+        if data:
+            self._chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+def _spool(download):
+    """把一个视频完整读入临时文件（小文件留在内存）；下载中途失败时抛出异常，调用方不写入该条目。"""
+    body = tempfile.SpooledTemporaryFile(max_size=PACKAGE_SPOOL_MEMORY)
+    try:
+        for chunk in download.chunks():
+            body.write(chunk)
+    except BaseException:
+        body.close()
+        raise
+    body.seek(0)
+    return body
+
+
+def _urls_hash(video_urls: list) -> str:
+    data = "\n".join(str(video_url) for video_url in video_urls).encode("utf-8", "surrogatepass")
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+
+def _entry_info(filename: str, content_length: str | None) -> zipfile.ZipInfo:
+    info = zipfile.ZipInfo(filename, date_time=time.localtime()[:6])
+    # 视频本身已压缩，直接存储，避免无意义的 DEFLATE 开销
+    info.compress_type = zipfile.ZIP_STORED
+    if content_length and content_length.isdigit():
+        # 仅作为大小提示，决定是否启用 ZIP64；关闭条目时会被真实大小覆盖
+        info.file_size = int(content_length)
+    return info
+
+
+def iter_zip_stream(video_urls: list, fetch, include_report: bool = False, report: PackageReport | None = None,
+                    workers: int = PACKAGE_WORKERS, chunk_size: int = CHUNK_SIZE, spool: bool = False):
+    """边下载边写 ZIP，按块产出字节；内存占用只与并发数和块大小有关。
+
+    fetch(url) 需返回以 stream=True 发起的 requests 响应。若没有任何视频下载成功，则不产出任何字节。
+    spool=True 时每个视频先完整下载再写入，中途失败的视频不进入压缩包；否则条目已开始写出无法撤回，
+    中途失败的视频以截断内容留在压缩包中，并在报告的 truncated_entry 中注明。
+    """
+    report = report or PackageReport(len(video_urls))
+    sink = _StreamSink()
+    started = False
+    fetcher = _ConcurrentFetcher(video_urls, fetch, workers, chunk_size)
+
+    try:
+        with (
+            profile_section(
+                "package",
+                str(video_urls[0]) if video_urls else "",
+                lambda: _urls_hash(video_urls),
+                note="采样包含调用方消费每个数据块的耗时；流式打包时即向客户端写出响应的网络耗时",
+            ),
+            zipfile.ZipFile(sink, "w", zipfile.ZIP_STORED) as zip_file,
+        ):
+            for index, video_url, download in fetcher.downloads:
+                if download is None:
+                    report.record_failure(index, str(video_url), "无效链接")
+                    continue
+                try:
+                    headers = download.headers()
+                except (requests.RequestException, RuntimeError) as error:
+                    report.record_failure(index, video_url, str(error))
+                    continue
+
+                info = _entry_info(filename_from_url(video_url, index), headers.get("Content-Length"))
+                if spool:
+                    try:
+                        body = _spool(download)
+                    except (requests.RequestException, RuntimeError) as error:
+                        report.record_failure(index, video_url, str(error))
+                        continue
+                    with body, zip_file.open(info, "w") as entry:
+                        started = True
+                        shutil.copyfileobj(body, entry, chunk_size)
+                    report.record_success()
+                    data = sink.drain()
+                    if data:
+                        yield data
+                    continue
+
+                try:
+                    with zip_file.open(info, "w") as entry:
+                        started = True
+                        for chunk in download.chunks():
+                            entry.write(chunk)
+                            data = sink.drain()
+                            if data:
+                                yield data
+                    report.record_success()
+                except (requests.RequestException, RuntimeError) as error:
+                    # 条目已开始写出无法撤回，只能以截断内容收尾并在报告中注明
+                    report.record_failure(index, video_url, str(error), truncated_entry=info.filename)
+
+            if started and include_report:
+                zip_file.writestr(PACKAGE_REPORT_NAME, json.dumps(report.to_dict(), ensure_ascii=False, indent=2))
+    finally:
+        fetcher.close()
+        PACKAGES.inc(result="success" if report.success_count else "failed")
+
+    data = sink.drain()
+    if started and data:
+        yield data
+
+
+def build_zip_bytes(video_urls: list, fetch, report: PackageReport | None = None,
+                    workers: int = PACKAGE_WORKERS) -> bytes:
+    return b"".join(iter_zip_stream(video_urls, fetch, report=report, workers=workers, spool=True))
@@ -0,0 +1,213 @@
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+from src.config import PAGE_CACHE_DIR, PAGE_CACHE_MAX_ENTRIES, PAGE_CACHE_TTL
+
+
+# 缓存内容已解码，这些头不再适用于缓存副本
+_DROPPED_HEADERS = ("Content-Encoding", "Transfer-Encoding", "Set-Cookie", "Connection", "Keep-Alive")
+
+
+class CachedPage:
+    def __init__(self, final_url: str, status_code: int, headers: dict, content: bytes, encoding: str | None,
+                 stored_at: float):
+        self.final_url = final_url
+        self.status_code = status_code
+        self.headers = headers
+        self.content = content
+        self.encoding = encoding
+        self.stored_at = stored_at
+
+    @classmethod
+    def from_response(cls, response) -> "CachedPage":
+        headers = {key: value for key, value in response.headers.items() if key not in _DROPPED_HEADERS}
+        return cls(response.url, response.status_code, headers, response.content, response.encoding, time.time())
+
+    def validators(self) -> dict:
+        headers = {}
+        if self.headers.get("ETag"):
+            headers["If-None-Match"] = self.headers["ETag"]
+        if self.headers.get("Last-Modified"):
+            headers["If-Modified-Since"] = self.headers["Last-Modified"]
+        return headers
+
+    def revalidated(self, response):
+        # 304 可能带回新的 ETag / 过期信息，其余沿用缓存副本
+        for key in ("ETag", "Last-Modified", "Cache-Control", "Expires", "Date"):
+            if response.headers.get(key):
+                self.headers[key] = response.headers[key]
+        self.stored_at = time.time()
+
+    def to_response(self, cache_status: str) -> requests.Response:
+        response = requests.Response()
+        response.status_code = self.status_code
+        response.reason = "OK"
+        response.url = self.final_url
+        response.headers = CaseInsensitiveDict(self.headers)
+        response.encoding = self.encoding
+        response._content = self.content
+        response.cache_status = cache_status
+        return response
+
+    def to_bytes(self) -> bytes:
+        meta = {
+            "final_url": self.final_url,
+            "status_code": self.status_code,
+            "headers": self.headers,
+            "encoding": self.encoding,
+            "stored_at": self.stored_at,
+        }
+        return json.dumps(meta, ensure_ascii=False).encode("utf-8") + b"\n" + self.content
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "CachedPage":
+        meta, _, content = data.partition(b"\n")
+        meta = json.loads(meta.decode("utf-8"))
+        return cls(meta["final_url"], meta["status_code"], meta["headers"], content, meta["encoding"], meta["stored_at"])
+
+
+class PageCache:
+    """商品页 HTML 缓存：内存 LRU + 可选 /tmp 磁盘副本，过期后用 ETag / Last-Modified 条件请求复用。
+
+    同一份页面同时以请求 URL 与重定向后的最终 URL 为键保存。
+    """
+
+    def __init__(self, max_entries: int = PAGE_CACHE_MAX_ENTRIES, ttl: float = PAGE_CACHE_TTL,
+                 disk_dir: Path | None = PAGE_CACHE_DIR):
+        self.max_entries = max(1, max_entries)
+        self.ttl = ttl
+        self.disk_dir = self._prepare_disk_dir(disk_dir)
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.revalidated = 0
+
+    @staticmethod
+    def _prepare_disk_dir(disk_dir):
+        if not disk_dir:
+            return None
+        try:
+            Path(disk_dir).mkdir(parents=True, exist_ok=True)
+            return Path(disk_dir)
+        except OSError:
+            return None
+
+    def _disk_path(self, key: str) -> Path:
+        return self.disk_dir / (hashlib.blake2b(key.encode("utf-8"), digest_size=16).hexdigest() + ".page")
+
+    def _load_from_disk(self, key: str):
+        if not self.disk_dir:
+            return None
+        try:
+            return CachedPage.from_bytes(self._disk_path(key).read_bytes())
+        except (OSError, ValueError, KeyError):
+            return None
+
+    def _save_to_disk(self, keys: list, entry: CachedPage):
+        if not self.disk_dir:
+            return
+        data = entry.to_bytes()
+        try:
+            for key in keys:
+                path = self._disk_path(key)
+                temp_path = path.with_suffix(f".{threading.get_ident()}.tmp")
+                temp_path.write_bytes(data)
+                os.replace(temp_path, path)
+            self._prune_disk()
+        except OSError:
+            pass
+
+    def _prune_disk(self):
+        files = sorted(self.disk_dir.glob("*.page"), key=lambda path: path.stat().st_mtime)
+        for path in files[: max(0, len(files) - self.max_entries)]:
+            path.unlink(missing_ok=True)
+
+    def _lookup(self, url: str):
+        with self._lock:
+            entry = self._entries.get(url)
+            if entry is not None:
+                self._entries.move_to_end(url)
+                return entry
+        entry = self._load_from_disk(url)
+        if entry is not None:
+            self._remember([url], entry)
+        return entry
+
+    def _remember(self, keys: list, entry: CachedPage):
+        with self._lock:
+            for key in keys:
+                self._entries[key] = entry
+                self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def store(self, url: str, response):
+        entry = CachedPage.from_response(response)
+        keys = list(dict.fromkeys([url, entry.final_url or url]))
+        self._remember(keys, entry)
+        self._save_to_disk(keys, entry)
+
+    def fetch(self, url: str, get, store_if=None, **kwargs) -> requests.Response:
+        """get 为实际发请求的函数（需接受 headers 参数）。返回的响应带 cache_status 属性。
+
+        store_if(response) 返回 False 时不写入缓存（如反爬校验页）。
+        """
+        entry = self._lookup(url)
+        if entry is not None and time.time() - entry.stored_at < self.ttl:
+            with self._lock:
+                self.hits += 1
+            return entry.to_response("hit")
+
+        headers = dict(kwargs.pop("headers", None) or {})
+        if entry is not None:
+            headers.update(entry.validators())
+        response = get(url, headers=headers, **kwargs)
+
+        if entry is not None and response.status_code == 304:
+            response.close()
+            entry.revalidated(response)
+            keys = list(dict.fromkeys([url, entry.final_url or url]))
+            self._remember(keys, entry)
+            self._save_to_disk(keys, entry)
+            with self._lock:
+                self.revalidated += 1
+            return entry.to_response("revalidated")
+
+        with self._lock:
+            self.misses += 1
+        response.cache_status = "miss"
+        if response.status_code == 200 and (store_if is None or store_if(response)):
+            self.store(url, response)
+        return response
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "revalidated": self.revalidated,
+                "entries": len(self._entries),
+            }
+
+    def describe(self, cache_status: str) -> dict:
+        """给接口 debug 字段用：本次请求的缓存结果 + 进程内累计计数。"""
+        return {"status": cache_status, **self.stats()}
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+        if self.disk_dir:
+            for path in self.disk_dir.glob("*.page"):
+                path.unlink(missing_ok=True)
+
+
+PAGE_CACHE = PageCache()
@@ -0,0 +1,101 @@
+import hashlib
+import re
+from functools import lru_cache
+
+from bs4 import BeautifulSoup, NavigableString, SoupStrainer
+from bs4.builder import builder_registry
+
+from src.config import HTML_PARSER, HTML_TARGETED_PARSE
+from src.timing import stage
+
+# 按速度从快到慢排列；lxml 为可选依赖（C 实现），未安装时退回标准库 html.parser
+PARSER_BACKENDS = ("lxml", "html.parser")
+
+
+def available_parser_backends() -> list[str]:
+    return [name for name in PARSER_BACKENDS if builder_registry.lookup(name) is not None]
+
+
+@lru_cache(maxsize=None)
+def resolve_parser_backend(name: str = HTML_PARSER) -> str:
+    """把 "auto" 解析为已安装的最快后端；指定了未安装的后端时报错。"""
+    if name in (None, "", "auto"):
+        return available_parser_backends()[0]
+    if builder_registry.lookup(name) is None:
+        raise ValueError(f"HTML 解析后端不可用: {name}")
+    return name
+
+
+# 视频/资源提取与标题只用到这些标签及 JSON / 内联脚本；命中标签的整棵子树会保留（如 <video> 内的 <source>）
+TARGET_TAGS = frozenset({"video", "source", "audio", "img", "a", "title"})
+
+
+def _is_target_tag(name, attrs=None) -> bool:
+    if name in TARGET_TAGS:
+        return True
+    if name != "script":
+        return False
+    attrs = attrs or {}
+    return "src" not in attrs or str(attrs.get("type", "")).lower() == "application/json"
+
+
+TARGET_STRAINER = SoupStrainer(_is_target_tag)
+
+_TITLE_END = re.compile(r"</title", re.IGNORECASE)
+_MARKUP_START = re.compile(r"<[a-zA-Z/!]")
+
+
+class PageDocument:
+    """一次抓取对应一个页面文档，DOM 只在首次访问时解析一次，供标题/视频/资源提取共享。"""
+
+    def __init__(self, html: str, page_url: str = "", parser: str = HTML_PARSER, targeted: bool = HTML_TARGETED_PARSE):
+        self.html = html or ""
+        self.page_url = page_url
+        self.parser = resolve_parser_backend(parser)
+        # targeted=True 时只为 TARGET_TAGS 建树，跳过页面里大量的 div/span 与文本节点。
+        # html.parser 的未闭合标签由 bs4 自己补全，被过滤掉的标签不再参与补全（如 <div><video></div> 之后的
+        # <source> 会被挂到 video 下），树结构随之改变，因此只对 lxml（libxml2 先补全再交给 bs4）启用
+        self.targeted = targeted and self.parser != "html.parser"
+        self.parse_count = 0
+        self._soup = None
+        self._content_hash = None
+
+    @property
+    def content_hash(self) -> str:
+        """HTML 内容的 blake2b 摘要，用作提取结果缓存的键。"""
+        if self._content_hash is None:
+            data = self.html.encode("utf-8", "surrogatepass")
+            self._content_hash = hashlib.blake2b(data, digest_size=16).hexdigest()
+        return self._content_hash
+
+    @property
+    def soup(self) -> BeautifulSoup:
+        if self._soup is None:
+            with stage("parse"):
+                self._soup = BeautifulSoup(
+                    self.html, self.parser, parse_only=TARGET_STRAINER if self.targeted else None
+                )
+            self.parse_count += 1
+        return self._soup
+
+    @property
+    def title(self) -> str:
+        title_node = self.soup.title
+        if title_node is None:
+            return ""
+        if _TITLE_END.search(self.html):
+            return title_node.get_text(strip=True)
+        # 未闭合的 <title>：lxml 把其后全文当作标题文本，html.parser 把后续标签挂到 title 下；
+        # 两者都只取到第一个标签之前，保证各后端结果一致
+        text = ""
+        for child in title_node.children:
+            if not isinstance(child, NavigableString):
+                break
+            text += child
+        return _MARKUP_START.split(text, 1)[0].strip()
+
+
+def as_document(html_or_document, page_url: str = "") -> PageDocument:
+    if isinstance(html_or_document, PageDocument):
+        return html_or_document
+    return PageDocument(html_or_document, page_url)
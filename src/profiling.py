@@ -0,0 +1,187 @@
+import json
+import re
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+from contextvars import ContextVar
+from pathlib import Path
+from urllib.parse import urlparse
+
+from src.config import PROFILE_DIR, PROFILE_ENABLED, PROFILE_TOP_N
+
+_CURRENT = ContextVar("profile_session", default=None)
+_DISABLED = nullcontext()
+# tracemalloc 是进程级状态：第一个开始的阶段开启、最后一个结束的阶段关闭。_LOCK 只在开始/结束采样时持有，
+# 不跨越被采样的代码（流式打包时会跨越整个响应）
+_LOCK = threading.Lock()
+_RUNNING = []
+_TRACING = {"owned": False}
+
+
+def _slug(page_url: str) -> str:
+    parsed = urlparse(page_url or "")
+    return re.sub(r"[^\w.-]+", "_", f"{parsed.netloc}{parsed.path}").strip("_")[:80] or "page"
+
+
+def _short_path(filename: str) -> str:
+    return "/".join(Path(filename).parts[-2:]) if filename != "~" else ""
+
+
+def _hotspots(profiler, top_n: int) -> list:
+    """按函数自身耗时排序，比累计耗时更容易直接看出慢在哪一处。"""
+    import pstats
+
+    stats = pstats.Stats(profiler).stats
+    rows = sorted(stats.items(), key=lambda item: item[1][2], reverse=True)[:top_n]
+    return [
+        {
+            "function": f"{_short_path(filename)}:{line}({name})" if filename != "~" else name,
+            "calls": calls,
+            "self_ms": round(self_time * 1000, 2),
+            "cum_ms": round(cumulative * 1000, 2),
+        }
+        for (filename, line, name), (_, calls, self_time, cumulative, _) in rows
+    ]
+
+
+def _begin_sampling() -> dict:
+    import tracemalloc
+
+    with _LOCK:
+        if not _RUNNING:
+            # 其他工具已开启 tracemalloc 时不动它的状态
+            _TRACING["owned"] = not tracemalloc.is_tracing()
+            if _TRACING["owned"]:
+                tracemalloc.start()
+        # 只有独占 tracemalloc 的阶段给出的峰值才属于它自己
+        token = {"exclusive": _TRACING["owned"] and not _RUNNING}
+        for other in _RUNNING:
+            other["exclusive"] = False
+        _RUNNING.append(token)
+    return token
+
+
+def _end_sampling(token: dict):
+    import tracemalloc
+
+    with _LOCK:
+        snapshot = tracemalloc.take_snapshot()
+        peak = tracemalloc.get_traced_memory()[1] if token["exclusive"] else None
+        _RUNNING.remove(token)
+        if not _RUNNING and _TRACING["owned"]:
+            tracemalloc.stop()
+    return snapshot, peak
+
+
+def _allocations(snapshot, top_n: int) -> list:
+    import cProfile
+    import tracemalloc
+
+    ignored = (
+        tracemalloc.Filter(False, tracemalloc.__file__),
+        tracemalloc.Filter(False, cProfile.__file__),
+        tracemalloc.Filter(False, __file__),
+    )
+    return [
+        {
+            "where": f"{_short_path(stat.traceback[0].filename)}:{stat.traceback[0].lineno}",
+            "size_kb": round(stat.size / 1024, 1),
+            "count": stat.count,
+        }
+        for stat in snapshot.filter_traces(ignored).statistics("lineno")[:top_n]
+    ]
+
+
+class ProfileSession:
+    """一次请求内的性能采样；每个被采样的阶段写一组文件（.prof / .tracemalloc / .json）并生成热点摘要。
+
+    只采样调用线程：打包时后台下载线程的耗时不计入 cProfile，但其内存分配会被 tracemalloc 统计。
+    多个请求可以同时采样；与其他采样重叠时峰值内存为 None，内存分配统计也包含其他请求的分配。
+    """
+
+    def __init__(self, output_dir=PROFILE_DIR, top_n: int = PROFILE_TOP_N):
+        self.output_dir = Path(output_dir)
+        self.top_n = top_n
+        self.sections = []
+        # 正在采样的线程；批量抓取时多个工作线程共用同一个会话
+        self._active_threads = set()
+
+    @contextmanager
+    def section(self, name: str, page_url: str, content_hash, note: str = ""):
+        """content_hash 为返回摘要字符串的函数，只在真正采样时才计算；note 会原样写入摘要。"""
+        thread_id = threading.get_ident()
+        if thread_id in self._active_threads:
+            # 嵌套阶段已被外层采样覆盖
+            yield
+            return
+        # cProfile / pstats / tracemalloc 只在真正采样时导入，不计入 serverless 冷启动
+        import cProfile
+
+        self._active_threads.add(thread_id)
+        token = _begin_sampling()
+        profiler = cProfile.Profile()
+        started = time.perf_counter()
+        try:
+            try:
+                profiler.enable()
+            except ValueError:
+                # Python 3.12 起 cProfile 基于进程级的 sys.monitoring，同一时刻只能有一个采样器
+                self.sections.append({"name": name, "url": page_url, "skipped": "另一个采样正在进行"})
+                yield
+                return
+            try:
+                yield
+            finally:
+                profiler.disable()
+            elapsed_ms = (time.perf_counter() - started) * 1000
+        finally:
+            snapshot, peak = _end_sampling(token)
+            self._active_threads.discard(thread_id)
+        self.sections.append(self._record(name, page_url, content_hash(), profiler, snapshot, peak, elapsed_ms, note))
+
+    def _record(self, name, page_url, content_hash, profiler, snapshot, peak, elapsed_ms, note) -> dict:
+        entry = {
+            "name": name,
+            "url": page_url,
+            "content_hash": content_hash,
+            "ms": round(elapsed_ms, 2),
+            "peak_kb": round(peak / 1024, 1) if peak is not None else None,
+            "hotspots": _hotspots(profiler, self.top_n),
+            "allocations": _allocations(snapshot, self.top_n),
+        }
+        if note:
+            entry["note"] = note
+        stem = self.output_dir / f"{name}-{_slug(page_url)}-{content_hash[:12]}"
+        try:
+            self.output_dir.mkdir(parents=True, exist_ok=True)
+            profiler.dump_stats(f"{stem}.prof")
+            snapshot.dump(f"{stem}.tracemalloc")
+            Path(f"{stem}.json").write_text(json.dumps(entry, ensure_ascii=False, indent=2), encoding="utf-8")
+            entry["files"] = [f"{stem}.{suffix}" for suffix in ("prof", "tracemalloc", "json")]
+        except OSError as error:
+            entry["error"] = f"写入采样文件失败: {error}"
+        return entry
+
+
+def start_profiling(enabled=None) -> ProfileSession | None:
+    """在请求入口调用；enabled 为 None 时取 PROFILE_ENABLED（环境变量 ALIBABA_SCRAPER_PROFILE）。"""
+    session = ProfileSession() if (PROFILE_ENABLED if enabled is None else enabled) else None
+    _CURRENT.set(session)
+    return session
+
+
+def finish_profiling() -> ProfileSession | None:
+    session = _CURRENT.get()
+    _CURRENT.set(None)
+    return session
+
+
+def profile_section(name: str, page_url: str, content_hash, note: str = ""):
+    """with profile_section("extract_videos", url, lambda: document.content_hash): ...；未开启采样时为空上下文。"""
+    session = _CURRENT.get()
+    return _DISABLED if session is None else session.section(name, page_url, content_hash, note)
+
+
+def profiling_debug() -> dict:
+    session = _CURRENT.get()
+    return {} if session is None else {"profile": session.sections}
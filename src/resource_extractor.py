@@ -1,7 +1,9 @@
 import re
 from urllib.parse import urljoin, urlparse
 
-from bs4 import BeautifulSoup
+from src.page_document import as_document
+from src.profiling import profile_section
+from src.timing import stage
 
 
 VIDEO_EXT = (".mp4", ".webm", ".ogg", ".mov", ".m3u8")
@@ -49,58 +51,70 @@ def _append(result_list: list, seen: set, url: str):
         result_list.append({"url": url, "name": name})
 
 
-def extract_resources_from_html(html: str, page_url: str) -> dict:
-    soup = BeautifulSoup(html, "html.parser")
+def extract_resources_from_html(html, page_url: str, cache=None) -> dict:
+    """cache 传入 ExtractionCache 时，内容相同的页面直接复用上次结果。"""
+    document = as_document(html, page_url)
+    with profile_section("extract_resources", page_url, lambda: document.content_hash):
+        if cache is None:
+            return _extract_resources(document, page_url)
+        return cache.get_or_compute("resources", document, page_url, lambda: _extract_resources(document, page_url))
+
+
+def _extract_resources(document, page_url: str) -> dict:
+    html = document.html
+    soup = document.soup
 
     videos, images, audios, files, folders = [], [], [], [], []
     seen_v, seen_i, seen_a, seen_f, seen_d = set(), set(), set(), set(), set()
 
-    for video in soup.find_all("video"):
-        for src in [video.get("src")] + [s.get("src") for s in video.find_all("source")]:
-            url = _norm(src, page_url)
-            if url:
+    with stage("resource_tags"):
+        for video in soup.find_all("video"):
+            for src in [video.get("src")] + [s.get("src") for s in video.find_all("source")]:
+                url = _norm(src, page_url)
+                if url:
+                    _append(videos, seen_v, url)
+
+        for audio in soup.find_all("audio"):
+            for src in [audio.get("src")] + [s.get("src") for s in audio.find_all("source")]:
+                url = _norm(src, page_url)
+                if url:
+                    _append(audios, seen_a, url)
+
+        for img in soup.find_all("img"):
+            for src in [img.get("src"), img.get("data-src"), img.get("data-original")]:
+                url = _norm(src, page_url)
+                if url:
+                    _append(images, seen_i, url)
+
+        for link in soup.find_all("a"):
+            href = _norm(link.get("href"), page_url)
+            if not href:
+                continue
+            parsed = urlparse(href)
+            if href.endswith("/") and parsed.netloc == urlparse(page_url).netloc:
+                _append(folders, seen_d, href)
+                continue
+            if _is_file_type(href, FILE_EXT):
+                _append(files, seen_f, href)
+            elif _is_file_type(href, VIDEO_EXT):
+                _append(videos, seen_v, href)
+            elif _is_file_type(href, IMAGE_EXT):
+                _append(images, seen_i, href)
+            elif _is_file_type(href, AUDIO_EXT):
+                _append(audios, seen_a, href)
+
+    with stage("resource_regex"):
+        pattern = r'https?://[^\s"\'<>]+'
+        for raw in re.findall(pattern, html):
+            url = _norm(raw, page_url)
+            if _is_file_type(url, VIDEO_EXT):
                 _append(videos, seen_v, url)
-
-    for audio in soup.find_all("audio"):
-        for src in [audio.get("src")] + [s.get("src") for s in audio.find_all("source")]:
-            url = _norm(src, page_url)
-            if url:
-                _append(audios, seen_a, url)
-
-    for img in soup.find_all("img"):
-        for src in [img.get("src"), img.get("data-src"), img.get("data-original")]:
-            url = _norm(src, page_url)
-            if url:
+            elif _is_file_type(url, IMAGE_EXT):
                 _append(images, seen_i, url)
-
-    for link in soup.find_all("a"):
-        href = _norm(link.get("href"), page_url)
-        if not href:
-            continue
-        parsed = urlparse(href)
-        if href.endswith("/") and parsed.netloc == urlparse(page_url).netloc:
-            _append(folders, seen_d, href)
-            continue
-        if _is_file_type(href, FILE_EXT):
-            _append(files, seen_f, href)
-        elif _is_file_type(href, VIDEO_EXT):
-            _append(videos, seen_v, href)
-        elif _is_file_type(href, IMAGE_EXT):
-            _append(images, seen_i, href)
-        elif _is_file_type(href, AUDIO_EXT):
-            _append(audios, seen_a, href)
-
-    pattern = r'https?://[^\s"\'<>]+'
-    for raw in re.findall(pattern, html):
-        url = _norm(raw, page_url)
-        if _is_file_type(url, VIDEO_EXT):
-            _append(videos, seen_v, url)
-        elif _is_file_type(url, IMAGE_EXT):
-            _append(images, seen_i, url)
-        elif _is_file_type(url, AUDIO_EXT):
-            _append(audios, seen_a, url)
-        elif _is_file_type(url, FILE_EXT):
-            _append(files, seen_f, url)
+            elif _is_file_type(url, AUDIO_EXT):
+                _append(audios, seen_a, url)
+            elif _is_file_type(url, FILE_EXT):
+                _append(files, seen_f, url)
 
     return {
         "videos": videos,
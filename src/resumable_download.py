@@ -0,0 +1,141 @@
+import json
+import os
+import re
+from pathlib import Path
+
+import requests
+
+
+_CONTENT_RANGE_RE = re.compile(r"bytes\s+(\d+)-(\d+)/(\d+|\*)")
+
+
+class IncompleteDownloadError(requests.RequestException):
+    pass
+
+
+def parse_content_range(value: str | None):
+    match = _CONTENT_RANGE_RE.match(value or "")
+    if not match:
+        return None
+    start, end, total = match.groups()
+    return int(start), int(end), (int(total) if total != "*" else None)
+
+
+def split_ranges(total_size: int, count: int) -> list[list[int]]:
+    size = max(1, -(-total_size // max(1, count)))
+    return [[start, min(start + size, total_size) - 1, 0] for start in range(0, total_size, size)]
+
+
+class PartialDownload:
+    """目标文件旁的 .part 数据文件与 .part.json 校验信息（URL / ETag / 总长度）。"""
+
+    def __init__(self, filepath: Path, video_url: str):
+        self.filepath = Path(filepath)
+        self.video_url = video_url
+        self.part_path = self.filepath.with_name(self.filepath.name + ".part")
+        self.meta_path = self.filepath.with_name(self.filepath.name + ".part.json")
+        self.etag = ""
+        self.total_size = None
+        # 分段下载时为 [[start, end, done], ...]；单连接下载时为 None
+        self.segments = None
+
+    def load(self) -> bool:
+        """读取上次留下的分片信息；URL 不一致或信息损坏时丢弃。"""
+        if not self.part_path.exists():
+            self.clear()
+            return False
+        try:
+            meta = json.loads(self.meta_path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            meta = {}
+        if meta.get("url") != self.video_url:
+            self.clear()
+            return False
+        self.etag = meta.get("etag") or ""
+        self.total_size = meta.get("total_size")
+        self.segments = meta.get("segments")
+        return True
+
+    def resume_offset(self) -> int:
+        if not self.load():
+            return 0
+        if self.segments:
+            # 分段下载留下的是预分配文件，已写入部分并非连续前缀，单连接无法续传
+            self.clear()
+            return 0
+        return self.part_path.stat().st_size
+
+    def prepare_segments(self, total_size: int, etag: str, count: int):
+        """沿用仍然有效的分段进度，否则重新切分并预分配文件。"""
+        resumable = (
+            self.segments
+            and self.total_size == total_size
+            and (not etag or not self.etag or etag == self.etag)
+            and self.part_path.exists()
+            and self.part_path.stat().st_size == total_size
+        )
+        if resumable:
+            return
+        self.clear()
+        self.total_size = total_size
+        self.etag = etag
+        self.segments = split_ranges(total_size, count)
+        with open(self.part_path, "wb") as file_handler:
+            file_handler.truncate(total_size)
+        self.save_meta()
+
+    def missing_bytes(self) -> int:
+        if not self.segments:
+            return 0
+        return sum(end + 1 - start - done for start, end, done in self.segments)
+
+    def range_headers(self, offset: int) -> dict:
+        if offset <= 0:
+            return {}
+        headers = {"Range": f"bytes={offset}-"}
+        # If-Range 只接受强 ETag；弱 ETag 时仍靠响应里的 ETag 比对来兜底
+        if self.etag and not self.etag.startswith("W/"):
+            headers["If-Range"] = self.etag
+        return headers
+
+    def accepts_partial(self, response, offset: int) -> bool:
+        """校验 206 响应确实是从 offset 续传的同一个文件。"""
+        content_range = parse_content_range(response.headers.get("Content-Range"))
+        if not content_range or content_range[0] != offset:
+            return False
+        total = content_range[2]
+        if self.total_size is not None and total is not None and total != self.total_size:
+            return False
+        etag = response.headers.get("ETag", "")
+        if self.etag and etag and etag != self.etag:
+            return False
+        if total is not None:
+            self.total_size = total
+        return True
+
+    def start_fresh(self, response):
+        self.segments = None
+        self.etag = response.headers.get("ETag", "")
+        content_length = response.headers.get("Content-Length", "")
+        self.total_size = int(content_length) if content_length.isdigit() else None
+        self.save_meta()
+
+    def save_meta(self):
+        payload = {"url": self.video_url, "etag": self.etag, "total_size": self.total_size}
+        if self.segments:
+            payload["segments"] = self.segments
+        self.meta_path.write_text(json.dumps(payload, ensure_ascii=False), encoding="utf-8")
+
+    def finalize(self):
+        missing = self.missing_bytes()
+        if missing:
+            raise IncompleteDownloadError(f"分段下载不完整: 缺少 {missing} bytes")
+        size = self.part_path.stat().st_size
+        if self.total_size is not None and size != self.total_size:
+            raise IncompleteDownloadError(f"下载不完整: {size}/{self.total_size} bytes")
+        os.replace(self.part_path, self.filepath)
+        self.meta_path.unlink(missing_ok=True)
+
+    def clear(self):
+        self.part_path.unlink(missing_ok=True)
+        self.meta_path.unlink(missing_ok=True)
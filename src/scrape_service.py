@@ -0,0 +1,244 @@
+import contextvars
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+import requests
+
+from src.config import SCRAPE_BATCH_MAX_WORKERS, SCRAPE_BATCH_WORKERS
+from src.extraction_cache import EXTRACTION_CACHE
+from src.http_session import get_shared_session
+from src.metrics import VIDEOS_PER_PAGE
+from src.page_cache import PAGE_CACHE
+from src.page_document import PageDocument
+from src.profiling import profiling_debug
+from src.resource_extractor import extract_resources_from_html
+from src.scraper import AlibabaVideoScraper
+from src.session_store import SESSION_STORE
+from src.timing import current_timer, finish_timing, stage, start_timing, timing_debug
+
+
+def _elapsed_ms(started: float) -> float:
+    return round((time.perf_counter() - started) * 1000, 1)
+
+
+def _video_urls(resources: dict) -> list:
+    return [item["url"] for item in resources.get("videos", []) if isinstance(item, dict)]
+
+
+def _page_title(document, extraction_cache) -> str:
+    try:
+        if extraction_cache is None:
+            return document.title
+        return extraction_cache.get_or_compute("title", document, document.page_url, lambda: document.title)
+    except (TypeError, ValueError, AttributeError):
+        return ""
+
+
+def scrape_page(page_url: str, environment: str, refetch=None, use_cache: bool = True,
+                verbose: bool = True) -> tuple[int, dict]:
+    """/api/scrape 的完整流程，返回 (HTTP 状态码, 响应体)，供 Vercel 与本地 Flask 共用。
+
+    refetch(url, timeout=...) 用于首个响应是校验页时换一组请求头再取一次；为 None 时不重取。
+    """
+    try:
+        return _scrape_page(page_url, environment, refetch, use_cache, verbose)
+    except (requests.RequestException, ValueError, TypeError, RuntimeError, OSError) as error:
+        return 500, {"status": "error", "error": f"爬取失败: {str(error)}"}
+
+
+def _scrape_page(page_url, environment, refetch, use_cache, verbose):
+    extraction_cache = EXTRACTION_CACHE if use_cache else None
+    scraper = AlibabaVideoScraper(
+        page_cache=PAGE_CACHE if use_cache else None,
+        extraction_cache=extraction_cache,
+        session=get_shared_session(),
+        session_store=SESSION_STORE,
+        verbose=verbose,
+    )
+    # 记录每次取页决策及耗时，便于确认兜底路径没有重复请求上游
+    fetch_log = []
+    started = time.perf_counter()
+    html = scraper.fetch_page(page_url)
+    if not html:
+        return 400, {"status": "error", "error": "页面获取失败，请检查链接是否可访问"}
+
+    final_url = scraper.last_final_url or page_url
+    fetch_log.append(
+        {
+            "step": "fetch_page",
+            "decision": "fetch",
+            "cache": scraper.last_cache_status,
+            "final_url": final_url,
+            "ms": _elapsed_ms(started),
+        }
+    )
+
+    # 以重定向后的最终 URL 作为相对链接基准，无需为此再请求一次
+    document = PageDocument(html, final_url)
+    parse_count = 0
+    scraper.extract_videos_from_html(document)
+    page_title = _page_title(document, extraction_cache)
+
+    videos = scraper.video_urls.to_list()
+
+    if not videos:
+        started = time.perf_counter()
+        videos = _video_urls(extract_resources_from_html(document, final_url, cache=extraction_cache))
+        fetch_log.append(
+            {
+                "step": "resource_fallback",
+                "decision": "reuse",
+                "reason": "复用已获取的页面做全资源提取",
+                "ms": _elapsed_ms(started),
+            }
+        )
+
+    if not videos and refetch is not None and scraper.detect_anti_bot_page(html):
+        # 仅当首个响应是校验页时，才换一组请求头再取一次（与抓取共用连接池会话及其 Cookie）
+        started = time.perf_counter()
+        refetch_entry = {"step": "refetch", "decision": "fetch", "reason": "anti_bot"}
+        try:
+            with stage("refetch"):
+                fallback_response = refetch(page_url, timeout=25)
+                fallback_response.raise_for_status()
+            fallback_document = PageDocument(fallback_response.text, fallback_response.url or page_url)
+            refetch_entry["status_code"] = fallback_response.status_code
+            refetch_entry["final_url"] = fallback_document.page_url
+            if scraper.check_fetched_page(fallback_document.html):
+                refetch_entry["result"] = "anti_bot"
+            else:
+                html = fallback_document.html
+                page_title = _page_title(fallback_document, extraction_cache)
+                videos = _video_urls(
+                    extract_resources_from_html(fallback_document, fallback_document.page_url, cache=extraction_cache)
+                )
+                parse_count += fallback_document.parse_count
+                refetch_entry["result"] = f"{len(videos)} videos"
+        except requests.RequestException as error:
+            refetch_entry["error"] = str(error)
+        refetch_entry["ms"] = _elapsed_ms(started)
+        fetch_log.append(refetch_entry)
+    elif not videos:
+        fetch_log.append({"step": "refetch", "decision": "skip", "reason": "首个响应不是校验页，重复请求不会得到新内容"})
+
+    parse_count += document.parse_count
+    VIDEOS_PER_PAGE.observe(len(videos))
+    debug = {
+        "environment": environment,
+        "parse_count": parse_count,
+        "parser": document.parser,
+        "cache": PAGE_CACHE.describe(scraper.last_cache_status),
+        "extraction_cache": EXTRACTION_CACHE.stats(),
+        "session_store": SESSION_STORE.stats(),
+        "fetch_log": fetch_log,
+        **timing_debug(),
+        **profiling_debug(),
+    }
+
+    if not videos and scraper.detect_anti_bot_page(html):
+        return 423, {
+            "status": "error",
+            "error": "目标站触发反爬校验页（Captcha/Punish），当前请求环境无法直接提取视频。",
+            "code": "ANTI_BOT_BLOCKED",
+            "tips": [
+                "请稍后重试，或更换网络出口",
+                "可先用全资源模式确认页面是否仅返回校验内容",
+                "若 Vercel 失败但浏览器可看视频，通常是机房 IP 被风控",
+            ],
+            "debug": {**debug, "page_title": page_title},
+        }
+
+    if not videos:
+        tips = [
+            "请确认链接是商品详情页，而不是搜索页或店铺首页",
+            "请尝试更换其他商品链接",
+            "部分商品视频可能由前端动态加密加载",
+        ]
+        if environment == "vercel-serverless":
+            tips.append("如仅 Vercel 失败，通常是目标站点对机房 IP 有风控限制")
+        return 200, {
+            "status": "success",
+            "message": "页面已解析，但未找到可下载视频",
+            "videos": [],
+            "count": 0,
+            "page_title": page_title,
+            "tips": tips,
+            "debug": {**debug, "hint": "可优先尝试全资源模式，或使用其他商品链接"},
+        }
+
+    return 200, {
+        "status": "success",
+        "message": f"找到 {len(videos)} 个视频",
+        "videos": videos,
+        "count": len(videos),
+        "page_title": page_title,
+        "debug": debug,
+    }
+
+
+def resolve_batch_workers(value=None) -> int:
+    try:
+        workers = int(value) if value is not None else SCRAPE_BATCH_WORKERS
+    except (TypeError, ValueError):
+        workers = SCRAPE_BATCH_WORKERS
+    return max(1, min(workers, SCRAPE_BATCH_MAX_WORKERS))
+
+
+def _scrape_batch_page(batch_timer, page_url: str, environment: str, refetch, use_cache: bool) -> tuple[int, dict]:
+    # 每页单独计时（debug.timing 只含本页），结束后把各阶段累加到整批的计时器
+    timer = start_timing(batch_timer is not None)
+    try:
+        return scrape_page(page_url, environment, refetch, use_cache, False)
+    finally:
+        finish_timing()
+        if timer is not None:
+            batch_timer.merge(timer)
+
+
+def iter_scrape_batch(page_urls: list, environment: str, refetch=None, use_cache: bool = True,
+                      workers: int = SCRAPE_BATCH_WORKERS):
+    """并发抓取多个商品页，按完成顺序逐个产出结果（每个结果对应 NDJSON 的一行）。
+
+    page_urls 需已规范化；空字符串表示无效输入，会直接产出错误结果。
+    请求开启计时时，最后额外产出一行 {"timing": {...}}，为所有页面各阶段耗时之和。
+    """
+    # 生成器在响应头发出后才开始执行，那时请求的计时器与采样已经收尾，因此在这里先复制请求上下文
+    context = contextvars.copy_context()
+    return _iter_scrape_batch(page_urls, environment, refetch, use_cache, workers, context)
+
+
+def _iter_scrape_batch(page_urls: list, environment: str, refetch, use_cache: bool, workers: int, context):
+    batch_timer = context.run(current_timer)
+    executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="scrape-batch")
+    futures = {}
+    invalid = []
+    try:
+        # 先提交全部有效链接再产出任何结果，消费方写得慢也不会推迟后续页面开始抓取
+        for index, page_url in enumerate(page_urls):
+            if not page_url:
+                invalid.append(index)
+                continue
+            # 同一个 Context 不能在多个线程中同时进入，每个页面各用一份副本
+            future = executor.submit(
+                context.copy().run, _scrape_batch_page, batch_timer, page_url, environment, refetch, use_cache
+            )
+            futures[future] = (index, page_url)
+
+        for index in invalid:
+            yield {"index": index, "url": page_urls[index], "http_status": 400, "status": "error", "error": "URL 不能为空"}
+
+        for future in as_completed(futures):
+            index, page_url = futures[future]
+            try:
+                status_code, payload = future.result()
+            except Exception as error:
+                # 单个页面的意外异常（如解析器内部错误）只影响该行，不中断整个流
+                status_code, payload = 500, {"status": "error", "error": f"爬取失败: {str(error)}"}
+            yield {"index": index, "url": page_url, "http_status": status_code, **payload}
+
+        if batch_timer is not None:
+            # 流式响应发出响应头时还没有任何耗时，Server-Timing 无从给出，分阶段耗时放在最后一行
+            yield {"timing": batch_timer.as_dict()}
+    finally:
+        # 客户端提前断开时不再继续抓取剩余页面
+        executor.shutdown(wait=False, cancel_futures=True)
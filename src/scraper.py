@@ -1,29 +1,62 @@
-import json
-import re
 import time
+from functools import lru_cache
 from html import unescape
+from pathlib import Path
 
 import requests
-from bs4 import BeautifulSoup
-
-from src.config import CHUNK_SIZE, DOWNLOAD_DIR, REQUEST_TIMEOUT, USER_AGENT
-
-
-class AlibabaVideoScraper:
-    def __init__(self):
-        self.video_urls = []
-        self.session = requests.Session()
-        self.session.headers.update(
-            {
-                "User-Agent": USER_AGENT,
-                "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
-                "Accept-Language": "zh-CN,zh;q=0.9,en;q=0.8",
-                "Connection": "keep-alive",
-                "Referer": "https://www.alibaba.com/",
-            }
-        )
+from requests.adapters import HTTPAdapter
+
+from src.config import (
+    CHUNK_SIZE,
+    DOWNLOAD_DIR,
+    DOWNLOAD_PER_HOST_LIMIT,
+    DOWNLOAD_RETRIES,
+    DOWNLOAD_WORKERS,
+    DOWNLOAD_SEGMENTS,
+    REQUEST_TIMEOUT,
+    SEGMENT_MIN_SIZE,
+    STREAM_CHUNK_SIZE,
+    STREAM_EARLY_EXIT_VIDEOS,
+    USER_AGENT,
+)
+from src.download_manager import DownloadManager, DownloadProgress
+from src.json_scanner import VIDEO_EXTENSIONS, is_inline_state, iter_key_strings, may_contain_video
+from src.metrics import ANTI_BOT_CHECKS
+from src.page_document import as_document
+from src.profiling import profile_section
+from src.resumable_download import IncompleteDownloadError, PartialDownload
+from src.segmented_download import download_segments, probe_ranges
+from src.stream_scanner import StreamingVideoScanner
+from src.timing import stage
+from src.url_set import OrderedUrlSet
+from src.video_matcher import find_video_candidates
+
+
+@lru_cache(maxsize=4096)
+def _clean_candidate(candidate: str) -> str:
+    return unescape(candidate).strip().replace("\\u002F", "/").replace("\\/", "/")
+
+
+# 遇到反爬校验页时先访问这些页面以获取会话 Cookie
+WARMUP_URLS = (
+    "https://www.alibaba.com/",
+    "https://www.alibaba.com/trade/search?fsb=y&IndexArea=product_en&SearchText=sunglasses",
+)
+
+
+class VideoUrlCollector:
+    """从页面文档收集视频链接的纯提取逻辑：不持有会话、不发请求，可在任意线程或进程中使用。"""
+
+    def __init__(self, verbose=False):
+        self.video_urls = OrderedUrlSet()
+        self.verbose = verbose
+
+    def _log(self, *args, **kwargs):
+        if self.verbose:
+            print(*args, **kwargs)
 
     @staticmethod
+    @lru_cache(maxsize=4096)
     def _normalize_video_url(url):
         value = (url or "").strip().replace("\\/", "/")
         if not value:
@@ -36,18 +69,95 @@ class AlibabaVideoScraper:
         normalized = self._normalize_video_url(url)
         if not normalized:
             return
-        if normalized.startswith("http") and normalized not in self.video_urls:
-            self.video_urls.append(normalized)
+        if normalized.startswith("http"):
+            self.video_urls.add(normalized)
 
     def _append_candidate(self, candidate: str):
         if not candidate:
             return
-        value = unescape(candidate).strip().replace("\\u002F", "/").replace("\\/", "/")
-        self._append_video_url(value)
+        self._append_video_url(_clean_candidate(candidate))
+
+    def collect(self, html) -> list:
+        """返回页面中的视频链接（按出现顺序去重），html 可以是字符串或 PageDocument。"""
+        return self._collect_video_urls(as_document(html))
+
+    def _collect_video_urls(self, document):
+        self.video_urls = OrderedUrlSet()
+        html = document.html
+        soup = document.soup
+
+        with stage("video_tags"):
+            videos = soup.find_all("video")
+            self._log(f"找到 {len(videos)} 个 <video> 标签")
+            for video in videos:
+                src = video.get("src")
+                if src:
+                    self._append_video_url(src)
+                for source in video.find_all("source"):
+                    source_src = source.get("src")
+                    if source_src:
+                        self._append_video_url(source_src)
+
+        self._log("\n正在从页面 JSON 与内联状态中提取视频...")
+        with stage("json_scan"):
+            for script in soup.find_all("script"):
+                text = script.string
+                if text and (script.get("type") == "application/json" or is_inline_state(text)):
+                    self._extract_from_script(text)
+
+        self._log("\n正在用正则表达式查找视频...")
+        with stage("regex"):
+            for candidate in find_video_candidates(html):
+                self._append_candidate(candidate)
+        return self.video_urls.to_list()
+
+    def _extract_from_script(self, text):
+        """只取 JSON / 内联状态中视频相关键下的字符串值，不反序列化整段脚本。"""
+        if not may_contain_video(text):
+            return
+        for value in iter_key_strings(text):
+            normalized = self._normalize_video_url(value)
+            if normalized.endswith(VIDEO_EXTENSIONS):
+                self._append_video_url(normalized)
+
+
+class AlibabaVideoScraper(VideoUrlCollector):
+    def __init__(self, download_workers=DOWNLOAD_WORKERS, per_host_limit=DOWNLOAD_PER_HOST_LIMIT,
+                 segments=DOWNLOAD_SEGMENTS, page_cache=None, extraction_cache=None, session=None,
+                 download_dir=DOWNLOAD_DIR, warmup_urls=WARMUP_URLS, session_store=None, verbose=True):
+        # verbose=False 时不输出过程日志（批量/异步场景下多页并发，逐行打印会互相穿插）
+        super().__init__(verbose=verbose)
+        self.download_dir = Path(download_dir)
+        self.warmup_urls = list(warmup_urls)
+        # 传入 PageCache 时 fetch_page 走缓存；last_cache_status 记录最近一次页面获取的缓存结果
+        self.page_cache = page_cache
+        self.last_cache_status = "bypass"
+        self.extraction_cache = extraction_cache
+        # 传入 SessionStore 时预热得到的 Cookie 跨实例共享，有效期内遇到校验页不再重复预热
+        self.session_store = session_store
+        self.last_final_url = ""
+        self.last_stream_stats = {}
+        self.download_workers = max(1, download_workers)
+        self.per_host_limit = max(1, per_host_limit)
+        self.segments = max(1, segments)
+        # 请求头逐次附带而不写入 session，便于与 API 端共享的连接池会话一起使用
+        self.headers = {
+            "User-Agent": USER_AGENT,
+            "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
+            "Accept-Language": "zh-CN,zh;q=0.9,en;q=0.8",
+            "Connection": "keep-alive",
+            "Referer": "https://www.alibaba.com/",
+        }
+        if session is None:
+            session = requests.Session()
+            # 分段下载时每个文件会占用多条连接，连接池按 线程数 x 分段数 放大
+            adapter = HTTPAdapter(pool_maxsize=max(10, self.download_workers * self.segments))
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+        self.session = session
 
     @staticmethod
     def detect_anti_bot_page(html: str) -> bool:
-        content = (html or "").lower()
         signals = [
             "punish-component",
             "sufei-punish",
@@ -57,36 +167,146 @@ class AlibabaVideoScraper:
             "lib-windvane",
             "deny",
         ]
-        return sum(1 for signal in signals if signal in content) >= 3
+        with stage("anti_bot_check"):
+            content = (html or "").lower()
+            return sum(1 for signal in signals if signal in content) >= 3
+
+    @classmethod
+    def check_fetched_page(cls, html: str) -> bool:
+        """对刚从上游取回的页面判断是否为校验页并计入指标；同一页面之后的判断用 detect_anti_bot_page，不重复计数。"""
+        blocked = cls.detect_anti_bot_page(html)
+        ANTI_BOT_CHECKS.inc(result="blocked" if blocked else "clear")
+        return blocked
+
+    @classmethod
+    def check_fetched_response(cls, response, html: str) -> bool:
+        """同 check_fetched_page，但命中页面缓存的响应不是刚从上游取回的，只判断不计数。"""
+        if getattr(response, "cache_status", None) == "hit":
+            return cls.detect_anti_bot_page(html)
+        return cls.check_fetched_page(html)
 
     def fetch_page(self, url):
-        print(f"正在获取页面: {url}")
+        self._log(f"正在获取页面: {url}")
+        session_state = self._attach_session_state()
         try:
-            response = self._safe_get(url, timeout=REQUEST_TIMEOUT)
-            response.raise_for_status()
-            response.encoding = "utf-8"
-            html = response.text
+            with stage("fetch"):
+                response = self._get_page(url)
+                response.raise_for_status()
+                response.encoding = "utf-8"
+                html = response.text
+            self.last_final_url = response.url or url
+
+            if self.check_fetched_response(response, html):
+                self._log("! 检测到反爬校验页，尝试预热会话并重试一次")
+                with stage("warm_up"):
+                    retry = self._warm_up_for_retry(session_state)
+                if retry:
+                    with stage("anti_bot_retry"):
+                        retry_response = self._get_page(url)
+                        retry_response.raise_for_status()
+                        retry_response.encoding = "utf-8"
+                        html = retry_response.text
+                    self.last_final_url = retry_response.url or url
+                    self.check_fetched_response(retry_response, html)
+
+            self._log("✓ 页面获取成功")
+            return html
+        except requests.RequestException as error:
+            self._log(f"✗ 页面获取失败: {error}")
+            return None
 
-            if self.detect_anti_bot_page(html):
-                print("! 检测到反爬校验页，尝试预热会话并重试一次")
-                self._warm_up_session()
-                retry_response = self._safe_get(url, timeout=REQUEST_TIMEOUT)
-                retry_response.raise_for_status()
-                retry_response.encoding = "utf-8"
-                html = retry_response.text
+    def stream_videos(self, url, max_videos=STREAM_EARLY_EXIT_VIDEOS):
+        """边下载页面边提取，发现新视频即产出，不必等整页读完。
 
-            print("✓ 页面获取成功")
-            return html
+        max_videos > 0 时找到足够数量的视频后立即断开连接，不再读取剩余页面。
+        读取可能中途停止，因此不经过页面缓存；统计信息记录在 last_stream_stats。
+        """
+        self.video_urls = OrderedUrlSet()
+        self._log(f"正在流式获取页面: {url}")
+        session_state = self._attach_session_state()
+        try:
+            scanner = yield from self._stream_page(url, max_videos)
+            if not self.video_urls and self.check_fetched_page(scanner.head):
+                self._log("! 检测到反爬校验页，尝试预热会话并重试一次")
+                if self._warm_up_for_retry(session_state):
+                    yield from self._stream_page(url, max_videos)
         except requests.RequestException as error:
-            print(f"✗ 页面获取失败: {error}")
+            self._log(f"✗ 页面获取失败: {error}")
+            return
+
+        stats = self.last_stream_stats
+        self._log(
+            f"✓ 流式提取完成: {len(self.video_urls)} 个视频 | 读取 {stats['chars']} 字符"
+            + (" | 已提前结束" if stats["early_exit"] else "")
+        )
+
+    def _stream_page(self, url, max_videos):
+        started = time.perf_counter()
+        self.last_stream_stats = stats = {"chars": 0, "early_exit": False, "first_video_ms": None, "total_ms": None}
+        scanner = StreamingVideoScanner(self._append_video_url, self._extract_from_script, self._append_candidate)
+        response = self._safe_get(url, timeout=REQUEST_TIMEOUT, stream=True)
+        try:
+            response.raise_for_status()
+            response.encoding = "utf-8"
+            self.last_final_url = response.url or url
+            for text in response.iter_content(chunk_size=STREAM_CHUNK_SIZE, decode_unicode=True):
+                found = len(self.video_urls)
+                scanner.feed(text)
+                yield from self._videos_since(found, stats, started)
+                if max_videos and len(self.video_urls) >= max_videos:
+                    stats["early_exit"] = True
+                    break
+            else:
+                found = len(self.video_urls)
+                scanner.close()
+                yield from self._videos_since(found, stats, started)
+        finally:
+            response.close()
+        stats["chars"] = scanner.chars
+        stats["total_ms"] = round((time.perf_counter() - started) * 1000, 1)
+        return scanner
+
+    def _videos_since(self, found, stats, started):
+        if len(self.video_urls) == found:
+            return []
+        if stats["first_video_ms"] is None:
+            stats["first_video_ms"] = round((time.perf_counter() - started) * 1000, 1)
+        return self.video_urls.to_list()[found:]
+
+    def _get_page(self, url):
+        if self.page_cache is None:
+            response = self._safe_get(url, timeout=REQUEST_TIMEOUT)
+            self.last_cache_status = "bypass"
+            return response
+        response = self.page_cache.fetch(
+            url,
+            self._safe_get,
+            store_if=lambda page: not self.detect_anti_bot_page(page.text),
+            timeout=REQUEST_TIMEOUT,
+        )
+        self.last_cache_status = response.cache_status
+        if response.cache_status != "miss":
+            self._log(f"✓ 命中页面缓存（{response.cache_status}）")
+        return response
+
+    def _attach_session_state(self):
+        """返回本次请求使用的会话状态，由调用方保存并传给 _warm_up_for_retry（同一实例可能被多个线程共用）。"""
+        if self.session_store is None:
             return None
+        return self.session_store.attach(self.session, self.warmup_urls, self._warm_up_session)
+
+    def _warm_up_for_retry(self, session_state=None) -> bool:
+        """遇到校验页时预热会话，返回是否值得重试；会话存储判定刚预热过仍被拦截时跳过预热与重试。"""
+        if self.session_store is None:
+            self._warm_up_session()
+            return True
+        retry = self.session_store.rewarm(self.session, self.warmup_urls, self._warm_up_session, session_state)
+        if not retry:
+            self._log("! 会话刚预热过仍被拦截，跳过重复预热")
+        return retry
 
     def _warm_up_session(self):
-        warmup_urls = [
-            "https://www.alibaba.com/",
-            "https://www.alibaba.com/trade/search?fsb=y&IndexArea=product_en&SearchText=sunglasses",
-        ]
-        for warmup_url in warmup_urls:
+        for warmup_url in self.warmup_urls:
             try:
                 resp = self._safe_get(warmup_url, timeout=min(12, REQUEST_TIMEOUT))
                 _ = resp.text
@@ -94,148 +314,167 @@ class AlibabaVideoScraper:
                 continue
 
     def _safe_get(self, url, **kwargs):
+        kwargs["headers"] = {**self.headers, **(kwargs.get("headers") or {})}
         try:
             return self.session.get(url, **kwargs)
         except requests.exceptions.SSLError:
-            print("! 证书校验失败，已切换兼容模式重试")
+            self._log("! 证书校验失败，已切换兼容模式重试")
             return self.session.get(url, verify=False, **kwargs)
 
     def extract_videos_from_html(self, html):
-        print("正在提取视频 URL...")
-        self.video_urls = []
-        soup = BeautifulSoup(html, "html.parser")
-
-        videos = soup.find_all("video")
-        print(f"找到 {len(videos)} 个 <video> 标签")
-        for video in videos:
-            src = video.get("src")
-            if src:
-                self._append_video_url(src)
-            for source in video.find_all("source"):
-                source_src = source.get("src")
-                if source_src:
-                    self._append_video_url(source_src)
-
-        print("\n正在从页面 JSON 中提取视频...")
-        script_tags = soup.find_all("script", type="application/json")
-        for script in script_tags:
-            try:
-                if not script.string:
-                    continue
-                data = json.loads(script.string)
-                self._extract_from_json(data)
-            except (TypeError, ValueError, json.JSONDecodeError):
-                continue
-
-        print("\n正在用正则表达式查找视频...")
-        patterns = [
-            r'https?://[^\s"\'<>]+\.(?:mp4|webm|ogg|mov)',
-            r'"videoUrl"\s*:\s*"([^"]+)"',
-            r'"video"\s*:\s*"([^"]+)"',
-            r'"playUrl"\s*:\s*"([^"]+)"',
-            r'"previewVideoUrl"\s*:\s*"([^"]+)"',
-            r'"mediaUrl"\s*:\s*"([^"]+)"',
-            r'src=[\'\"](https?://[^\'\"]+\.(?:mp4|webm|ogg|mov))[\'\"]',
-            r'https?:\\/\\/[^\s"\'<>]+\.(?:mp4|webm|ogg|mov)',
-            r'\\"videoUrl\\"\s*:\s*\\"([^\\"]+)\\"',
-            r'\\"playUrl\\"\s*:\s*\\"([^\\"]+)\\"',
-            r'\\"previewVideoUrl\\"\s*:\s*\\"([^\\"]+)\\"',
-            r'\\"mediaUrl\\"\s*:\s*\\"([^\\"]+)\\"',
-        ]
-
-        for pattern in patterns:
-            for match in re.findall(pattern, html):
-                candidate = match if isinstance(match, str) else match[0]
-                self._append_candidate(candidate)
-
-        compact = html.replace("\\n", " ")
-        for key in ["videoUrl", "playUrl", "previewVideoUrl", "mediaUrl"]:
-            quoted_pattern = rf"{key}\\u0022:\\u0022([^\\u0022]+(?:\\.mp4|\\.webm|\\.ogg|\\.mov)[^\\u0022]*)"
-            for match in re.findall(quoted_pattern, compact):
-                self._append_candidate(match)
+        self._log("正在提取视频 URL...")
+        document = as_document(html)
+        with profile_section("extract_videos", document.page_url, lambda: document.content_hash):
+            if self.extraction_cache is None:
+                self._collect_video_urls(document)
+            else:
+                urls = self.extraction_cache.get_or_compute(
+                    "videos",
+                    document,
+                    document.page_url,
+                    lambda: self._collect_video_urls(document),
+                )
+                self.video_urls = OrderedUrlSet(urls)
 
         if not self.video_urls:
-            print("✗ 未找到视频 URL")
+            self._log("✗ 未找到视频 URL")
             return False
 
-        print(f"\n✓ 共找到 {len(self.video_urls)} 个视频")
+        self._log(f"\n✓ 共找到 {len(self.video_urls)} 个视频")
         return True
 
-    def _extract_from_json(self, obj, depth=0):
-        if depth > 10:
+    def download_video(self, video_url, filename, progress=None):
+        if not progress:
+            self._log(f"\n正在下载: {filename}")
+        partial = PartialDownload(self.download_dir / filename, video_url)
+
+        for attempt in range(1, DOWNLOAD_RETRIES + 1):
+            try:
+                self._download_to_part(partial, progress)
+                partial.finalize()
+                if progress:
+                    if self.verbose:
+                        progress.log(f"✓ 下载完成: {partial.filepath}")
+                else:
+                    self._log(f"\n✓ 下载完成: {partial.filepath}")
+                return True
+            except (requests.RequestException, OSError) as error:
+                if attempt < DOWNLOAD_RETRIES:
+                    message = f"! 下载中断，{attempt}s 后从断点续传: {filename} ({error})"
+                    if progress:
+                        progress.log(message)
+                    else:
+                        self._log(f"\n{message}")
+                    time.sleep(attempt)
+                    continue
+                if progress:
+                    progress.log(f"✗ 下载失败: {filename} {error}")
+                else:
+                    self._log(f"\n✗ 下载失败: {error}")
+        return False
+
+    def _download_to_part(self, partial, progress=None):
+        if self.segments > 1 and self._download_segmented(partial, progress):
             return
 
-        if isinstance(obj, dict):
-            for key, value in obj.items():
-                if key.lower() in ["video", "videourl", "url", "src", "source", "playurl"]:
-                    if isinstance(value, str):
-                        normalized = self._normalize_video_url(value)
-                        if normalized.endswith((".mp4", ".webm", ".ogg", ".mov")):
-                            self._append_video_url(normalized)
-                self._extract_from_json(value, depth + 1)
-        elif isinstance(obj, list):
-            for item in obj:
-                self._extract_from_json(item, depth + 1)
-
-    def download_video(self, video_url, filename):
+        offset = partial.resume_offset()
+        response = self._safe_get(
+            partial.video_url,
+            timeout=REQUEST_TIMEOUT,
+            stream=True,
+            headers=partial.range_headers(offset),
+        )
         try:
-            print(f"\n正在下载: {filename}")
-            response = self._safe_get(video_url, timeout=REQUEST_TIMEOUT, stream=True)
+            if response.status_code == 416:
+                if offset and offset == partial.total_size:
+                    return
+                partial.clear()
+                raise IncompleteDownloadError("断点位置无效，已清除分片重新下载")
             response.raise_for_status()
 
-            total_size = int(response.headers.get("content-length", 0))
-            downloaded_size = 0
-            filepath = DOWNLOAD_DIR / filename
-
-            with open(filepath, "wb") as file_handler:
+            if response.status_code == 206:
+                if not partial.accepts_partial(response, offset):
+                    partial.clear()
+                    raise IncompleteDownloadError("服务器返回的分段与本地分片不一致，已清除分片重新下载")
+                mode = "ab"
+            else:
+                # 服务器不支持 Range 或文件已变化（If-Range 不匹配）时返回完整内容
+                offset = 0
+                partial.start_fresh(response)
+                mode = "wb"
+
+            total_size = partial.total_size or 0
+            downloaded_size = offset
+            with open(partial.part_path, mode) as file_handler:
                 for chunk in response.iter_content(chunk_size=CHUNK_SIZE):
                     if chunk:
                         file_handler.write(chunk)
                         downloaded_size += len(chunk)
-                        if total_size > 0:
-                            progress = (downloaded_size / total_size) * 100
-                            print(f"  进度: {progress:.1f}% ({downloaded_size}/{total_size} bytes)", end="\r")
-
-            print(f"\n✓ 下载完成: {filepath}")
-            return True
-        except requests.RequestException as error:
-            print(f"\n✗ 下载失败: {error}")
+                        if progress:
+                            progress.add_bytes(len(chunk))
+                        elif total_size > 0:
+                            percent = (downloaded_size / total_size) * 100
+                            self._log(f"  进度: {percent:.1f}% ({downloaded_size}/{total_size} bytes)", end="\r")
+        finally:
+            response.close()
+
+    def _download_segmented(self, partial, progress=None):
+        """服务器支持 Range 且文件足够大时多连接分段下载；返回 False 表示应退回单连接。"""
+        if partial.load() and not partial.segments and partial.part_path.stat().st_size:
+            # 已有单连接留下的连续分片，继续走单连接续传更省流量
+            return False
+        total_size, etag = probe_ranges(self._safe_get, partial.video_url)
+        if not total_size or total_size < SEGMENT_MIN_SIZE:
             return False
 
+        partial.prepare_segments(total_size, etag, self.segments)
+        download_segments(self._safe_get, partial, progress or DownloadProgress(1))
+        return True
+
     def download_all_videos(self):
         if not self.video_urls:
-            print("没有可下载的视频")
+            self._log("没有可下载的视频")
             return False
 
-        print(f"\n{'=' * 60}")
-        print(f"开始下载 {len(self.video_urls)} 个视频...")
-        print(f"{'=' * 60}\n")
+        self._log(f"\n{'=' * 60}")
+        self._log(f"开始下载 {len(self.video_urls)} 个视频（{self.download_workers} 线程，每域名 {self.per_host_limit} 连接）...")
+        self._log(f"{'=' * 60}\n")
 
-        success_count = 0
-        for index, video_url in enumerate(self.video_urls, 1):
-            if self.download_video(video_url, f"video_{index}.mp4"):
-                success_count += 1
-            time.sleep(1)
+        jobs = [(video_url, f"video_{index}.mp4") for index, video_url in enumerate(self.video_urls, 1)]
+        manager = DownloadManager(self.download_video, self.download_workers, self.per_host_limit)
+        results, summary = manager.run(jobs)
+        success_count = sum(1 for success in results if success)
 
-        print(f"\n{'=' * 60}")
-        print(f"下载完成！成功: {success_count}/{len(self.video_urls)}")
-        print(f"{'=' * 60}")
+        self._log(f"\n{'=' * 60}")
+        self._log(f"下载完成！成功: {success_count}/{len(self.video_urls)}")
+        self._log(
+            f"耗时 {summary['seconds']:.1f}s | 吞吐 {summary['bytes_per_second'] / 1024 / 1024:.2f} MB/s "
+            f"({summary['bytes_per_second']:.0f} bytes/s) | {summary['files_per_second']:.2f} 个文件/s"
+        )
+        self._log(f"{'=' * 60}")
 
         return success_count > 0
 
-    def scrape(self, url):
+    def scrape(self, url, stream=False, max_videos=STREAM_EARLY_EXIT_VIDEOS):
         try:
-            html = self.fetch_page(url)
-            if not html:
-                return False
-
-            if not self.extract_videos_from_html(html):
-                return False
+            if stream:
+                for video_url in self.stream_videos(url, max_videos):
+                    self._log(f"  发现视频: {video_url}")
+                if not self.video_urls:
+                    self._log("✗ 未找到视频 URL")
+                    return False
+            else:
+                html = self.fetch_page(url)
+                if not html:
+                    return False
+
+                if not self.extract_videos_from_html(html):
+                    return False
 
             if not self.download_all_videos():
                 return False
 
             return True
         except (requests.RequestException, RuntimeError, OSError, ValueError) as error:
-            print(f"爬取过程出错: {error}")
+            self._log(f"爬取过程出错: {error}")
             return False
\ No newline at end of file
@@ -0,0 +1,76 @@
+from concurrent.futures import ThreadPoolExecutor
+
+from src.config import CHUNK_SIZE, REQUEST_TIMEOUT
+from src.resumable_download import IncompleteDownloadError, parse_content_range
+
+
+def probe_ranges(get, video_url: str):
+    """用 bytes=0-0 探测是否支持 Range，返回 (总长度, ETag)；不支持时总长度为 None。"""
+    response = get(video_url, timeout=REQUEST_TIMEOUT, stream=True, headers={"Range": "bytes=0-0"})
+    try:
+        if response.status_code != 206:
+            return None, ""
+        content_range = parse_content_range(response.headers.get("Content-Range"))
+        if not content_range or content_range[2] is None:
+            return None, ""
+        return content_range[2], response.headers.get("ETag", "")
+    finally:
+        response.close()
+
+
+def _fetch_segment(get, partial, segment: list, progress, chunk_size: int):
+    start, end, _ = segment
+    position = start + segment[2]
+    if position > end:
+        return
+
+    headers = {"Range": f"bytes={position}-{end}"}
+    if partial.etag and not partial.etag.startswith("W/"):
+        headers["If-Range"] = partial.etag
+    response = get(partial.video_url, timeout=REQUEST_TIMEOUT, stream=True, headers=headers)
+    try:
+        response.raise_for_status()
+        content_range = parse_content_range(response.headers.get("Content-Range"))
+        if response.status_code != 206 or not content_range or content_range[0] != position:
+            raise IncompleteDownloadError("服务器未按请求返回分段（文件可能已变化）")
+
+        # 每个分段使用独立句柄，按偏移写入预分配文件，互不干扰
+        with open(partial.part_path, "r+b") as file_handler:
+            file_handler.seek(position)
+            for chunk in response.iter_content(chunk_size=chunk_size):
+                if not chunk:
+                    continue
+                chunk = chunk[: end + 1 - position]
+                file_handler.write(chunk)
+                position += len(chunk)
+                segment[2] = position - start
+                if progress:
+                    progress.add_bytes(len(chunk))
+                if position > end:
+                    break
+    finally:
+        response.close()
+
+    if position <= end:
+        raise IncompleteDownloadError(f"分段 {start}-{end} 不完整")
+
+
+def download_segments(get, partial, progress=None, chunk_size: int = CHUNK_SIZE):
+    """并行下载 partial.segments 中尚未完成的部分；无论成败都会保存分段进度以便续传。"""
+    pending = [segment for segment in partial.segments if segment[0] + segment[2] <= segment[1]]
+    if not pending:
+        return
+
+    try:
+        with ThreadPoolExecutor(max_workers=len(pending), thread_name_prefix="video-segment") as executor:
+            futures = [
+                executor.submit(_fetch_segment, get, partial, segment, progress, chunk_size)
+                for segment in pending
+            ]
+            errors = [future.exception() for future in futures]
+    finally:
+        partial.save_meta()
+
+    for error in errors:
+        if error:
+            raise error
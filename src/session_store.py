@@ -0,0 +1,220 @@
+import hashlib
+import json
+import os
+import threading
+import time
+import weakref
+from pathlib import Path
+from urllib.parse import urlparse
+
+from requests.cookies import create_cookie
+
+from src.config import SESSION_REWARM_INTERVAL, SESSION_STATE_DIR, SESSION_STATE_REFRESH_AFTER, SESSION_STATE_TTL
+
+
+def _matches_host(domain: str, hosts) -> bool:
+    domain = (domain or "").lstrip(".")
+    return any(host == domain or host.endswith("." + domain) for host in hosts)
+
+
+class SessionState:
+    """一次会话预热的结果：预热时间与预热站点下发的 Cookie。"""
+
+    def __init__(self, warmed_at: float, cookies: list):
+        self.warmed_at = warmed_at
+        self.cookies = cookies
+
+    @classmethod
+    def capture(cls, session, hosts) -> "SessionState":
+        cookies = [
+            {
+                "name": cookie.name,
+                "value": cookie.value,
+                "domain": cookie.domain,
+                "path": cookie.path,
+                "expires": cookie.expires,
+                "secure": cookie.secure,
+                "rest": dict(cookie._rest),
+            }
+            for cookie in list(session.cookies)
+            if _matches_host(cookie.domain, hosts)
+        ]
+        return cls(time.time(), cookies)
+
+    def age(self) -> float:
+        return time.time() - self.warmed_at
+
+    def apply(self, session):
+        now = time.time()
+        for cookie in self.cookies:
+            if cookie["expires"] and cookie["expires"] <= now:
+                continue
+            session.cookies.set_cookie(create_cookie(**cookie))
+
+    def to_bytes(self) -> bytes:
+        return json.dumps({"warmed_at": self.warmed_at, "cookies": self.cookies}, ensure_ascii=False).encode("utf-8")
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "SessionState":
+        payload = json.loads(data.decode("utf-8"))
+        return cls(payload["warmed_at"], payload["cookies"])
+
+
+class SessionStore:
+    """反爬会话存储：预热得到的 Cookie 保存在进程内与可选的 /tmp 磁盘副本中，按预热 URL 组区分。
+
+    有效期内的请求直接带上已有 Cookie，不再重复访问预热页面；会话存在超过 refresh_after 后在后台重新预热。
+    同一时刻只有一个预热在进行，并发遇到校验页的请求等待其结果后复用。
+    """
+
+    def __init__(self, ttl: float = SESSION_STATE_TTL, refresh_after: float = SESSION_STATE_REFRESH_AFTER,
+                 rewarm_interval: float = SESSION_REWARM_INTERVAL, disk_dir: Path | None = SESSION_STATE_DIR):
+        self.ttl = ttl
+        self.refresh_after = refresh_after
+        self.rewarm_interval = rewarm_interval
+        self.disk_dir = self._prepare_disk_dir(disk_dir)
+        self._states = {}
+        # 每个 session 已带上的会话状态（按预热时间区分）；之后会话自身轮换的 Cookie 不再被旧快照覆盖
+        self._applied = weakref.WeakKeyDictionary()
+        self._refreshing = set()
+        self._lock = threading.Lock()
+        # 预热本身串行执行，避免同一时刻多个请求各自访问预热页面
+        self._warm_lock = threading.Lock()
+        self.warmups = 0
+        self.reused = 0
+        self.skipped = 0
+        self.background_refreshes = 0
+
+    @staticmethod
+    def _prepare_disk_dir(disk_dir):
+        if not disk_dir:
+            return None
+        try:
+            Path(disk_dir).mkdir(parents=True, exist_ok=True)
+            return Path(disk_dir)
+        except OSError:
+            return None
+
+    @staticmethod
+    def _key(warmup_urls) -> str:
+        return "\n".join(warmup_urls)
+
+    def _disk_path(self, key: str) -> Path:
+        return self.disk_dir / (hashlib.blake2b(key.encode("utf-8"), digest_size=16).hexdigest() + ".session")
+
+    def _get(self, key: str):
+        with self._lock:
+            state = self._states.get(key)
+        if state is not None or not self.disk_dir:
+            return state
+        try:
+            state = SessionState.from_bytes(self._disk_path(key).read_bytes())
+        except (OSError, ValueError, KeyError):
+            return None
+        with self._lock:
+            return self._states.setdefault(key, state)
+
+    def _put(self, key: str, state: SessionState):
+        with self._lock:
+            self._states[key] = state
+        if not self.disk_dir:
+            return
+        try:
+            path = self._disk_path(key)
+            temp_path = path.with_suffix(f".{threading.get_ident()}.tmp")
+            temp_path.write_bytes(state.to_bytes())
+            os.replace(temp_path, path)
+        except OSError:
+            pass
+
+    def _apply(self, session, key: str, state: SessionState):
+        """只在 session 还没带上这份状态时写入 Cookie。"""
+        with self._lock:
+            applied = self._applied.setdefault(session, {})
+            if applied.get(key) == state.warmed_at:
+                return
+            applied[key] = state.warmed_at
+        state.apply(session)
+
+    def _warm(self, session, warmup_urls, warm_up):
+        warm_up()
+        key = self._key(warmup_urls)
+        hosts = {urlparse(url).hostname or "" for url in warmup_urls}
+        state = SessionState.capture(session, hosts)
+        self._put(key, state)
+        # 预热直接写入了这个 session，无需再次应用
+        with self._lock:
+            self._applied.setdefault(session, {})[key] = state.warmed_at
+
+    def attach(self, session, warmup_urls, warm_up) -> SessionState | None:
+        """请求前调用：把有效期内的 Cookie 带到 session 上，返回本次使用的会话状态（没有可用会话时为 None）。
+
+        同一份状态对每个 session 只写入一次，之后由 session 自己维护 Cookie（如服务端轮换的令牌）。
+
+        warm_up() 需把预热得到的 Cookie 写入 session，会话需要后台刷新时在后台线程中调用。
+        """
+        state = self._get(self._key(warmup_urls))
+        if state is None:
+            return None
+        if state.age() >= self.refresh_after:
+            self._refresh_in_background(session, warmup_urls, warm_up)
+        if state.age() >= self.ttl:
+            return None
+        self._apply(session, self._key(warmup_urls), state)
+        return state
+
+    def rewarm(self, session, warmup_urls, warm_up, used: SessionState | None = None) -> bool:
+        """遇到校验页时调用，返回是否值得带着新的 Cookie 重试。used 为 attach 返回的会话状态。"""
+        key = self._key(warmup_urls)
+        with self._warm_lock:
+            state = self._get(key)
+            if state is not None and state.age() < self.ttl and state.warmed_at > (used.warmed_at if used else 0.0):
+                # 等待期间其他请求已完成预热，直接换用新 Cookie
+                self._apply(session, key, state)
+                with self._lock:
+                    self.reused += 1
+                return True
+            if state is not None and state.age() < self.rewarm_interval:
+                # 刚预热过仍被拦截，重复预热只会多两次整页请求
+                with self._lock:
+                    self.skipped += 1
+                return False
+            self._warm(session, warmup_urls, warm_up)
+            with self._lock:
+                self.warmups += 1
+            return True
+
+    def _refresh_in_background(self, session, warmup_urls, warm_up):
+        key = self._key(warmup_urls)
+        with self._lock:
+            if key in self._refreshing:
+                return
+            self._refreshing.add(key)
+
+        def refresh():
+            try:
+                with self._warm_lock:
+                    state = self._get(key)
+                    # 排队期间可能已被遇到校验页的请求重新预热
+                    if state is None or state.age() >= self.refresh_after:
+                        self._warm(session, warmup_urls, warm_up)
+                        with self._lock:
+                            self.background_refreshes += 1
+            finally:
+                with self._lock:
+                    self._refreshing.discard(key)
+
+        threading.Thread(target=refresh, name="session-refresh", daemon=True).start()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "warmups": self.warmups,
+                "reused": self.reused,
+                "skipped": self.skipped,
+                "background_refreshes": self.background_refreshes,
+                "sessions": len(self._states),
+            }
+
+
+SESSION_STORE = SessionStore()
@@ -0,0 +1,107 @@
+from html.parser import HTMLParser
+
+from src.config import STREAM_HEAD_CHARS, STREAM_SCAN_OVERLAP
+from src.json_scanner import is_inline_state
+from src.video_matcher import KIND_NAMES, iter_video_matches, match_value
+
+# 续扫时保留的回看字符数，覆盖候选正则的后顾与键名前缀（如 previewVideoUrl\\u0022:）
+_LOOKBEHIND_CHARS = 256
+
+
+class StreamingVideoScanner(HTMLParser):
+    """增量扫描页面：每收到一块文本就提取 <video>/<source>、JSON 与内联状态脚本及正则候选。
+
+    与整页提取使用同一套规则，结果通过回调交给调用方去重、规范化：
+    on_url(src) 对应标签属性，on_script(text) 对应 JSON / window.xxx = {...} 脚本原文，on_candidate(raw) 对应正则候选。
+    正则只在距末尾 STREAM_SCAN_OVERLAP 之前的部分确认命中，已确认的部分随即丢弃，
+    因此内存占用与页面大小无关（单个超长内联脚本除外，HTMLParser 需缓存到其结束标签）。
+    """
+
+    def __init__(self, on_url, on_script, on_candidate, overlap: int = STREAM_SCAN_OVERLAP,
+                 head_chars: int = STREAM_HEAD_CHARS):
+        super().__init__(convert_charrefs=True)
+        self._on_url = on_url
+        self._on_script = on_script
+        self._on_candidate = on_candidate
+        self._overlap = max(overlap, _LOOKBEHIND_CHARS)
+        self._head_chars = head_chars
+        self._buffer = ""
+        self._resume = 0
+        self._last_end = [0] * len(KIND_NAMES)
+        self._video_depth = 0
+        self._script_parts = None
+        self._script_is_json = False
+        self._title_parts = None
+        self.head = ""
+        self.title = ""
+        self.chars = 0
+
+    def feed(self, data: str):
+        if self.chars < self._head_chars:
+            self.head += data[: self._head_chars - self.chars]
+        self.chars += len(data)
+        super().feed(data)
+        self._buffer += data
+        self._scan(final=False)
+
+    def close(self):
+        super().close()
+        if self._title_parts is not None:
+            self._finish_title()
+        self._scan(final=True)
+
+    def _scan(self, final: bool):
+        buffer = self._buffer
+        limit = len(buffer) if final else len(buffer) - self._overlap
+        if limit <= self._resume:
+            return
+
+        resume = limit
+        for colon, kind, match in iter_video_matches(buffer, self._last_end, self._resume):
+            if colon >= limit or match.end() > limit:
+                # 命中可能随后续数据变长，留到下一块再确认
+                resume = colon
+                break
+            self._last_end[kind] = match.end()
+            self._on_candidate(match_value(kind, match))
+
+        drop = max(0, resume - _LOOKBEHIND_CHARS)
+        self._buffer = buffer[drop:]
+        self._resume = resume - drop
+        self._last_end = [max(0, end - drop) for end in self._last_end]
+
+    def handle_starttag(self, tag, attrs):
+        if self._title_parts is not None:
+            # 未闭合的 <title> 到下一个标签为止，与 PageDocument.title 一致
+            self._finish_title()
+        if tag == "video":
+            self._video_depth += 1
+        if tag == "video" or (tag == "source" and self._video_depth):
+            src = dict(attrs).get("src")
+            if src:
+                self._on_url(src)
+        elif tag == "script" and "src" not in dict(attrs):
+            self._script_parts = []
+            self._script_is_json = dict(attrs).get("type") == "application/json"
+        elif tag == "title" and not self.title:
+            self._title_parts = []
+
+    def handle_endtag(self, tag):
+        if tag == "video":
+            self._video_depth = max(0, self._video_depth - 1)
+        elif tag == "script" and self._script_parts is not None:
+            text, self._script_parts = "".join(self._script_parts), None
+            if self._script_is_json or is_inline_state(text):
+                self._on_script(text)
+        elif tag == "title" and self._title_parts is not None:
+            self._finish_title()
+
+    def _finish_title(self):
+        self.title = "".join(self._title_parts).strip()
+        self._title_parts = None
+
+    def handle_data(self, data):
+        if self._script_parts is not None:
+            self._script_parts.append(data)
+        elif self._title_parts is not None:
+            self._title_parts.append(data)
@@ -0,0 +1,77 @@
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+from contextvars import ContextVar
+
+from src.config import TIMING_ENABLED
+
+_CURRENT = ContextVar("stage_timer", default=None)
+_DISABLED = nullcontext()
+
+
+class StageTimer:
+    """一次请求内各阶段的累计耗时（毫秒）；同名阶段多次出现时累加，阶段之间可以嵌套。"""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.stages = {}
+        # 批量抓取时多个工作线程会向同一个计时器累加
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def stage(self, name: str):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(name, (time.perf_counter() - started) * 1000)
+
+    def add(self, name: str, ms: float):
+        with self._lock:
+            self.stages[name] = self.stages.get(name, 0.0) + ms
+
+    def merge(self, other: "StageTimer"):
+        """把另一个计时器（如批量中单个页面的）各阶段耗时累加进来，不含其 total。"""
+        for name, ms in list(other.stages.items()):
+            self.add(name, ms)
+
+    def total_ms(self) -> float:
+        return (time.perf_counter() - self.started) * 1000
+
+    def as_dict(self) -> dict:
+        with self._lock:
+            result = {name: round(ms, 2) for name, ms in self.stages.items()}
+        result["total"] = round(self.total_ms(), 2)
+        return result
+
+    def server_timing(self) -> str:
+        """生成标准 Server-Timing 响应头，浏览器开发者工具的 Timing 面板可直接展示。"""
+        return ", ".join(f"{name};dur={ms}" for name, ms in self.as_dict().items())
+
+
+def start_timing(enabled=None) -> StageTimer | None:
+    """在请求入口调用；enabled 为 None 时取 TIMING_ENABLED，关闭时不创建计时器。"""
+    timer = StageTimer() if (TIMING_ENABLED if enabled is None else enabled) else None
+    _CURRENT.set(timer)
+    return timer
+
+
+def current_timer() -> StageTimer | None:
+    return _CURRENT.get()
+
+
+def finish_timing() -> StageTimer | None:
+    timer = _CURRENT.get()
+    _CURRENT.set(None)
+    return timer
+
+
+def stage(name: str):
+    """with stage("fetch"): ...；当前请求未开启计时时返回共享的空上下文，几乎没有开销。"""
+    timer = _CURRENT.get()
+    return _DISABLED if timer is None else timer.stage(name)
+
+
+def timing_debug() -> dict:
+    timer = _CURRENT.get()
+    return {} if timer is None else {"timing": timer.as_dict()}
@@ -0,0 +1,26 @@
+class OrderedUrlSet:
+    """按插入顺序保存、基于哈希去重的 URL 集合，add/包含判断均为 O(1)。"""
+
+    def __init__(self, urls=()):
+        self._urls = dict.fromkeys(urls)
+
+    def add(self, url: str) -> bool:
+        if url in self._urls:
+            return False
+        self._urls[url] = None
+        return True
+
+    def to_list(self) -> list[str]:
+        return list(self._urls)
+
+    def __contains__(self, url) -> bool:
+        return url in self._urls
+
+    def __iter__(self):
+        return iter(self._urls)
+
+    def __len__(self) -> int:
+        return len(self._urls)
+
+    def __repr__(self) -> str:
+        return f"OrderedUrlSet({list(self._urls)!r})"
@@ -0,0 +1,146 @@
+import re
+
+
+VIDEO_KEYS = ("videoUrl", "playUrl", "previewVideoUrl", "mediaUrl")
+
+# 每类候选对应的完整正则（顺序即结果顺序，与原先逐条 findall 的顺序一致）
+_KIND_PATTERNS = [
+    ("directMp4", r'https?://[^\s"\'<>]+\.(?:mp4|webm|ogg|mov)'),
+    ("videoUrl", r'"videoUrl"\s*:\s*"([^"]+)"'),
+    ("video", r'"video"\s*:\s*"([^"]+)"'),
+    ("playUrl", r'"playUrl"\s*:\s*"([^"]+)"'),
+    ("previewVideoUrl", r'"previewVideoUrl"\s*:\s*"([^"]+)"'),
+    ("mediaUrl", r'"mediaUrl"\s*:\s*"([^"]+)"'),
+    ("srcAttr", r'src=[\'\"](https?://[^\'\"]+\.(?:mp4|webm|ogg|mov))[\'\"]'),
+    ("escapedMp4", r'https?:\\/\\/[^\s"\'<>]+\.(?:mp4|webm|ogg|mov)'),
+    ("escapedVideoUrl", r'\\"videoUrl\\"\s*:\s*\\"([^\\"]+)\\"'),
+    ("escapedPlayUrl", r'\\"playUrl\\"\s*:\s*\\"([^\\"]+)\\"'),
+    ("escapedPreviewVideoUrl", r'\\"previewVideoUrl\\"\s*:\s*\\"([^\\"]+)\\"'),
+    ("escapedMediaUrl", r'\\"mediaUrl\\"\s*:\s*\\"([^\\"]+)\\"'),
+]
+
+# " 形式原本在 html.replace("\\n", " ") 的副本上匹配；这里直接在原文上匹配，
+# 把字面量 "\n" 视为一个字符（即副本里的空格），命中后再对捕获值做同样的替换。
+_COMPACT_CHAR = r"(?:\\n|[^\\u02])"
+_COMPACT_ANY = r"(?:\\n|.)"
+for _key in VIDEO_KEYS:
+    _ext = "|".join(rf"\\(?!n){_COMPACT_ANY}{ext}" for ext in ("mp4", "webm", "ogg", "mov"))
+    _KIND_PATTERNS.append(
+        (
+            f"quoted{_key[0].upper()}{_key[1:]}",
+            rf"{_key}\\u0022:\\u0022({_COMPACT_CHAR}+(?:{_ext}){_COMPACT_CHAR}*)",
+        )
+    )
+
+KIND_NAMES = tuple(name for name, _ in _KIND_PATTERNS)
+_KIND_REGEXES = tuple(re.compile(pattern) for _, pattern in _KIND_PATTERNS)
+_KIND_INDEX = {name: index for index, name in enumerate(KIND_NAMES)}
+_QUOTED_KINDS = frozenset(_KIND_INDEX[f"quoted{key[0].upper()}{key[1:]}"] for key in VIDEO_KEYS)
+
+_EXT = r"\.(?:mp4|webm|ogg|mov)"
+_PLAIN_KEYS = ("videoUrl", "video", "playUrl", "previewVideoUrl", "mediaUrl")
+
+
+def _lookbehinds(template: str, keys) -> str:
+    return "|".join(f"(?<={template.format(re.escape(key))})" for key in keys)
+
+
+_PLAIN_LOOKBEHINDS = _lookbehinds(r'"{}":', _PLAIN_KEYS)
+_ESCAPED_LOOKBEHINDS = _lookbehinds(r'\\"{}\\":', VIDEO_KEYS)
+_QUOTED_LOOKBEHINDS = _lookbehinds(r"{}\\u0022:", VIDEO_KEYS)
+
+# 每一种候选都含有冒号（协议头或 JSON 键值分隔符），因此整页只按字面量 ":" 快速扫描一遍，
+# 再用定宽后顾/前瞻在 C 层判断该冒号是否可能属于某类候选；只有命中的位置才回到 Python 校验。
+_SCAN_RE = re.compile(
+    r":(?:"
+    r"(?<=[sp]:)(?:(?<=https:)|(?<=http:))"
+    rf"(?=//[^\s\"'<>]+{_EXT}|\\/\\/[^\s\"'<>]+{_EXT}"
+    rf"|(?<=src=[\"']https:)//[^\"']+{_EXT}[\"']|(?<=src=[\"']http:)//[^\"']+{_EXT}[\"'])(?P<url>)"
+    rf"|(?<=\":)(?:(?<=Url\":)|(?<=video\":))(?:{_PLAIN_LOOKBEHINDS})(?=\s*\")(?P<plain>)"
+    rf"|(?<=Url\\\":)(?:{_ESCAPED_LOOKBEHINDS})(?=\s*\\\")(?P<escaped>)"
+    rf"|(?<=Url\\u0022:)(?:{_QUOTED_LOOKBEHINDS})(?=\\u0022)(?P<quoted>)"
+    r"|(?<=\s:)(?=\s*\\?\")(?P<spaced>)"
+    r")"
+)
+
+_DIRECT = _KIND_INDEX["directMp4"]
+_ESCAPED = _KIND_INDEX["escapedMp4"]
+_SRC = _KIND_INDEX["srcAttr"]
+_PLAIN_PREFIXES = tuple((f'"{key}"', _KIND_INDEX[key]) for key in _PLAIN_KEYS)
+_ESCAPED_PREFIXES = tuple((f'\\"{key}\\"', _KIND_INDEX[f"escaped{key[0].upper()}{key[1:]}"]) for key in VIDEO_KEYS)
+_QUOTED_PREFIXES = tuple((f"{key}\\u0022", _KIND_INDEX[f"quoted{key[0].upper()}{key[1:]}"]) for key in VIDEO_KEYS)
+
+
+def _keyed_start(html: str, end: int, prefixes):
+    for prefix, kind in prefixes:
+        start = end - len(prefix)
+        if start >= 0 and html.startswith(prefix, start):
+            return start, kind
+    return None
+
+
+def _candidate_starts(html: str, colon: int, branch: str):
+    if branch == "url":
+        start = colon - 5 if html.startswith("https", colon - 5) else colon - 4
+        yield start, _DIRECT
+        yield start, _ESCAPED
+        if start >= 5 and html.startswith("src=", start - 5) and html[start - 1] in "'\"":
+            yield start - 5, _SRC
+        return
+
+    if branch == "spaced":
+        end = colon
+        while end > 0 and html[end - 1].isspace():
+            end -= 1
+        prefixes = _PLAIN_PREFIXES + _ESCAPED_PREFIXES
+    else:
+        end = colon
+        prefixes = {"plain": _PLAIN_PREFIXES, "escaped": _ESCAPED_PREFIXES, "quoted": _QUOTED_PREFIXES}[branch]
+
+    found = _keyed_start(html, end, prefixes)
+    if found:
+        yield found
+
+
+def iter_video_matches(html: str, last_end: list, pos: int = 0):
+    """按文档顺序产出 (冒号位置, 类型下标, match)；last_end 由调用方在采纳匹配后更新。
+
+    流式扫描可从 pos 继续、在任意位置中断，下次从中断处的冒号重新开始。
+    """
+    for hit in _SCAN_RE.finditer(html, pos):
+        colon = hit.start()
+        for start, kind in _candidate_starts(html, colon, hit.lastgroup):
+            # 与逐条 findall 一致：同一类型的匹配互不重叠
+            if start < last_end[kind]:
+                continue
+            match = _KIND_REGEXES[kind].match(html, start)
+            if match:
+                yield colon, kind, match
+
+
+def match_value(kind: int, match) -> str:
+    value = match.group(1) if match.re.groups else match.group(0)
+    if kind in _QUOTED_KINDS:
+        value = value.replace("\\n", " ")
+    return value
+
+
+def scan_video_candidates(html: str) -> list[list[str]]:
+    """单次扫描页面，按类型返回候选值列表（下标与 KIND_NAMES 对应）。"""
+    buckets = [[] for _ in KIND_NAMES]
+    last_end = [0] * len(KIND_NAMES)
+    if not html:
+        return buckets
+
+    for _, kind, match in iter_video_matches(html, last_end):
+        last_end[kind] = match.end()
+        buckets[kind].append(match_value(kind, match))
+    return buckets
+
+
+def count_video_candidates(html: str) -> dict:
+    return {name: len(values) for name, values in zip(KIND_NAMES, scan_video_candidates(html))}
+
+
+def find_video_candidates(html: str) -> list[str]:
+    return [value for values in scan_video_candidates(html) for value in values]